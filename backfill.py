@@ -0,0 +1,254 @@
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from multiprocessing import shared_memory
+from time import perf_counter, sleep
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import requests
+
+from const import BOSS_DICT, DPS_REPORT_JSON_URL, REQUEST_HEADERS, DEFAULT_LANGUAGE, DEFAULT_TITLE, HISTORY_FILE
+from history import get_urls_key
+
+# Logs of the same run are at most RUN_GAP apart
+RUN_GAP = timedelta(minutes=60)
+# Logs downloaded at the same time, and runs fetched / analysed ahead of the history writes per analysis process
+FETCHERS = 8
+RUNS_AHEAD = 2
+FETCH_TIMEOUT = 30
+FETCH_ATTEMPTS = 4
+# dps.report answers for a deleted log, it is left out of its run instead of failing it
+MISSING_STATUS = (404, 410)
+
+_terms    = sorted(set(BOSS_DICT.values()), key=lambda x: (len(x), x), reverse=True)
+URL_REGEX = re.compile(rf"https://dps\.report/[a-zA-Z0-9]{{4}}-(\d{{8}}-\d{{6}})_({'|'.join(_terms)})")
+
+def _make_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Adds a whole dps.report archive to the run history")
+    parser.add_argument('input')  # permalinks in any text, or a dps.report upload listing (JSON)
+    parser.add_argument('--history', required=False, default=HISTORY_FILE)
+    parser.add_argument('--checkpoint', required=False, default=None)  # <history>.backfill.json by default
+    parser.add_argument('--gap', required=False, type=float, default=RUN_GAP.total_seconds() / 60)  # minutes
+    parser.add_argument('--fetchers', required=False, type=int, default=FETCHERS)
+    parser.add_argument('--workers', required=False, type=int, default=os.cpu_count() or 1)
+    parser.add_argument('-l', '--language', required=False, default=DEFAULT_LANGUAGE)
+    parser.add_argument('-t', '--title', required=False, default=DEFAULT_TITLE)
+    return parser
+
+# Every permalink of the file once, upload listings escape their slashes
+def read_urls(input_file: str) -> list[str]:
+    with open(input_file, "r", encoding="utf-8") as f:
+        text = f.read().replace("\\/", "/")
+    return list(dict.fromkeys(match.group(0) for match in URL_REGEX.finditer(text)))
+
+def get_log_date(url: str) -> datetime:
+    return datetime.strptime(URL_REGEX.match(url).group(1), "%Y%m%d-%H%M%S")
+
+# Logs sorted by date, a new run starts after a gap. Like txt_file_to_urls, only the last try of a boss is kept in a run
+def group_runs(urls: list[str], gap: timedelta = RUN_GAP) -> list[list[str]]:
+    runs = []
+    last = None
+    for url in sorted(urls, key=get_log_date):
+        date = get_log_date(url)
+        if last is None or date - last > gap:
+            runs.append({})
+        runs[-1][url.rsplit("_", 1)[-1]] = url
+        last = date
+    return [list(run.values()) for run in runs]
+
+class Checkpoint:
+
+    # Runs already in the history and logs which could not be used, rewritten after each run
+    # Runs which failed to download are not saved and are tried again on resume
+    def __init__(self, path: str):
+        self.path    = path
+        self.done    = {}  # run key -> bosses stored
+        self.skipped = {}  # url -> reason
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.done    = data.get("done", {})
+            self.skipped = data.get("skipped", {})
+
+    def add(self, key: str, n_bosses: int, skipped: dict):
+        self.done[key] = n_bosses
+        self.skipped.update(skipped)
+        temp = self.path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"done": self.done, "skipped": self.skipped}, f)
+        os.replace(temp, self.path)
+
+_local = threading.local()
+
+# (url, page, json) of a log, None for a deleted log. Raises once dps.report kept failing
+def fetch_log(url: str):
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    contents = []
+    for request_url, headers in ((url, None), (DPS_REPORT_JSON_URL + url, REQUEST_HEADERS)):
+        for attempt in range(FETCH_ATTEMPTS):
+            try:
+                response = _local.session.get(request_url, headers=headers, timeout=FETCH_TIMEOUT)
+            except requests.RequestException:
+                if attempt == FETCH_ATTEMPTS - 1:
+                    raise
+                sleep(2 ** attempt)
+                continue
+            if response.status_code in MISSING_STATUS:
+                return None
+            if response.status_code == 429 or response.status_code >= 500:
+                if attempt == FETCH_ATTEMPTS - 1:
+                    response.raise_for_status()
+                sleep(float(response.headers.get("Retry-After", 2 ** attempt)))
+                continue
+            response.raise_for_status()
+            contents.append(response.content)
+            break
+    return (url, *contents)
+
+# Pages and jsons of a run copied into one shared memory block, only its name and layout go through the process pool
+# whatever the size of the logs. The fetching side unlinks the block once the run is analysed
+def share_logs(logs: list):
+    shm    = shared_memory.SharedMemory(create=True, size=max(1, sum(len(page) + len(content) for _, page, content in logs)))
+    layout = []  # (url, (start, end) of the page, (start, end) of the json)
+    offset = 0
+    for url, page, content in logs:
+        spans = []
+        for data in (page, content):
+            shm.buf[offset:offset + len(data)] = data
+            spans.append((offset, offset + len(data)))
+            offset += len(data)
+        layout.append((url, *spans))
+    return shm, (shm.name, layout)
+
+# Analysis processes : the bosses use the module globals, one run at a time per process
+def init_worker(script_dir: str, language: str):
+    os.chdir(script_dir)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    from languages import LANGUES
+    LANGUES["selected_language"] = LANGUES[language]
+
+# Analyses the logs of a run (see share_logs) and adds it to the history, returns (bosses stored, {url: reason} of the unusable logs)
+def analyse_run(shared: tuple, history_file: str, title: str):
+    from const import ALL_BOSSES, ALL_PLAYERS
+    from models.log_class import Log
+    from models.boss_facto import BossFactory
+    from history import History
+    ALL_BOSSES.clear()
+    ALL_PLAYERS.clear()
+    skipped = {}
+    name, layout = shared
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        for url, (page_start, page_end), (json_start, json_end) in layout:
+            n_bosses = len(ALL_BOSSES)
+            try:
+                log = Log(url)
+                with shm.buf[page_start:page_end] as page, shm.buf[json_start:json_end] as content:
+                    log.parse_jcontent(page)
+                    log.parse_pjcontent(content)
+                BossFactory.create_boss(log)
+            except Exception as e:
+                del ALL_BOSSES[n_bosses:]
+                skipped[url] = f"{type(e).__name__}: {e}"
+                continue
+            if len(ALL_BOSSES) == n_bosses:
+                skipped[url] = "not a handled boss"
+    finally:
+        shm.close()
+    bosses = list(ALL_BOSSES)
+    if bosses:
+        with History(history_file) as history:
+            history.add_run(bosses, dict(ALL_PLAYERS), title)
+    ALL_BOSSES.clear()
+    ALL_PLAYERS.clear()
+    return len(bosses), skipped
+
+class Progress:
+
+    def __init__(self, n_runs: int):
+        self.n_runs = n_runs
+        self.runs   = 0
+        self.logs   = 0
+        self.failed = 0
+        self.start  = perf_counter()
+
+    def update(self, n_logs: int = 0, failed: bool = False):
+        self.runs   += 1
+        self.logs   += n_logs
+        self.failed += failed
+        minutes      = (perf_counter() - self.start) / 60
+        rate         = self.logs / minutes if minutes else 0
+        print(f"\r{self.runs}/{self.n_runs} runs | {self.logs} logs | {rate:.1f} logs/min | {self.failed} failed ", end="", file=sys.stderr, flush=True)
+
+# Downloads run by run with a bounded thread pool and analyses each complete run in a process pool
+# Only a few runs per process are held in memory, whatever the size of the archive
+def backfill(input_file: str, history_file: str = HISTORY_FILE, checkpoint_file: str = None, gap: timedelta = RUN_GAP,
+             fetchers: int = FETCHERS, workers: int = 1, language: str = DEFAULT_LANGUAGE, title: str = DEFAULT_TITLE):
+    script_dir   = os.path.dirname(os.path.abspath(__file__))
+    history_file = os.path.abspath(history_file)
+    checkpoint   = Checkpoint(checkpoint_file or history_file + ".backfill.json")
+    runs         = group_runs(read_urls(input_file), gap)
+    queue        = deque((get_urls_key(run), run) for run in runs if get_urls_key(run) not in checkpoint.done)
+    print(f"{len(runs)} runs found, {len(runs) - len(queue)} already done", file=sys.stderr)
+    progress  = Progress(len(queue))
+    fetching  = {}  # run key -> (run, futures of its logs)
+    analysing = {}  # future -> (run key, logs fetched, urls left out, shared memory of the logs)
+    context   = multiprocessing.get_context("spawn")  # the parent has running threads
+    try:
+        with ThreadPoolExecutor(fetchers) as fetch_pool, \
+             ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(script_dir, language)) as process_pool:
+            while queue or fetching or analysing:
+                while queue and len(fetching) + len(analysing) < RUNS_AHEAD * workers:
+                    key, run = queue.popleft()
+                    fetching[key] = (run, [fetch_pool.submit(fetch_log, url) for url in run])
+
+                for key, (run, futures) in list(fetching.items()):
+                    if not all(future.done() for future in futures):
+                        continue
+                    del fetching[key]
+                    errors = [future.exception() for future in futures if future.exception()]
+                    if errors:
+                        print(f"\n{run[0]} : run not downloaded, will be retried ({errors[0]})", file=sys.stderr)
+                        progress.update(failed=True)
+                        continue
+                    logs = [future.result() for future in futures if future.result()]
+                    missing = {url: "deleted" for url, future in zip(run, futures) if not future.result()}
+                    shm, shared = share_logs(logs)
+                    analysing[process_pool.submit(analyse_run, shared, history_file, title)] = (key, len(logs), missing, shm)
+
+                for future in [future for future in analysing if future.done()]:
+                    key, n_logs, missing, shm = analysing.pop(future)
+                    shm.close()
+                    shm.unlink()
+                    try:
+                        n_bosses, skipped = future.result()
+                    except Exception as e:
+                        print(f"\n{key} : run not analysed, will be retried ({type(e).__name__}: {e})", file=sys.stderr)
+                        progress.update(n_logs, failed=True)
+                        continue
+                    checkpoint.add(key, n_bosses, {**missing, **skipped})
+                    progress.update(n_logs)
+
+                waiting = [future for _, futures in fetching.values() for future in futures if not future.done()] + list(analysing)
+                if waiting:
+                    wait(waiting, return_when=FIRST_COMPLETED)
+    finally:
+        # Blocks of the runs still in the pool when the backfill is interrupted
+        for *_, shm in analysing.values():
+            shm.close()
+            shm.unlink()
+    print(file=sys.stderr)
+    return progress
+
+
+if __name__ == "__main__":
+    args = _make_parser().parse_args()
+    progress = backfill(args.input, args.history, args.checkpoint, timedelta(minutes=args.gap), args.fetchers, args.workers, args.language, args.title)
+    print(f"--- {progress.runs - progress.failed} runs, {progress.logs} logs in {perf_counter() - progress.start:.1f} seconds ---")
@@ -1,8 +1,19 @@
-import json
-
 DEFAULT_LANGUAGE = "EN_PMA"
 DEFAULT_TITLE = "Run"
 DEFAULT_INPUT_FILE = "src/input_logs.txt"
+DEFAULT_OUTPUT_FILE = "Flame_Output.txt"
+ANALYSIS_CACHE_DIR = "cache/analysis"
+ANALYSIS_LOCK_WAIT = 60  # seconds a worker waits for a log another worker is analysing, before analysing it itself
+ANALYSIS_LOCK_STALE = 300  # a lock this old is left by a dead worker
+DISCORD_MESSAGE_LIMIT = 2000
+WINGMAN_REQUEST_TIMEOUT = 30
+WINGMAN_LIVE_FALLBACK = True  # ask the wingman API for bosses missing from the wingman snapshot
+WINGMAN_SNAPSHOT_DIR = "wingman_updater/snapshot"
+WINGMAN_DATA_FILE = "wingman_updater/WINGMAN_DATA.json"  # older snapshot format, used when there is no snapshot folder
+WINGMAN_CACHE_FILE = "cache/wingman.sqlite"  # wingman API answers, None to always ask the API
+WINGMAN_MEDIAN_TTL = 24 * 3600
+WINGMAN_ERA_TTL = 3600  # the current wingman era is checked this often, a new era empties the wingman cache
+HISTORY_FILE = "history.sqlite"  # every analysed run, for profiles and leaderboards
 
 BIG = float('inf')
 
@@ -253,7 +264,4 @@ CUSTOM_NAMES = {
     "oscaro.3079"           : "Zheuja"
 }
 
-with open('wingman_updater/WINGMAN_DATA.json') as f:
-    wingman_data = json.load(f)
-    
 EMOTE_WINGMAN = ":wing:"
\ No newline at end of file
@@ -4,8 +4,18 @@ import asyncio
 import os
 import sys
 import re
+import tempfile
+import multiprocessing
+import io
 from dotenv import load_dotenv
 import random
+from job_queue import JobQueue, QueueFull
+from single_flight import SingleFlight, get_handler_version
+from report_cache import ReportCache, normalize_urls
+from flame_session import SessionStore
+from history import History
+from const import HISTORY_FILE, CUSTOM_NAMES
+import flame_worker
 load_dotenv()
 
 
@@ -14,17 +24,209 @@ intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix='!', intents=intents)
 
+# At most 3 flames run at once, 2 per guild and 1 per user, single logs go first
+JOB_QUEUE = JobQueue(workers=3, per_guild=2, per_user=1, max_backlog=20, small_job=1)
+FLAME_TIMEOUT = 120
+FLAME_LANGUAGE = "EN_PMA"
+# Wingman percentiles not there after WINGMAN_DEADLINE seconds are edited in the posted report later
+WINGMAN_DEADLINE = 5
+WINGMAN_TIMEOUT = 120
+
+# Identical flames requested while one is running share its result
+FLIGHTS = SingleFlight()
+
+# Rendered reports of the last flames, reposting the same logs skips the analysis
+REPORT_CACHE = ReportCache(max_entries=256, ttl=6 * 3600)
+
+# Open !flame add sessions per channel, a raid night without a new log for 12 hours is closed
+SESSIONS = SessionStore(ttl=12 * 3600)
+SESSION_SWEEP = 600  # seconds between two looks for expired sessions
+
+# Urls of an input file, used as the job size and dedup key
+def read_urls(input_file: str):
+    try:
+        with open(input_file, 'r') as f:
+            return [line.strip() for line in f if line.strip().startswith('https://')]
+    except OSError:
+        return []
+
+async def stop_worker(process, receiver):
+    if process.is_alive():
+        process.kill()
+    await asyncio.get_running_loop().run_in_executor(None, process.join)
+    receiver.close()
+
+# Runs the analysis in a spawned process and gets the report chunks back through a pipe
+# Returns (ok, chunks or traceback, late), the timeout only counts once the job started
+# late is None, or a future of the chunks with the wingman percentiles which were too slow (None if they never came)
+# records : analysis records of a session, updated with the new logs. A session report waits for wingman, its records are kept
+async def run_flame(script_dir: str, input_file: str, records: dict = None):
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    deadline = WINGMAN_DEADLINE if records is None else None
+    process = context.Process(target=flame_worker.run, args=(sender, script_dir, input_file, FLAME_LANGUAGE, deadline, records), daemon=True)
+    process.start()
+    sender.close()
+    loop = asyncio.get_running_loop()
+    try:
+        ok, result, pending, new_records = await asyncio.wait_for(loop.run_in_executor(None, receiver.recv), timeout=FLAME_TIMEOUT)
+    except EOFError:
+        await stop_worker(process, receiver)
+        return False, f"Analysis process died (exit code {process.exitcode})", None
+    except BaseException:
+        await stop_worker(process, receiver)
+        raise
+    if not pending:
+        await stop_worker(process, receiver)
+        if ok and records is not None:
+            records.update(new_records)
+        return ok, result, None
+    return ok, result, asyncio.ensure_future(get_late_chunks(process, receiver))
+
+# Second message of a worker which was waiting for wingman
+async def get_late_chunks(process, receiver):
+    loop = asyncio.get_running_loop()
+    try:
+        ok, chunks, _, _ = await asyncio.wait_for(loop.run_in_executor(None, receiver.recv), timeout=WINGMAN_TIMEOUT)
+        return chunks if ok else None
+    except (EOFError, asyncio.TimeoutError):
+        return None
+    finally:
+        await stop_worker(process, receiver)
+
+# Queues one analysis and returns (ok, chunks or traceback, late)
+# on_queued is only called by the request which started the flame
+async def queued_flame(guild_id, user_id, size: int, script_dir: str, input_file: str, on_queued, records: dict = None):
+    job = JOB_QUEUE.submit(guild_id, user_id, size, lambda: run_flame(script_dir, input_file, records))
+    await on_queued(JOB_QUEUE.position(job))
+    return await job.wait()
+
+# Name the thread after the first line of a report made from URLs
+def get_thread_name(chunks: list, from_urls: bool):
+    thread_name = "Flame Report"
+    if from_urls:
+        # Try to extract boss/encounter name from report if possible
+        first_line = chunks[0].split('\n')[0] if chunks else ""
+        if first_line and len(first_line) < 100:
+            thread_name = f"{first_line[:80]}"
+    return thread_name
+
+# Discord limits : 2000 chars per message, 4096 chars per embed description, 6000 chars and 10 embeds per message
+MESSAGE_LIMIT = 2000
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_MESSAGE_LIMIT = 6000
+EMBEDS_PER_MESSAGE = 10
+# Reports needing more embed messages than this are sent as one markdown attachment
+MAX_EMBED_MESSAGES = 2
+EMBED_COLOR = 0xE67E22
+
+# Chooses how to post the report with the fewest requests, with chunk indexes so the report can be edited later :
+# ("text", [i]) for a single message, ("embeds", [[i, ...], ...]) one list per embed, or ("file", [0, ..., n]) for one attachment
+# sizes : sizes the chunks are planned with, the final ones for a report still waiting for wingman
+def plan_messages(chunks: list, sizes: list = None):
+    if sizes is None:
+        sizes = [len(chunk) for chunk in chunks]
+    if len(chunks) <= 1:
+        return [("text", [i]) for i in range(len(chunks))]
+    
+    # Consecutive chunks merged into embed descriptions, never splitting a chunk
+    descriptions = []
+    for i, size in enumerate(sizes):
+        if descriptions and descriptions[-1][1] + size <= EMBED_DESCRIPTION_LIMIT:
+            descriptions[-1][0].append(i)
+            descriptions[-1][1] += size
+        else:
+            descriptions.append([[i], size])
+    
+    # Descriptions grouped into messages
+    messages = []
+    total = 0
+    for indexes, size in descriptions:
+        if not messages or len(messages[-1]) >= EMBEDS_PER_MESSAGE or total + size > EMBED_MESSAGE_LIMIT:
+            messages.append([])
+            total = 0
+        messages[-1].append(indexes)
+        total += size
+    
+    if len(messages) <= MAX_EMBED_MESSAGES:
+        return [("embeds", message) for message in messages]
+    return [("file", list(range(len(chunks))))]
+
+# Arguments of thread.send for one planned message
+def get_message_kwargs(message, chunks: list, thread_name: str):
+    kind, indexes = message
+    if kind == "text":
+        return {"content": chunks[indexes[0]]}
+    if kind == "embeds":
+        return {"embeds": [discord.Embed(description="".join(chunks[i] for i in embed), color=EMBED_COLOR) for embed in indexes]}
+    report = "".join(chunks[i] for i in indexes)
+    return {"content": chunks[0], "file": discord.File(io.BytesIO(report.encode("utf-8")), filename=f"{thread_name[:50].strip('# ') or 'flame'}.md")}
+
+# Create the thread from the initial message and send the report in it
+# Returns the thread, the sent messages and their plan
+# pending : chunks will get the wingman percentiles, they are planned at the size they may grow to
+# plan : given by sessions, which post one message per chunk
+async def post_report(initial_msg, thread_name: str, chunks: list, pending: bool = False, plan: list = None):
+    thread = await initial_msg.create_thread(
+        name=thread_name,
+        auto_archive_duration=1440  # 24 hours
+    )
+    
+    with open('insults.txt', 'r') as file:
+        lines = file.readlines()
+        random_insult = random.choice(lines).strip()
+
+    await initial_msg.edit(content=f"{random_insult}")
+    
+    # No sleep between messages : discord.py follows the rate limit headers of each route and retries 429s itself
+    if plan is None:
+        plan = plan_messages(chunks, [MESSAGE_LIMIT] * len(chunks) if pending else None)
+    messages = []
+    for message in plan:
+        messages.append(await thread.send(**get_message_kwargs(message, chunks, thread_name)))
+    return thread, messages, plan
+
+# Edits the posted report once the late wingman percentiles arrived, only the messages which changed
+async def patch_report(late, thread_name: str, chunks: list, messages: list, plan: list, cache_key):
+    new_chunks = await late
+    if not new_chunks or len(new_chunks) != len(chunks):
+        return
+    if cache_key:
+        REPORT_CACHE.put(cache_key, (thread_name, new_chunks))
+    try:
+        for sent, message in zip(messages, plan):
+            if all(chunks[i] == new_chunks[i] for i in get_chunk_indexes(message)):
+                continue
+            kwargs = get_message_kwargs(message, new_chunks, thread_name)
+            if "file" in kwargs:
+                kwargs["attachments"] = [kwargs.pop("file")]
+            await sent.edit(**kwargs)
+    except discord.HTTPException as e:
+        print(f"Could not add the wingman percentiles to {thread_name}: {e}")
+
+def get_chunk_indexes(message) -> list:
+    kind, indexes = message
+    if kind == "embeds":
+        return [i for embed in indexes for i in embed]
+    return indexes
+
 @bot.event
 async def on_ready():
     print(f'{bot.user} has connected to Discord!')
     print(f'Bot is in {len(bot.guilds)} guilds')
     print(f'Ready to receive commands!')
+    get_handler_version(os.path.dirname(os.path.abspath(__file__)))  # sources are hashed once, not on the first flame
+    global session_sweeper
+    if session_sweeper is None:
+        session_sweeper = asyncio.create_task(sweep_sessions())
 @bot.command(name='flame')
 async def send_report(ctx, *urls_or_file):
-    """Generate and send GW2 raid flame from URL(s) or input file"""
+    """Generate and send GW2 raid flame from URL(s) or input file, !flame add <urls> / !flame end for a session report"""
+    if urls_or_file and urls_or_file[0] in ("add", "end"):
+        await (add_to_session(ctx, urls_or_file[1:]) if urls_or_file[0] == "add" else end_session(ctx))
+        return
     initial_msg = await ctx.send("Generating flame... This may take a moment.")
     
-    process = None
     temp_input = None
     thread = None
     
@@ -39,7 +241,8 @@ async def send_report(ctx, *urls_or_file):
         first_arg = urls_or_file[0]
         
         # If the first argument is a URL, handle URL extraction
-        if first_arg.startswith('http://') or first_arg.startswith('https://'):
+        from_urls = first_arg.startswith('http://') or first_arg.startswith('https://')
+        if from_urls:
             # Collect URLs from the entire command content (after the command prefix)
             message_content = ctx.message.content
             message_without_command = message_content.split(maxsplit=1)
@@ -56,10 +259,27 @@ async def send_report(ctx, *urls_or_file):
             if not all_urls:
                 await initial_msg.edit(content="No valid URLs found!")
                 return
-            
-            # Create a temporary input file to store the URLs
-            temp_input = os.path.join(script_dir, 'temp_input.txt')
-            with open(temp_input, 'w') as f:
+            flame_urls = all_urls
+        else:
+            # Treat the first argument as a filename
+            input_file = first_arg
+            flame_urls = read_urls(os.path.join(script_dir, input_file))
+        
+        size = max(len(flame_urls), 1)
+        key  = (normalize_urls(flame_urls) or (first_arg,), FLAME_LANGUAGE, get_handler_version(script_dir))
+        
+        # Same logs already flamed recently, post right away
+        cached = REPORT_CACHE.get(key) if flame_urls else None
+        if cached:
+            thread_name, chunks = cached
+            print(f"\nReport cache hit for {size} URL(s)")
+            thread, _, _ = await post_report(initial_msg, thread_name, chunks)
+            return
+        
+        if from_urls:
+            # Create a temporary input file to store the URLs, one per job
+            fd, temp_input = tempfile.mkstemp(prefix='temp_input_', suffix='.txt', dir=script_dir)
+            with os.fdopen(fd, 'w') as f:
                 for url in all_urls:
                     f.write(url + '\n')
             
@@ -69,97 +289,47 @@ async def send_report(ctx, *urls_or_file):
                 print(f.read())
             
             input_file = temp_input
-            await initial_msg.edit(content=f"Processing {len(all_urls)} URL(s)...")
             
             # Debug: log what URLs were captured
             print(f"\nCaptured {len(all_urls)} URLs:")
             for i, url in enumerate(all_urls, 1):
                 print(f"  {i}. {url}")
-        else:
-            # Treat the first argument as a filename
-            input_file = first_arg
         
-        process = await asyncio.create_subprocess_exec(
-            sys.executable,
-            'main.py',
-            '-i', input_file,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=script_dir
-        )
+        async def on_queued(position):
+            if position:
+                await initial_msg.edit(content=f"Processing {size} log(s)... {position} flame(s) ahead in the queue.")
+            else:
+                await initial_msg.edit(content=f"Processing {size} log(s)...")
         
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=120)
+        if FLIGHTS.in_flight(key):
+            await initial_msg.edit(content=f"Same {size} log(s) already being flamed, sharing the result...")
         
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8') if stderr else "Unknown error"
-            await initial_msg.edit(content=f"Error running report:\n```\n{error_msg[:1000]}\n```")
+        try:
+            ok, chunks, late = await FLIGHTS.do(key, lambda: queued_flame(ctx.guild.id if ctx.guild else None, ctx.author.id, size, script_dir, input_file, on_queued))
+        except QueueFull:
+            await initial_msg.edit(content="Too many flames in the queue, try again in a few minutes.")
             return
         
-        # Read the output file
-        output_file = os.path.join(script_dir, "Flame_Output.txt")
-        if not os.path.exists(output_file):
-            await initial_msg.edit(content="Report file not found! Make sure main.py ran successfully.")
+        if not ok:
+            error_msg = chunks or "Unknown error"
+            await initial_msg.edit(content=f"Error running report:\n```\n{error_msg[-1000:]}\n```")
             return
         
-        with open(output_file, "r", encoding="utf-8") as f:
-            report_text = f.read()
-        
-        if not report_text.strip():
+        if not chunks:
             await initial_msg.edit(content="dps.report reports as empty, Check your input file.")
             return
         
-        # Create a thread for the report
-        thread_name = "Flame Report"
-        if first_arg.startswith('http'):
-            # Try to extract boss/encounter name from report if possible
-            first_line = report_text.split('\n')[0] if report_text else ""
-            if first_line and len(first_line) < 100:
-                thread_name = f"{first_line[:80]}"
-        
-        # Create thread from the initial message
-        thread = await initial_msg.create_thread(
-            name=thread_name,
-            auto_archive_duration=1440  # 24 hours
-        )
+        # Thread name and chunks are cached together with the report
+        thread_name = get_thread_name(chunks, from_urls)
+        if flame_urls:
+            REPORT_CACHE.put(key, (thread_name, chunks))
         
-        with open('insults.txt', 'r') as file:
-            lines = file.readlines()
-            random_insult = random.choice(lines).strip()
-
-        await initial_msg.edit(content=f"{random_insult}")
-        
-        # Send report in the thread
-        if len(report_text) <= 1990:
-            await thread.send(report_text)
-        else:
-            # Split into chunks of 1900 chars (leaving room for formatting)
-            await thread.send("flame generated. Sending in multiple parts:")
-            chunks = []
-            current_chunk = ""
-            
-            for line in report_text.split('\n'):
-                if len(current_chunk) + len(line) + 1 > 1900:
-                    chunks.append(current_chunk)
-                    current_chunk = line + '\n'
-                else:
-                    current_chunk += line + '\n'
-            
-            if current_chunk:
-                chunks.append(current_chunk)
-            
-            for i, chunk in enumerate(chunks, 1):
-                await thread.send(f"{chunk}")
-                if i < len(chunks):
-                    await asyncio.sleep(0.5)
+        thread, messages, plan = await post_report(initial_msg, thread_name, chunks, pending=late is not None)
+        if late:
+            asyncio.create_task(patch_report(late, thread_name, chunks, messages, plan, key if flame_urls else None))
     
     except asyncio.TimeoutError:
         await initial_msg.edit(content="flame generation timed out (took longer than 2 minutes)")
-        if process:
-            try:
-                process.kill()
-                await process.wait()
-            except:
-                pass
     
     except FileNotFoundError as e:
         if 'main.py' in str(e):
@@ -185,6 +355,167 @@ async def send_report(ctx, *urls_or_file):
             except:
                 pass
 
+# Session report of the channel : only the new logs are analysed, the report is edited in its thread
+async def add_to_session(ctx, args):
+    urls = [url.strip('_*<>') for url in re.findall(r'https?://[^\s<>]+', " ".join(args))]
+    if not urls:
+        await ctx.send("Usage : !flame add <dps.report urls>")
+        return
+    session = SESSIONS.open(ctx.channel.id)
+    initial_msg = await ctx.send("Adding to the session report...")
+    temp_input = None
+    try:
+        async with session.lock:
+            new_urls = session.get_new_urls(urls)
+            if not new_urls:
+                await initial_msg.edit(content="These logs are already in the session report.")
+                return
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            fd, temp_input = tempfile.mkstemp(prefix='temp_input_', suffix='.txt', dir=script_dir)
+            with os.fdopen(fd, 'w') as f:
+                for url in session.get_input_urls(new_urls):
+                    f.write(url + '\n')
+
+            async def on_queued(position):
+                ahead = f" {position} flame(s) ahead in the queue." if position else ""
+                await initial_msg.edit(content=f"Processing {len(new_urls)} new log(s)...{ahead}")
+
+            records = dict(session.records)
+            ok, chunks, _ = await queued_flame(ctx.guild.id if ctx.guild else None, ctx.author.id, len(new_urls), script_dir, temp_input, on_queued, records)
+            if not ok:
+                await initial_msg.edit(content=f"Error running report:\n```\n{(chunks or 'Unknown error')[-1000:]}\n```")
+                return
+            session.add(new_urls, records)
+            if not chunks:
+                await initial_msg.edit(content="dps.report reports as empty, nothing added.")
+                return
+            await update_session_report(session, initial_msg, chunks)
+    except QueueFull:
+        await initial_msg.edit(content="Too many flames in the queue, try again in a few minutes.")
+    except asyncio.TimeoutError:
+        await initial_msg.edit(content="flame generation timed out (took longer than 2 minutes)")
+    finally:
+        if temp_input and os.path.exists(temp_input):
+            os.remove(temp_input)
+
+# Posts the session report on the first add, then only edits the messages whose chunk changed
+async def update_session_report(session, initial_msg, chunks: list):
+    if session.thread:
+        edited = 0
+        try:
+            for i, chunk in enumerate(chunks):
+                if i >= len(session.messages):
+                    session.messages.append(await session.thread.send(content=chunk))
+                elif session.chunks[i] != chunk:
+                    await session.messages[i].edit(content=chunk)
+                else:
+                    continue
+                edited += 1
+            for message in session.messages[len(chunks):]:
+                await message.delete()
+            del session.messages[len(chunks):]
+            session.chunks = chunks
+            await initial_msg.edit(content=f"Session report updated, {edited} message(s) changed : {session.thread.mention}")
+            return
+        except discord.NotFound:
+            print(f"Session thread {session.thread_name} is gone, posting a new one")
+    session.thread_name = get_thread_name(chunks, True)
+    plan = [("text", [i]) for i in range(len(chunks))]
+    session.thread, session.messages, _ = await post_report(initial_msg, session.thread_name, chunks, plan=plan)
+    session.chunks = chunks
+
+async def end_session(ctx):
+    session = SESSIONS.close(ctx.channel.id)
+    if not session:
+        await ctx.send("No session report open in this channel.")
+        return
+    await store_session(session)
+    await ctx.send(f"Session report closed with {len(session.records)} boss(es).")
+
+# The night goes to the history once, when its session is closed or expires
+async def store_session(session):
+    async with session.lock:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, session.store, os.path.join(os.path.dirname(os.path.abspath(__file__)), HISTORY_FILE))
+        except Exception as e:
+            print(f"Could not store the session of channel {session.channel_id}: {e}")
+
+session_sweeper = None
+
+async def sweep_sessions():
+    while True:
+        await asyncio.sleep(SESSION_SWEEP)
+        for session in SESSIONS.pop_expired():
+            await store_session(session)
+
+
+def get_history():
+    return History(os.path.join(os.path.dirname(os.path.abspath(__file__)), HISTORY_FILE))
+
+def get_display_name(account: str, name: str = None):
+    return CUSTOM_NAMES.get(account, name or account)
+
+def get_rate(count: int, total: int):
+    return f"{count / total:.0%}" if total else "-"
+
+def get_mark(mark):
+    return f"{mark:.2f}" if mark is not None else "-"
+
+def format_profile(profile: dict):
+    bosses = profile['bosses']
+    lines  = [
+        f"## {get_display_name(profile['account'], profile['name'])} ({profile['account']})",
+        f"**{bosses}** bosses | MVP **{profile['mvps']}** ({get_rate(profile['mvps'], bosses)}) | LVP **{profile['lvps']}** ({get_rate(profile['lvps'], bosses)}) | dps mark **{get_mark(profile['dps_mark'])}**",
+    ]
+    if profile['most_failed']:
+        mechanic = profile['most_failed']['key'].replace("LVP ", "", 1)
+        lines.append(f"Most failed mechanic : **{mechanic}** ({profile['most_failed']['count']} times)")
+    if profile['per_boss']:
+        lines.append("### Per boss")
+        for boss in profile['per_boss']:
+            lines.append(f"* {boss['boss']}{' CM' if boss['cm'] else ''} : {boss['bosses']} kills, MVP {get_rate(boss['mvps'], boss['bosses'])}, LVP {get_rate(boss['lvps'], boss['bosses'])}, dps mark {get_mark(boss['dps_mark'])}")
+    if profile['weeks']:
+        lines.append("### Dps mark trend")
+        lines.append(" → ".join(f"{week['week'][5:]} **{get_mark(week['dps_mark'])}**" for week in profile['weeks']))
+    return "\n".join(lines)
+
+@bot.command(name='profile')
+async def profile(ctx, *, player: str):
+    """Stats of a player from the stored runs : account, name or custom name"""
+    with get_history() as history:
+        account = history.find_account(player, CUSTOM_NAMES)
+        stats   = history.get_profile(account) if account else None
+    if not stats:
+        await ctx.send(f"No flamed log of {player} yet.")
+        return
+    await ctx.send(format_profile(stats))
+
+@bot.command(name='leaderboard')
+async def leaderboard(ctx, board: str = "mvps"):
+    """Top players of the stored runs : mvps, lvps, dps or shame (most LVP this week)"""
+    board = board.lower()
+    with get_history() as history:
+        if board == "shame":
+            rows  = history.get_hall_of_shame()
+            title = "Hall of shame of the week"
+        elif board in ("mvps", "lvps", "dps"):
+            rows  = history.get_leaderboard(board)
+            title = {"mvps": "Most MVP titles", "lvps": "Most LVP titles", "dps": "Best mean dps mark"}[board]
+        else:
+            await ctx.send("Usage : !leaderboard [mvps|lvps|dps|shame]")
+            return
+    if not rows:
+        await ctx.send("No flamed log yet.")
+        return
+    lines = [f"## {title}"]
+    for rank, row in enumerate(rows, 1):
+        name = get_display_name(row['account'], row.get('name'))
+        if board == "dps":
+            lines.append(f"{rank}. **{name}** : {get_mark(row['dps_mark'])} ({row['bosses']} bosses)")
+        else:
+            column = "mvps" if board == "mvps" else "lvps"
+            lines.append(f"{rank}. **{name}** : {row[column]} ({get_rate(row[column], row['bosses'])} of {row['bosses']} bosses)")
+    await ctx.send("\n".join(lines))
 
 @bot.command(name='ping')
 async def ping(ctx):
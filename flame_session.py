@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from time import monotonic
+
+from const import ALL_PLAYERS, DEFAULT_TITLE
+from models.cache_class import CachedBoss
+from history import History
+import func
+
+_STORE_LOCK = threading.Lock()  # replaying records goes through ALL_PLAYERS
+
+class FlameSession:
+
+    # Report of a raid night built log by log with !flame add
+    # records : url -> analysis record of every boss already flamed, the worker replays them instead of fetching their log
+    # The report is posted one chunk per message, so an add only edits the messages whose text changed
+    def __init__(self, channel_id):
+        self.channel_id  = channel_id
+        self.urls        = []  # every log added, bosses or not
+        self.records     = {}
+        self.thread      = None
+        self.thread_name = None
+        self.messages    = []
+        self.chunks      = []
+        self.lock        = asyncio.Lock()  # adds of a channel run one after the other
+        self.last_add    = monotonic()
+
+    def get_new_urls(self, urls: list[str]) -> list[str]:
+        return [url for url in dict.fromkeys(urls) if url not in self.urls]
+
+    # records : the session records plus the new ones sent back by the worker
+    def add(self, new_urls: list[str], records: dict):
+        self.urls    += new_urls
+        self.records  = {url: records[url] for url in func.get_last_tries(list(records))}
+        self.last_add = monotonic()
+
+    # Input of the worker : logs with a record are replayed, only the new ones are analysed
+    # Like a normal run, a new try of a boss replaces the one already in the session
+    def get_input_urls(self, new_urls: list[str]) -> list[str]:
+        return func.get_last_tries(list(self.records) + new_urls)
+
+    # Adds are not stored (their url set changes every time), the whole night is stored once when the session closes
+    def store(self, history_file: str):
+        if not self.records:
+            return None
+        with _STORE_LOCK:
+            ALL_PLAYERS.clear()
+            bosses = [CachedBoss(record) for record in self.records.values()]
+            try:
+                with History(history_file) as history:
+                    return history.add_run(bosses, dict(ALL_PLAYERS), DEFAULT_TITLE)
+            finally:
+                ALL_PLAYERS.clear()
+
+class SessionStore:
+
+    # One open session per channel, closed after ttl seconds without a new log
+    # Expired sessions wait in expired until pop_expired hands them over to be stored
+    def __init__(self, ttl: float = 12 * 3600):
+        self.ttl       = ttl
+        self._sessions = {}  # channel id -> FlameSession
+        self.expired   = []
+
+    def get(self, channel_id) -> FlameSession:
+        session = self._sessions.get(channel_id)
+        if session and session.last_add + self.ttl <= monotonic():
+            self.expired.append(self._sessions.pop(channel_id))
+            return None
+        return session
+
+    def pop_expired(self) -> list[FlameSession]:
+        for channel_id in list(self._sessions):
+            self.get(channel_id)
+        expired, self.expired = self.expired, []
+        return expired
+
+    def open(self, channel_id) -> FlameSession:
+        session = self.get(channel_id)
+        if session is None:
+            session = self._sessions[channel_id] = FlameSession(channel_id)
+        return session
+
+    def close(self, channel_id) -> FlameSession:
+        session = self.get(channel_id)
+        self._sessions.pop(channel_id, None)
+        return session
@@ -0,0 +1,31 @@
+import os
+import sys
+import traceback
+
+# Entry point of the process spawned by the bot for one flame, sends (ok, chunks or traceback, late, records) through conn
+# late is True when wingman was too slow : the chunks with the percentiles are sent as a second message
+# records : analysis records of a flame session, sent back with the ones of the new logs (None outside of a session)
+# main is imported here only : grequests monkey patches the process, which must not happen in the bot
+def run(conn, script_dir: str, input_file: str, language: str, wingman_deadline: float = None, records: dict = None):
+    try:
+        os.chdir(script_dir)
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        from languages import LANGUES
+        from models.late_class import LateWingman
+        import main
+        LANGUES["selected_language"] = LANGUES[language]
+        late   = LateWingman(wingman_deadline) if wingman_deadline is not None else None
+        # A session run is stored by the bot once the session closes
+        history = {"history_file": None} if records is not None else {}
+        chunks  = main.get_report_chunks(input_file, language=language, late=late, records=records, **history)
+        if late and not late.pending:
+            chunks = late.get_chunks(chunks)  # nothing to wait for, writes the analysis cache before the bot stops the process
+            late   = None
+        conn.send((True, chunks, late is not None, None if late else records))
+        if late:
+            conn.send((True, late.get_chunks(chunks), False, records))
+    except BaseException:
+        conn.send((False, traceback.format_exc(), False, None))
+    finally:
+        conn.close()
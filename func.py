@@ -2,8 +2,10 @@ import math
 from datetime import timedelta, datetime
 import re
 
-from const import BOSS_DICT, CUSTOM_NAMES, EMOTE_WINGMAN, ALL_PLAYERS
+from const import BOSS_DICT, CUSTOM_NAMES, EMOTE_WINGMAN, ALL_PLAYERS, DISCORD_MESSAGE_LIMIT
 from languages import LANGUES
+from models.finding_class import Finding, render
+from models.chunk_class import Chunker
 
 def time_to_index(time: int, base):  # time in millisecond
     return int(time / base)
@@ -43,35 +45,55 @@ def txt_file_to_urls(filepath: str):
     # Utilisation de re.finditer pour identifier toutes les correspondances
     matches = [match.group(0) for match in re.finditer(regex_full, text)]
 
-    # Affichage des résultats
+    return get_last_tries(matches)
+
+def extract_timestamp(url: str):
+    timestamp_str = url.split('_')[0] # Extract the timestamp part (e.g., '20241124-205115')
+    date = timestamp_str.split('-')[1]+"-"+timestamp_str.split('-')[2]
+    return datetime.strptime(date, "%Y%m%d-%H%M%S")
+
+# Last try of each boss, in the order the bosses first appear. Urls without a log date are kept as they are
+def get_last_tries(urls: list[str]) -> list[str]:
     dupsChecker = {}
-    for match in matches:
-        end = match.split("_")[-1]
+    for url in urls:
+        try:
+            extract_timestamp(url)
+            end = url.split("_")[-1]
+        except (IndexError, ValueError):
+            end = url
         if dupsChecker.get(end):
-            dupsChecker[end].append(match)
+            dupsChecker[end].append(url)
         else:
-            dupsChecker[end] = [match]
-    
-    def extract_timestamp(url):
-        timestamp_str = url.split('_')[0] # Extract the timestamp part (e.g., '20241124-205115')
-        date = timestamp_str.split('-')[1]+"-"+timestamp_str.split('-')[2]
-        return datetime.strptime(date, "%Y%m%d-%H%M%S")
-    
-    return [max(urlz, key=extract_timestamp) for urlz in dupsChecker.values()]
+            dupsChecker[end] = [url]
+    return [max(urlz, key=extract_timestamp) if len(urlz) > 1 else urlz[0] for urlz in dupsChecker.values()]
 
-def get_message_reward(logs: list, players: dict, titre="Run"):
+# Boss title line, with its wingman percentile when there is one
+def get_boss_header(boss, percentile) -> str:
+    boss_name     = boss.name + (" CM" if boss.cm else "")
+    boss_duration = disp_time(timedelta(seconds=boss.duration_ms / 1000))
+    if percentile is not None:
+        return f"## **[{boss_name}]({boss.log.url})** **{boss_duration} ({percentile}%{EMOTE_WINGMAN})**\n"
+    return f"## **[{boss_name}]({boss.log.url})** **{boss_duration}**\n"
+
+# Average of the wingman percentiles of the run, None without any
+def get_wingman_average(bosses: list):
+    percentiles = [boss.wingman_percentile for boss in bosses if boss.wingman_percentile is not None]
+    if not percentiles:
+        return None
+    return sum(percentiles) / len(percentiles)
+
+# Returns the report as send-ready Discord messages (see Chunker), each boss stays in one message
+# language renders the report in another language than the one used for the analysis
+# late : LateWingman, percentiles wingman did not give before its deadline are left out and patched in later
+def get_message_reward(logs: list, players: dict, titre="Run", language: str = None, late=None):
     if not logs:
         print("No boss found")
         return []
 
-    def cut_text(text):
-        run_message_length = len(text)
-        if run_message_length >= cutting_text_limit:
-            split_message.append(text)
-            return ""
-        return text
+    def add_block(text, reserve=0):
+        chunker.add(render(text, language) if language else text, reserve)
 
-    cutting_text_limit = 1700
+    chunker = Chunker(DISCORD_MESSAGE_LIMIT)
 
     mvp = []
     lvp = []
@@ -153,6 +175,9 @@ def get_message_reward(logs: list, players: dict, titre="Run"):
     # bonjour
 
     logs.sort(key=lambda log: log.start_date, reverse=False)
+    if late:
+        late.wait_deadline(logs)
+    bosses = list(logs)  # logs is cleared at the end, late patches still need the bosses
     wings = {}
     for log in logs:
         _wing = log.wing
@@ -167,8 +192,8 @@ def get_message_reward(logs: list, players: dict, titre="Run"):
 
     run_message = f"# {titre}\n" if number_boss > 2 else ""
     run_message += f"# {run_date}\n"
+    add_block(run_message)
     
-    split_message = []
     total_wingman_score = 0
     notes_nb = 0
     for wingname, wing in wings.items():
@@ -176,65 +201,76 @@ def get_message_reward(logs: list, players: dict, titre="Run"):
         wing_last_log = wing[-1]
         wing_duration = disp_time(wing_last_log.end_date - wing_first_log.start_date)
 
+        # The wing header goes with the first boss of the wing
+        run_message = ""
         if type(wingname) == int: 
             if wingname == 1:
-                run_message += LANGUES["selected_language"]["W1"].format(wing_duration=wing_duration)
+                run_message += Finding("W1", wing_duration=wing_duration)
                 
             elif wingname == 3:
                 escort_in_run = any(boss.name == "ESCORT" for boss in wing)
                 if escort_in_run:
                     run_message += f"## W3 - *{wing_duration}*\n"
                 else:
-                    run_message += LANGUES["selected_language"]["W3"].format(wing_duration=wing_duration)
+                    run_message += Finding("W3", wing_duration=wing_duration)
                     
             elif wingname == 7:
-                run_message += LANGUES["selected_language"]["W7"].format(wing_duration=wing_duration)
+                run_message += Finding("W7", wing_duration=wing_duration)
                 
             else:
                 run_message += f"## W{wingname} - *{wing_duration}*\n"    
                   
         else:
-            run_message += LANGUES["selected_language"][wingname].format(wing_duration=wing_duration)
+            run_message += Finding(wingname, wing_duration=wing_duration)
         
         for boss in wing:
-            boss_name = boss.name + (" CM" if boss.cm else "")
-            boss_duration = disp_time(timedelta(seconds=boss.duration_ms / 1000))
-            boss_url = boss.log.url
-            boss_percentil = boss.wingman_percentile
+            boss_percentil = late.get_percentile(boss) if late else boss.wingman_percentile
+            reserve = 0
             if boss_percentil is not None:
                 notes_nb += 1
                 total_wingman_score += boss_percentil
-                run_message += f"## **[{boss_name}]({boss_url})** **{boss_duration} ({boss_percentil}%{EMOTE_WINGMAN})**\n"
-            else:
-                run_message += f"## **[{boss_name}]({boss_url})** **{boss_duration}**\n"
-            run_message = cut_text(run_message)
+            elif late and boss in late.late:
+                header = get_boss_header(boss, None)
+                late.add_patch(header, lambda boss=boss, header=header: get_boss_header(boss, boss.wingman_percentile) if boss.wingman_percentile is not None else header)
+                reserve = len(f" (100.00%{EMOTE_WINGMAN})")
+            run_message += get_boss_header(boss, boss_percentil)
 
             if boss.mvp:
                 run_message += boss.mvp + "\n"
-                run_message = cut_text(run_message)
             if boss.lvp:
                 run_message += boss.lvp + "\n"
-                run_message = cut_text(run_message)
+            add_block(run_message, reserve)
+            run_message = ""
             if boss.name != "ESCORT":
                 for player_account, dps_mark in boss.get_dps_ranking().items():
                     ALL_PLAYERS[player_account].add_mark(dps_mark)
 
-        run_message += "\n"
-
+    reserve = 0
     if number_boss > 2:
         mvps = ', '.join(mvp_names)
         lvps = ', '.join(lvp_names)
         low_mvps =  ', '.join(low_mvp_names)
         low_lvps = ', '.join(low_lvp_names)
-        note_wingman = total_wingman_score / notes_nb
         if max_mvp_score > 1:
-            run_message += LANGUES["selected_language"]["MVP"].format(mvps=mvps, max_mvp_score=max_mvp_score)
+            run_message += Finding("MVP", mvps=mvps, max_mvp_score=max_mvp_score)
         if max_lvp_score > 1:
-            run_message += LANGUES["selected_language"]["LVP"].format(lvps=lvps, max_lvp_score=max_lvp_score)
-        run_message += LANGUES["selected_language"]["LOW MVP"].format(mvps=low_mvps, min_mvp_score=min_mvp_score)
-        run_message += LANGUES["selected_language"]["LOW LVP"].format(lvps=low_lvps, min_lvp_score=min_lvp_score)
-        run_message += LANGUES["selected_language"]["TIME"].format(run_duration=run_duration)
-        run_message += LANGUES["selected_language"]["WINGMAN"].format(note_wingman=note_wingman, emote_wingman=EMOTE_WINGMAN)
+            run_message += Finding("LVP", lvps=lvps, max_lvp_score=max_lvp_score)
+        run_message += Finding("LOW MVP", mvps=low_mvps, min_mvp_score=min_mvp_score)
+        run_message += Finding("LOW LVP", lvps=low_lvps, min_lvp_score=min_lvp_score)
+        run_message += Finding("TIME", run_duration=run_duration)
+        if late and late.pending:
+            # The average line goes right after the time line once every percentile is there
+            time_line = render(Finding("TIME", run_duration=run_duration), language)
+            def get_time_lines(time_line=time_line):
+                note_wingman = get_wingman_average(bosses)
+                if note_wingman is None:
+                    return time_line
+                return time_line + render(Finding("WINGMAN", note_wingman=note_wingman, emote_wingman=EMOTE_WINGMAN), language) + "\n"
+            late.add_patch(time_line, get_time_lines)
+            reserve = len(render(Finding("WINGMAN", note_wingman=100, emote_wingman=EMOTE_WINGMAN), language)) + 1
+        elif notes_nb:
+            note_wingman = total_wingman_score / notes_nb
+            run_message += Finding("WINGMAN", note_wingman=note_wingman, emote_wingman=EMOTE_WINGMAN)
 
     
     """player_rankings = list(filter(
@@ -246,9 +282,9 @@ def get_message_reward(logs: list, players: dict, titre="Run"):
         run_message += f"\n{r[0]} a la note moyenne de {r[1]:0.2f}/20 en dps"
     """
     
-    split_message.append(run_message)
+    add_block(run_message, reserve)
 
     logs.clear()
     players.clear()
 
-    return split_message
+    return chunker.get_chunks()
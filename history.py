@@ -0,0 +1,317 @@
+from datetime import datetime, timedelta
+import hashlib
+import json
+import os
+import sqlite3
+
+from const import HISTORY_FILE, DEFAULT_TITLE
+from models.finding_class import get_findings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id              INTEGER PRIMARY KEY,
+    key             TEXT UNIQUE NOT NULL,
+    title           TEXT,
+    start           TEXT,
+    duration_s      REAL,
+    bosses          INTEGER,
+    wingman_average REAL,
+    created         TEXT
+);
+CREATE TABLE IF NOT EXISTS bosses (
+    id                 INTEGER PRIMARY KEY,
+    url                TEXT UNIQUE NOT NULL,
+    name               TEXT,
+    wing               TEXT,
+    cm                 INTEGER,
+    start              TEXT,
+    duration_ms        INTEGER,
+    wingman_percentile REAL
+);
+CREATE INDEX IF NOT EXISTS bosses_start ON bosses (start);
+CREATE INDEX IF NOT EXISTS bosses_name ON bosses (name, cm, start);
+CREATE TABLE IF NOT EXISTS run_bosses (
+    run_id  INTEGER REFERENCES runs (id),
+    boss_id INTEGER REFERENCES bosses (id),
+    PRIMARY KEY (run_id, boss_id)
+);
+CREATE TABLE IF NOT EXISTS player_bosses (
+    boss_id  INTEGER REFERENCES bosses (id),
+    account  TEXT,
+    name     TEXT,
+    mvps     INTEGER,
+    lvps     INTEGER,
+    dps_mark REAL,
+    PRIMARY KEY (boss_id, account)
+);
+CREATE INDEX IF NOT EXISTS player_bosses_account ON player_bosses (account, boss_id);
+CREATE TABLE IF NOT EXISTS findings (
+    boss_id INTEGER REFERENCES bosses (id),
+    key     TEXT,
+    kind    TEXT,
+    account TEXT,
+    "values" TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_boss ON findings (boss_id);
+CREATE INDEX IF NOT EXISTS findings_account ON findings (account, key);
+CREATE TABLE IF NOT EXISTS accounts (
+    account        TEXT PRIMARY KEY,
+    name           TEXT,
+    bosses         INTEGER,
+    mvps           INTEGER,
+    lvps           INTEGER,
+    dps_mark_sum   REAL,
+    dps_mark_count INTEGER,
+    last_seen      TEXT
+);
+CREATE INDEX IF NOT EXISTS accounts_mvps ON accounts (mvps);
+CREATE INDEX IF NOT EXISTS accounts_lvps ON accounts (lvps);
+CREATE TABLE IF NOT EXISTS account_weeks (
+    week           TEXT,
+    account        TEXT,
+    bosses         INTEGER,
+    mvps           INTEGER,
+    lvps           INTEGER,
+    dps_mark_sum   REAL,
+    dps_mark_count INTEGER,
+    PRIMARY KEY (week, account)
+);
+CREATE INDEX IF NOT EXISTS account_weeks_lvps ON account_weeks (week, lvps);
+CREATE INDEX IF NOT EXISTS account_weeks_mvps ON account_weeks (week, mvps);
+"""
+
+# Summary tables of the profiles, updated with the aggregates. Built from the raw tables once when they are created
+VIEWS = {
+    "account_bosses": """
+CREATE TABLE account_bosses (
+    account        TEXT,
+    boss           TEXT,
+    cm             INTEGER,
+    bosses         INTEGER,
+    mvps           INTEGER,
+    lvps           INTEGER,
+    dps_mark_sum   REAL,
+    dps_mark_count INTEGER,
+    PRIMARY KEY (account, boss, cm)
+);
+INSERT INTO account_bosses
+    SELECT p.account, b.name, b.cm, count(*), sum(p.mvps), sum(p.lvps), total(p.dps_mark), count(p.dps_mark)
+    FROM player_bosses p JOIN bosses b ON b.id = p.boss_id GROUP BY p.account, b.name, b.cm;
+""",
+    "account_mechanics": """
+CREATE TABLE account_mechanics (
+    account TEXT,
+    key     TEXT,
+    kind    TEXT,
+    count   INTEGER,
+    PRIMARY KEY (account, key)
+);
+CREATE INDEX account_mechanics_count ON account_mechanics (account, kind, count);
+INSERT INTO account_mechanics
+    SELECT account, key, kind, count(*) FROM findings WHERE account IS NOT NULL GROUP BY account, key;
+""",
+}
+
+# Monday of the week of a date, weeks of the aggregates are named after it
+def get_week(date: datetime) -> str:
+    return (date.date() - timedelta(days=date.weekday())).isoformat()
+
+# Same logs in any order are the same run
+def get_run_key(bosses: list) -> str:
+    return get_urls_key(boss.log.url for boss in bosses)
+
+def get_urls_key(urls) -> str:
+    return hashlib.sha1("\n".join(sorted(set(urls))).encode()).hexdigest()
+
+class History:
+
+    # Every analysed run, with per account aggregates updated when a boss is added
+    # A log is only counted once, whatever the number of runs it was flamed in
+    def __init__(self, path: str = HISTORY_FILE):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db             = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        with self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+            tables = {row[0] for row in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for name, script in VIEWS.items():
+                if name not in tables:
+                    self.db.executescript(script)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    # Needs the players before get_message_reward clears them (names)
+    # Returns the run id, None when the run was already stored
+    def add_run(self, bosses: list, players: dict, title: str = DEFAULT_TITLE):
+        if not bosses:
+            return None
+        bosses      = sorted(bosses, key=lambda boss: boss.start_date)
+        percentiles = [boss.wingman_percentile for boss in bosses if boss.wingman_percentile is not None]
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO runs (key, title, start, duration_s, bosses, wingman_average, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    get_run_key(bosses),
+                    title,
+                    bosses[0].start_date.isoformat(),
+                    (bosses[-1].end_date - bosses[0].start_date).total_seconds(),
+                    len(bosses),
+                    sum(percentiles) / len(percentiles) if percentiles else None,
+                    datetime.now().isoformat(),
+                )
+            )
+            if not cursor.rowcount:
+                return None
+            run_id = cursor.lastrowid
+            for boss in bosses:
+                boss_id = self._add_boss(boss, players)
+                self.db.execute("INSERT OR IGNORE INTO run_bosses VALUES (?, ?)", (run_id, boss_id))
+        return run_id
+
+    # Returns the boss id, the aggregates are only updated for a log seen for the first time
+    def _add_boss(self, boss, players: dict) -> int:
+        row = self.db.execute("SELECT id FROM bosses WHERE url = ?", (boss.log.url,)).fetchone()
+        if row:
+            return row["id"]
+        boss_id = self.db.execute(
+            "INSERT INTO bosses (url, name, wing, cm, start, duration_ms, wingman_percentile) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (boss.log.url, boss.name, str(boss.wing), int(bool(boss.cm)), boss.start_date.isoformat(), boss.duration_ms, boss.wingman_percentile)
+        ).lastrowid
+
+        findings = get_findings(boss.mvp) + get_findings(boss.lvp)
+        titles   = {}  # account -> [mvps, lvps]
+        for finding in findings:
+            values = json.dumps(finding.to_dict()["values"])
+            for account in finding.players or [None]:
+                self.db.execute('INSERT INTO findings (boss_id, key, kind, account, "values") VALUES (?, ?, ?, ?, ?)', (boss_id, finding.key, finding.kind, account, values))
+                if not account:
+                    continue
+                self.db.execute(
+                    """INSERT INTO account_mechanics VALUES (?, ?, ?, 1)
+                       ON CONFLICT (account, key) DO UPDATE SET count = count + 1""",
+                    (account, finding.key, finding.kind)
+                )
+                if finding.kind:
+                    titles.setdefault(account, [0, 0])[finding.kind == "lvp"] += 1
+
+        ranking = boss.get_dps_ranking() if boss.name != "ESCORT" else {}
+        week    = get_week(boss.start_date)
+        for account in boss.get_accounts():
+            player     = players.get(account)
+            name       = player.name if player else account[:-5]
+            mvps, lvps = titles.get(account, (0, 0))
+            mark       = ranking.get(account)
+            self.db.execute("INSERT OR IGNORE INTO player_bosses VALUES (?, ?, ?, ?, ?, ?)", (boss_id, account, name, mvps, lvps, mark))
+            self.db.execute(
+                """INSERT INTO accounts VALUES (?, ?, 1, ?, ?, ?, ?, ?)
+                   ON CONFLICT (account) DO UPDATE SET
+                       name           = excluded.name,
+                       bosses         = bosses + 1,
+                       mvps           = mvps + excluded.mvps,
+                       lvps           = lvps + excluded.lvps,
+                       dps_mark_sum   = dps_mark_sum + excluded.dps_mark_sum,
+                       dps_mark_count = dps_mark_count + excluded.dps_mark_count,
+                       last_seen      = max(last_seen, excluded.last_seen)""",
+                (account, name, mvps, lvps, mark or 0, mark is not None, boss.start_date.isoformat())
+            )
+            self.db.execute(
+                """INSERT INTO account_weeks VALUES (?, ?, 1, ?, ?, ?, ?)
+                   ON CONFLICT (week, account) DO UPDATE SET
+                       bosses         = bosses + 1,
+                       mvps           = mvps + excluded.mvps,
+                       lvps           = lvps + excluded.lvps,
+                       dps_mark_sum   = dps_mark_sum + excluded.dps_mark_sum,
+                       dps_mark_count = dps_mark_count + excluded.dps_mark_count""",
+                (week, account, mvps, lvps, mark or 0, mark is not None)
+            )
+            self.db.execute(
+                """INSERT INTO account_bosses VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+                   ON CONFLICT (account, boss, cm) DO UPDATE SET
+                       bosses         = bosses + 1,
+                       mvps           = mvps + excluded.mvps,
+                       lvps           = lvps + excluded.lvps,
+                       dps_mark_sum   = dps_mark_sum + excluded.dps_mark_sum,
+                       dps_mark_count = dps_mark_count + excluded.dps_mark_count""",
+                (account, boss.name, int(bool(boss.cm)), mvps, lvps, mark or 0, mark is not None)
+            )
+        return boss_id
+
+    ################################ QUERIES ################################
+
+    # Aggregates of an account, None if it was never seen
+    def get_account(self, account: str):
+        row = self.db.execute("SELECT * FROM accounts WHERE account = ?", (account,)).fetchone()
+        if not row:
+            return None
+        stats             = dict(row)
+        stats["dps_mark"] = stats["dps_mark_sum"] / stats["dps_mark_count"] if stats["dps_mark_count"] else None
+        return stats
+
+    # (start, boss, cm, wingman percentile) of the logs of an account, oldest first
+    def get_percentile_history(self, account: str, boss_name: str = None) -> list:
+        query = """SELECT b.start, b.name, b.cm, b.wingman_percentile FROM player_bosses p JOIN bosses b ON b.id = p.boss_id
+                   WHERE p.account = ?"""
+        args  = [account]
+        if boss_name:
+            query += " AND b.name = ?"
+            args.append(boss_name)
+        return [tuple(row) for row in self.db.execute(query + " ORDER BY b.start", args)]
+
+    # Account of a player given by account, name or custom name (custom_names : account -> custom name)
+    def find_account(self, name: str, custom_names: dict = None):
+        for account, custom_name in (custom_names or {}).items():
+            if custom_name.lower() == name.lower():
+                return account
+        row = self.db.execute("SELECT account FROM accounts WHERE account = ? OR lower(name) = lower(?) ORDER BY last_seen DESC", (name, name)).fetchone()
+        return row["account"] if row else None
+
+    # Everything !profile shows, only read from the summary tables
+    def get_profile(self, account: str, n_bosses: int = 5, n_weeks: int = 6):
+        stats = self.get_account(account)
+        if not stats:
+            return None
+        stats["per_boss"] = [dict(row) for row in self.db.execute(
+            "SELECT boss, cm, bosses, mvps, lvps, dps_mark_sum / nullif(dps_mark_count, 0) AS dps_mark FROM account_bosses WHERE account = ? ORDER BY bosses DESC LIMIT ?",
+            (account, n_bosses)
+        )]
+        stats["weeks"] = [dict(row) for row in self.db.execute(
+            "SELECT week, bosses, mvps, lvps, dps_mark_sum / nullif(dps_mark_count, 0) AS dps_mark FROM account_weeks WHERE account = ? ORDER BY week DESC LIMIT ?",
+            (account, n_weeks)
+        )][::-1]
+        row = self.db.execute("SELECT key, count FROM account_mechanics WHERE account = ? AND kind = 'lvp' ORDER BY count DESC LIMIT 1", (account,)).fetchone()
+        stats["most_failed"] = dict(row) if row else None
+        return stats
+
+    # Accounts with the most titles of a kind ("mvps" or "lvps") or the best mean dps mark ("dps")
+    # Only accounts with min_bosses logs at least (min_bosses dps marks for "dps"), so one lucky log does not top a board
+    def get_leaderboard(self, column: str = "mvps", limit: int = 10, min_bosses: int = 5) -> list:
+        boards = {
+            "mvps" : ("bosses >= ?", "mvps DESC"),
+            "lvps" : ("bosses >= ?", "lvps DESC"),
+            "dps"  : ("dps_mark_count >= ?", "dps_mark_sum / dps_mark_count DESC"),
+        }
+        if column not in boards:
+            raise ValueError(f"Unknown leaderboard column {column}")
+        where, order = boards[column]
+        return [dict(row) for row in self.db.execute(
+            f"SELECT account, name, bosses, mvps, lvps, dps_mark_sum / nullif(dps_mark_count, 0) AS dps_mark FROM accounts WHERE {where} ORDER BY {order} LIMIT ?",
+            (min_bosses, limit)
+        )]
+
+    # Accounts with the most LVP titles in the week of date (this week by default)
+    def get_hall_of_shame(self, date: datetime = None, limit: int = 10) -> list:
+        week = get_week(date or datetime.now())
+        return [dict(row) for row in self.db.execute(
+            """SELECT w.account, a.name, w.bosses, w.mvps, w.lvps FROM account_weeks w LEFT JOIN accounts a ON a.account = w.account
+               WHERE w.week = ? AND w.lvps > 0 ORDER BY w.lvps DESC LIMIT ?""",
+            (week, limit)
+        )]
@@ -0,0 +1,97 @@
+import asyncio
+import itertools
+from time import monotonic
+
+class QueueFull(Exception):
+    pass
+
+class Job:
+
+    def __init__(self, guild_id, user_id, size: int, run, seq: int):
+        self.guild_id  = guild_id
+        self.user_id   = user_id
+        self.size      = size    # number of logs, small jobs go first
+        self.run       = run     # coroutine function, called once a worker is free
+        self.seq       = seq
+        self.submitted = monotonic()
+        self.started   = asyncio.Event()
+        self.result    = asyncio.get_running_loop().create_future()
+
+    def __repr__(self) -> str:
+        return f"Job({self.seq}, guild={self.guild_id}, user={self.user_id}, size={self.size})"
+
+    async def wait(self):
+        return await self.result
+
+class JobQueue:
+
+    # workers     : jobs running at the same time
+    # per_guild   : running jobs allowed per guild, per_user the same per user
+    # max_backlog : waiting jobs allowed before rejecting new ones
+    # small_job   : jobs with at most this many logs get priority
+    # promote     : seconds after which a big job is treated as a small one, so full clears are not starved
+    def __init__(self, workers: int = 3, per_guild: int = 2, per_user: int = 1, max_backlog: int = 20, small_job: int = 1, promote: float = 60):
+        self.workers     = workers
+        self.per_guild   = per_guild
+        self.per_user    = per_user
+        self.max_backlog = max_backlog
+        self.small_job   = small_job
+        self.promote     = promote
+        self.pending     = []
+        self.running     = set()
+        self._guilds     = {}
+        self._users      = {}
+        self._seq        = itertools.count()
+
+    def submit(self, guild_id, user_id, size: int, run) -> Job:
+        if len(self.pending) >= self.max_backlog:
+            raise QueueFull(f"{len(self.pending)} jobs already waiting")
+        job = Job(guild_id, user_id, size, run, next(self._seq))
+        self.pending.append(job)
+        self._dispatch()
+        return job
+
+    # Number of jobs that will start before this one (0 if running or next)
+    def position(self, job: Job) -> int:
+        if job.started.is_set():
+            return 0
+        now = monotonic()
+        return sorted(self.pending, key=lambda other: self._priority(other, now)).index(job)
+
+    def _priority(self, job: Job, now: float):
+        is_big = job.size > self.small_job and now - job.submitted < self.promote
+        return is_big, job.seq
+
+    def _can_start(self, job: Job) -> bool:
+        return self._guilds.get(job.guild_id, 0) < self.per_guild and self._users.get(job.user_id, 0) < self.per_user
+
+    # Start the best waiting jobs allowed by the guild / user limits while workers are free
+    def _dispatch(self):
+        now = monotonic()
+        for job in sorted(self.pending, key=lambda job: self._priority(job, now)):
+            if len(self.running) >= self.workers:
+                break
+            if not self._can_start(job):
+                continue
+            self.pending.remove(job)
+            self.running.add(job)
+            self._guilds[job.guild_id] = self._guilds.get(job.guild_id, 0) + 1
+            self._users[job.user_id]   = self._users.get(job.user_id, 0) + 1
+            job.started.set()
+            asyncio.create_task(self._run(job))
+
+    async def _run(self, job: Job):
+        try:
+            result = await job.run()
+        except BaseException as e:
+            if not job.result.done():
+                job.result.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        else:
+            job.result.set_result(result)
+        finally:
+            self.running.discard(job)
+            self._guilds[job.guild_id] -= 1
+            self._users[job.user_id]   -= 1
+            self._dispatch()
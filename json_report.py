@@ -0,0 +1,70 @@
+import json
+import sys
+
+from const import CUSTOM_NAMES
+from models.finding_class import get_findings
+
+class JsonReport:
+
+    # Streams the run as NDJSON : one object per boss, written as soon as the boss is analysed,
+    # then one summary object. path "-" writes to the real stdout, even if prints are redirected
+    def __init__(self, path: str):
+        self.path   = path
+        self.stream = sys.__stdout__ if path == "-" else open(path, "w", encoding="utf-8")
+        self.bosses = []
+        self.marks  = {}  # account -> dps marks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.stream is not sys.__stdout__:
+            self.stream.close()
+
+    def _write(self, obj: dict):
+        self.stream.write(json.dumps(obj, ensure_ascii=False, default=str) + "\n")
+        self.stream.flush()
+
+    def write_boss(self, boss):
+        ranking = boss.get_dps_ranking() if boss.name != "ESCORT" else {}
+        for account, mark in ranking.items():
+            self.marks.setdefault(account, []).append(mark)
+        self.bosses.append(boss)
+        self._write({
+            "type"               : "boss",
+            "boss"               : boss.name,
+            "wing"               : boss.wing,
+            "cm"                 : bool(boss.cm),
+            "url"                : boss.log.url,
+            "start"              : boss.start_date.isoformat(),
+            "duration_ms"        : boss.duration_ms,
+            "wingman_percentile" : boss.wingman_percentile,
+            "mvps"               : boss.mvp_accounts,
+            "lvps"               : boss.lvp_accounts,
+            "findings"           : [finding.to_dict() for finding in get_findings(boss.mvp) + get_findings(boss.lvp)],
+            "dps_marks"          : ranking,
+        })
+
+    # Needs the players before get_message_reward clears them
+    def write_summary(self, players: dict):
+        bosses      = sorted(self.bosses, key=lambda boss: boss.start_date)
+        percentiles = [boss.wingman_percentile for boss in bosses if boss.wingman_percentile is not None]
+        summary     = {"type": "summary", "bosses": len(bosses)}
+        if bosses:
+            summary["start"]      = bosses[0].start_date.isoformat()
+            summary["duration_s"] = (bosses[-1].end_date - bosses[0].start_date).total_seconds()
+        summary["wingman_average"] = sum(percentiles) / len(percentiles) if percentiles else None
+        summary["players"]         = [
+            {
+                "account"  : player.account,
+                "name"     : CUSTOM_NAMES.get(player.account, player.name),
+                "mvps"     : player.mvps,
+                "lvps"     : player.lvps,
+                "dps_mark" : sum(self.marks[player.account]) / len(self.marks[player.account]) if self.marks.get(player.account) else None,
+            }
+            for player in sorted(players.values(), key=lambda player: (-player.mvps, player.lvps, player.account))
+        ]
+        self._write(summary)
@@ -1,14 +1,18 @@
 from argparse import ArgumentParser
 from time import perf_counter
+import sys
 import grequests
 import func
 import codecs
 
-from const import REQUEST_HEADERS, DPS_REPORT_JSON_URL, DEFAULT_LANGUAGE, DEFAULT_TITLE, DEFAULT_INPUT_FILE, ALL_BOSSES, ALL_PLAYERS
+from const import REQUEST_HEADERS, DPS_REPORT_JSON_URL, DEFAULT_LANGUAGE, DEFAULT_TITLE, DEFAULT_INPUT_FILE, DEFAULT_OUTPUT_FILE, ANALYSIS_CACHE_DIR, HISTORY_FILE, ALL_BOSSES, ALL_PLAYERS
 from models.log_class import Log
 from models.boss_facto import BossFactory
+from models.cache_class import AnalysisCache, CachedBoss
 from languages import LANGUES
 from input import InputParser
+from json_report import JsonReport
+from history import History
 
 def _make_parser() -> ArgumentParser:
     parser = ArgumentParser()
@@ -16,6 +20,12 @@ def _make_parser() -> ArgumentParser:
     parser.add_argument('-l', '--language', required=False, default=DEFAULT_LANGUAGE)
     parser.add_argument('-r', '--reward', action='store_true', required=False)
     parser.add_argument('-i', '--input', required=False, default=DEFAULT_INPUT_FILE)
+    parser.add_argument('-o', '--output', required=False, default=DEFAULT_OUTPUT_FILE)
+    parser.add_argument('-c', '--cache', required=False, default=ANALYSIS_CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', required=False)
+    parser.add_argument('-j', '--json', required=False, default=None)  # NDJSON report, "-" for stdout
+    parser.add_argument('--history', required=False, default=HISTORY_FILE)
+    parser.add_argument('--no-history', action='store_true', required=False)
     return parser
 
 def debugLog(url):
@@ -33,42 +43,127 @@ def debugLog(url):
     #ALL_BOSSES.clear()
     #ALL_PLAYERS.clear()
 
-def main(input_file, **kwargs) -> None:
+# Analyses the logs of an input file and returns the report as Discord-sized messages
+# late : LateWingman, the report does not wait for wingman past its deadline (see flame_worker)
+# history_file : run history the run is added to, None to not store it
+# records : url -> analysis record of a flame session, replayed like cache hits. Records of the new bosses are added to it
+def get_report_chunks(input_file, cache_folder=ANALYSIS_CACHE_DIR, json_output=None, language=None, late=None, history_file=HISTORY_FILE, records=None) -> list[str]:
+    ALL_BOSSES.clear()
+    ALL_PLAYERS.clear()
+    json_report = JsonReport(json_output) if json_output else None
     urls = InputParser(input_file).validate().urls
+    # Bosses whose handler did not change since their last analysis are replayed without fetching the log
+    cache = AnalysisCache(cache_folder) if cache_folder else None
+    keep_records = records is not None
+    records = records if keep_records else {}
+    if cache:
+        for url in dict.fromkeys(urls):
+            if url in records:
+                continue
+            boss_class = BossFactory.get_boss_class(url)
+            record = cache.load(url, boss_class) if boss_class else None
+            if record:
+                records[url] = record
+    # A permalink given several times is only fetched and parsed once
+    # Logs another worker is analysing are waited for once the others are done, instead of being fetched again
+    unique_urls = [url for url in dict.fromkeys(urls) if url not in records]
+    claimed = [url for url in unique_urls if not cache or not BossFactory.get_boss_class(url) or cache.claim(url)]
+    bosses = {}  # url -> boss analysed from its log
+    deferred = set()  # urls whose record is written once wingman answered
+    try:
+        analyse_logs(claimed, bosses, records, cache, keep_records, late, json_report, deferred)
+        waited = [url for url in unique_urls if url not in claimed]
+        for url in waited:
+            record = cache.wait_record(url, BossFactory.get_boss_class(url))
+            if record:
+                records[url] = record
+        analyse_logs([url for url in waited if url not in records], bosses, records, cache, keep_records, late, json_report, deferred)
+    except BaseException:
+        deferred.clear()  # the wingman callbacks will not run
+        raise
+    finally:
+        if cache:
+            for url in claimed:
+                if url not in deferred:
+                    cache.release(url)
+    if cache and late:
+        late.callbacks.append(lambda urls=[url for url in claimed if url in deferred]: [cache.release(url) for url in urls])
+    # Report order is the input order, whatever the order the logs were analysed in
+    analysed = len(ALL_BOSSES)
+    for url in urls:
+        if url in bosses:
+            ALL_BOSSES.append(bosses.pop(url))
+        elif url in records:
+            ALL_BOSSES.append(CachedBoss(records[url]))
+            if json_report:
+                json_report.write_boss(ALL_BOSSES[-1])
+    del ALL_BOSSES[:analysed]
+    if json_report:
+        json_report.write_summary(ALL_PLAYERS)
+        json_report.close()
+    if history_file and ALL_BOSSES:
+        # Copies, get_message_reward clears both. The run is stored once wingman answered
+        store_run = lambda bosses=list(ALL_BOSSES), players=dict(ALL_PLAYERS): add_to_history(history_file, bosses, players)
+        if late:
+            late.callbacks.append(store_run)
+        else:
+            store_run()
+    return func.get_message_reward(ALL_BOSSES, ALL_PLAYERS, titre=DEFAULT_TITLE, language=language, late=late)
+
+# Fetches the logs of urls and analyses them, the bosses are added to bosses (url -> boss) and their records to records
+# Urls whose record is written after wingman answered are added to deferred
+def analyse_logs(urls, bosses, records, cache, keep_records, late, json_report, deferred):
+    if not urls:
+        return
     requests = []
     for url in urls:
         requests.append(grequests.get(url))
         requests.append(grequests.get(DPS_REPORT_JSON_URL+url, headers=REQUEST_HEADERS))
     responses = grequests.map(requests, size=2*len(urls))
-    logs = [Log(url) for url in urls]
-    for i in range(len(urls)):
-        logs[i].set_jcontent(responses[2*i])
-        logs[i].set_pjcontent(responses[2*i+1])
-    for log in logs:
-        BossFactory.create_boss(log)
-    print("\n")
-    split_run_message = func.get_message_reward(ALL_BOSSES, ALL_PLAYERS, titre=DEFAULT_TITLE)
+    logs = {url: Log(url) for url in urls}
+    for i, url in enumerate(urls):
+        logs[url].set_jcontent(responses[2*i])
+        logs[url].set_pjcontent(responses[2*i+1])
+    for url in urls:
+        n_bosses = len(ALL_BOSSES)
+        before = AnalysisCache.snapshot()
+        BossFactory.create_boss(logs[url])
+        if len(ALL_BOSSES) == n_bosses:
+            continue
+        boss = bosses[url] = ALL_BOSSES[-1]
+        if cache or keep_records:
+            records[url] = AnalysisCache.get_record(boss, before)
+            # The record is written with the wingman answer, which may come after the report
+            save = cache.write if cache else AnalysisCache.set_wingman
+            if late:
+                late.callbacks.append(lambda record=records[url], boss=boss: save(record, boss))
+                deferred.add(url)
+            else:
+                save(records[url], boss)
+        # Each boss is streamed as soon as it is analysed
+        if json_report:
+            json_report.write_boss(boss)
 
-    # Remove all blanks from the text and print
-    for i in range(len(split_run_message)):
-        text = split_run_message[i]
-        text_out = "".join([s for s in text.strip().splitlines(True) if s.strip()])
-        print(text_out)
+def add_to_history(history_file, bosses, players):
+    with History(history_file) as history:
+        history.add_run(bosses, players, DEFAULT_TITLE)
 
+def main(input_file, output_file=DEFAULT_OUTPUT_FILE, cache_folder=ANALYSIS_CACHE_DIR, json_output=None, history_file=HISTORY_FILE, **kwargs) -> None:
+    chunks = get_report_chunks(input_file, cache_folder, json_output, kwargs.get("language"), history_file=history_file)
+    print("\n")
+    # Chunks have no blank lines already
+    for chunk in chunks:
+        print(chunk, end="")
 
     # Write to text file
-    with open("Flame_Output.txt", "w", encoding="utf-8") as f: 
-        text_out = ""
-        for i in range(len(split_run_message)): 
-            text = split_run_message[i]
-            while "\n\n" in text and i < 100:
-                text = text.replace("\n\n","\n")
-            text_out += text
-        text_out = text_out.replace("\n\n","\n")
-        f.write(text_out)
+    with open(output_file, "w", encoding="utf-8") as f: 
+        f.write("".join(chunks))
 
 
 if __name__ == "__main__":
+    args = _make_parser().parse_args()
+    if args.json == "-":
+        sys.stdout = sys.stderr  # the NDJSON stream owns stdout, everything else is printed to stderr
     print("Starting\n")
     start_time = perf_counter()
     
@@ -83,8 +178,7 @@ if __name__ == "__main__":
     LANGUES["selected_language"] = LANGUES["EN_PMA"]
     
     
-    args = _make_parser().parse_args()
-    main(args.input, reward_mode=args.reward, debug=args.debug, language=args.language)
+    main(args.input, args.output, None if args.no_cache else args.cache, args.json, None if args.no_history else args.history, reward_mode=args.reward, debug=args.debug, language=args.language)
     #debugLog("https://dps.report/YUU0-20250518-111201_cairn")
     end_time = perf_counter()
     print(f"--- {end_time - start_time:.3f} seconds ---\n")
\ No newline at end of file
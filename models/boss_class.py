@@ -1,19 +1,31 @@
 from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import pytz
+import numpy as np
 
 from models.player_class import *
-from const import ALL_PLAYERS, BOSS_DICT, CUSTOM_NAMES, BIG
+from const import ALL_PLAYERS, BOSS_DICT, CUSTOM_NAMES, BIG, WINGMAN_REQUEST_TIMEOUT, WINGMAN_LIVE_FALLBACK
 from models.log_class import Log
+from models.event_class import EventStream
+from models.skill_class import SkillMatrix
+from models.table_class import StatsTable
+from models.zone_class import Zone, ZoneOccupancy
 import func
-from languages import LANGUES
+import wingman
+from models.finding_class import Finding, Names
+
+# Wingman answers are only decorative, they are fetched in the background while the log is analysed
+WINGMAN_POOL = ThreadPoolExecutor(max_workers=8)
 
 class Boss:  
 
-    name       = None
-    wing       = 0
-    boss_id    = -1
-    real_phase = "Full Fight"
+    name        = None
+    wing        = 0
+    boss_id     = -1
+    real_phase  = "Full Fight"
+    zones       = []
+    positions   = False  # keeps the replay positions in occupancy even without zones
 
     def __init__(self, log: Log):
         self.log                = log
@@ -23,13 +35,19 @@ class Boss:
         self.duration_ms        = self.get_duration_ms() 
         self.start_date         = self.get_start_date()
         self.end_date           = self.get_end_date()
+        self.events             = self.get_events()
+        self.damage_dealt       = self.get_damage_dealt()
+        self.damage_taken       = self.get_damage_taken()
+        self.stats_table        = self.get_stats_table()
         self.player_list        = self.get_player_list()
-        self.wingman_time       = self.get_wingman_time()
-        self.wingman_percentile = self.get_wingman_percentile()
+        self.wingman            = WINGMAN_POOL.submit(self.get_wingman)
         self.real_phase_id      = self.get_phase_id(self.real_phase)
         self.time_base          = self.get_time_base()
+        self.occupancy          = self.get_occupancy()
         self.mvp_accounts       = []
         self.lvp_accounts       = []
+        self._masks             = {}
+        self._outliers          = {}
         for i in self.player_list:
             account = self.get_player_account(i)
             player  = ALL_PLAYERS.get(account)
@@ -41,6 +59,15 @@ class Boss:
                 
     def __repr__(self) -> str:
         return self.log.url    
+
+    # Both wait for the wingman answer, LateWingman checks self.wingman first to not block the report
+    @property
+    def wingman_time(self):
+        return self.wingman.result()[0]
+
+    @property
+    def wingman_percentile(self):
+        return self.wingman.result()[1]
         
     ################################ Fonction pour attribus Boss ################################
     
@@ -77,11 +104,58 @@ class Boss:
         paris_timezone = timezone(timedelta(hours=1))
         return end_date.astimezone(paris_timezone)
 
+    def get_events(self):
+        return EventStream(self.log.pjcontent)
+
+    def get_damage_dealt(self):
+        return SkillMatrix(self.log.pjcontent['players'], "totalDamageDist")
+
+    def get_damage_taken(self):
+        return SkillMatrix(self.log.pjcontent['players'], "totalDamageTaken")
+
+    def get_stats_table(self):
+        return StatsTable(self.log.pjcontent['players'])
+
+    # Zone windows are resolved to sample indexes, a missing phase gives an empty window
+    def get_occupancy(self):
+        windows = {}
+        for zone in self.zones:
+            if zone.phase:
+                try:
+                    windows[zone.name] = self.get_phase_timers(zone.phase)
+                except ValueError:
+                    windows[zone.name] = (0, 0)
+            elif zone.start is not None or zone.end is not None:
+                start              = func.time_to_index(zone.start or 0, self.time_base)
+                end                = func.time_to_index(zone.end, self.time_base) if zone.end is not None else BIG
+                windows[zone.name] = (start, end)
+        return ZoneOccupancy(self.log.pjcontent['players'] if self.zones or self.positions else [], self.zones, windows)
+
+    # (time, percentile) from the local wingman snapshot, the live API is only asked for bosses it does not have
+    # An unreachable wingman gives (None, None) instead of failing the boss
+    def get_wingman(self):
+        snapshot   = wingman.get_snapshot()
+        percentile = snapshot.get_percentile(self.name, self.cm, self.duration_ms)
+        if percentile is not None or not WINGMAN_LIVE_FALLBACK:
+            return snapshot.get_time(self.name, self.cm), percentile
+        try:
+            return self.get_wingman_time(), self.get_wingman_percentile()
+        except (requests.RequestException, ValueError) as e:
+            print("wingman failed")
+            print(e)
+            return None, None
+
+    # Medians are the ones of the current era, cached for the current era
     def get_wingman_time(self):
         # return None
         w_boss_id = self.boss_id * (-1) ** self.cm
+        cache     = wingman.get_cache()
+        era, _    = cache.get_current_era() if cache else (None, None)
+        cached    = cache.get_time(w_boss_id, era) if era else None
+        if cached:
+            return cached
         url       = f"https://gw2wingman.nevermindcreations.de/api/boss?era=latest&bossID={w_boss_id}"
-        r         = requests.get(url)
+        r         = requests.get(url, timeout=WINGMAN_REQUEST_TIMEOUT)
         if not r.ok:
             print("wingman faled")
             print(r.status_code)
@@ -92,7 +166,10 @@ class Boss:
             print("wingman failed")
             print(data["error"])
             return None
-        return [data["duration_med"], data["duration_top"]]
+        wingman_time = [data["duration_med"], data["duration_top"]]
+        if era:
+            cache.put_time(w_boss_id, era, wingman_time)
+        return wingman_time
     
     def get_player_list(self):
         real_players = []
@@ -103,11 +180,19 @@ class Boss:
                 
         return real_players
     
+    # Percentiles depend on the era of the log, they are cached under it
     def get_wingman_percentile(self):
         time_stamp = int(self.get_start_date().timestamp())
+        cache      = wingman.get_cache()
+        era        = cache.get_log_era(time_stamp) if cache else None
+        cached     = cache.get_percentile(self.boss_id, self.cm, self.duration_ms, era) if cache else None
+        if cached is not None:
+            return cached
         requestUrl = f"https://gw2wingman.nevermindcreations.de/api/getPercentileByMetadata?bossID={self.boss_id}&isCM={self.cm}&duration={self.duration_ms}&timestamp={time_stamp}"
-        infos      = requests.get(requestUrl).json()
+        infos      = requests.get(requestUrl, timeout=WINGMAN_REQUEST_TIMEOUT).json()
         if infos.get("percentile"):
+            if cache:
+                cache.put_percentile(self.boss_id, self.cm, self.duration_ms, era, infos["percentile"])
             return infos["percentile"]
         return                  
             
@@ -156,13 +241,8 @@ class Boss:
         return self.log.pjcontent['players'][i_player]['defenses'][0]['deadCount'] > 0
     
     def is_buyer(self, i_player: int):
-        player_name = self.get_player_name(i_player)
-        mechanics   = self.log.pjcontent.get('mechanics')
-        if mechanics:
-            death_history = [death for mech in mechanics if mech['name'] == "Dead" for death in mech['mechanicsData']]
-            for death in death_history:
-                if death['time'] < 20000 and death['actor'] == player_name:
-                    return True
+        if len(self.events.select("Dead", actor=i_player, end=20000)):
+            return True
         try:
             rota = self.get_player_rotation(i_player)
         except:
@@ -256,6 +336,43 @@ class Boss:
     def get_cc_total(self, i_player: int):
         return self.log.pjcontent['players'][i_player]['dpsAll'][0]['breakbarDamage']
     
+    # Same stats as above for every player of the log at once
+    def get_cc_boss_column(self):
+        return self.stats_table.targets['breakbar'][:, 0, 0]
+    
+    def get_dmg_boss_column(self):
+        return self.stats_table.targets['damage'][:, 0, self.real_phase_id]
+    
+    def get_dmg_cleave_column(self, targets: int):
+        return self.stats_table.get_cleave('damage', targets, self.real_phase_id)
+    
+    def get_cc_total_column(self):
+        return self.stats_table.all['breakbar'][:, 0]
+    
+    # Values of fnc for player_list, read from the stats table when fnc is one of the generic getters
+    def get_values(self, fnc: classmethod, mask: np.ndarray = None):
+        columns = {
+            Boss.get_cc_boss : self.get_cc_boss_column,
+            Boss.get_dmg_boss: self.get_dmg_boss_column,
+            Boss.get_cc_total: self.get_cc_total_column,
+        }
+        column = columns.get(getattr(fnc, '__func__', None))
+        if column:
+            return column()[self.player_list]
+        if mask is None:
+            return np.array([fnc(i) for i in self.player_list])
+        return np.array([fnc(i) if keep else 0 for i, keep in zip(self.player_list, mask)])
+    
+    # True for the players of player_list matching any of the filters, each filter is evaluated once per boss
+    def get_mask(self, filters: list[classmethod] = []):
+        mask = np.zeros(len(self.player_list), dtype=bool)
+        for filter_func in filters:
+            key = getattr(filter_func, '__func__', filter_func)
+            if key not in self._masks:
+                self._masks[key] = np.array([bool(filter_func(i)) for i in self.player_list], dtype=bool)
+            mask |= self._masks[key]
+        return mask
+    
     def get_player_id(self, name: str):
         players = self.log.pjcontent['players'] 
         for i_player, player in enumerate(players):
@@ -267,19 +384,7 @@ class Boss:
         return self.log.pjcontent['players'][i_player]['profession']
     
     def get_player_mech_history(self, i_player: int, mechs: list[str] = []):
-        history      = []
-        player_name  = self.get_player_name(i_player)
-        mech_history = self.log.pjcontent['mechanics']
-        for mech in mech_history:
-            for data in mech['mechanicsData']:
-                if data['actor'] == player_name:
-                    if mechs:
-                        if mech['name'] in mechs:
-                            history.append({"name": mech['name'], "time": data['time']})
-                    else:
-                        history.append({"name": mech['name'], "time": data['time']})
-        history.sort(key=lambda mech: mech["time"], reverse=False)
-        return history
+        return self.events.history(i_player, mechs)
     
     def players_to_string(self, i_players: list[int]):
         name_list = []
@@ -290,7 +395,7 @@ class Boss:
                 name_list.append(custom_name)
             else:
                 name_list.append(self.get_player_name(i))
-        return "__"+'__ / __'.join(name_list)+"__"
+        return Names("__"+'__ / __'.join(name_list)+"__", [self.get_player_account(i) for i in i_players])
     
     def get_player_death_timer(self, i_player: int):
         if self.is_dead(i_player):
@@ -319,6 +424,9 @@ class Boss:
                     return (i+i_enter) * 150
         return
     
+    def get_accounts(self) -> list[str]:
+        return [self.get_player_account(i) for i in self.player_list]
+
     def add_mvps(self, players: list[int]):
         self.mvp_accounts = [self.get_player_account(i) for i in players]
         for i in players:
@@ -332,18 +440,12 @@ class Boss:
             ALL_PLAYERS[account].lvps += 1
             
     def _get_dps_contrib(self, exclude: list[classmethod]=[]):
-        dps_ranking = {}
-        max_dps     = 0
-        for i in self.player_list:
-            if any(filter_func(i) for filter_func in exclude):
-                continue
-            player_dps = self.log.pjcontent['players'][i]['dpsTargets'][0][self.real_phase_id]['damage']
-            if player_dps > max_dps:
-                max_dps = player_dps
-            dps_ranking[self.log.pjcontent['players'][i]['account']] = player_dps
-        for player in dps_ranking:
-            dps_ranking[player] = 20 * dps_ranking[player] / max_dps
-        return dps_ranking
+        i_players  = np.array(self.player_list, dtype=np.int64)[~self.get_mask(exclude)]
+        player_dps = self.get_dmg_boss_column()[i_players]
+        max_dps    = player_dps.max() if len(player_dps) else 0
+        marks      = 20 * player_dps / max_dps if max_dps else np.zeros(len(player_dps))
+        accounts   = [self.get_player_account(i) for i in i_players]
+        return dict(zip(accounts, marks.tolist()))
 
     def get_dps_ranking(self):
         return self._get_dps_contrib([self.is_support])
@@ -403,14 +505,14 @@ class Boss:
         number_mvp = len(i_players)  
         if min_cc == 0:
             if number_mvp == 1:
-                return LANGUES["selected_language"]["MVP BOSS 0 CC S"].format(mvp_names=mvp_names)
+                return Finding("MVP BOSS 0 CC S", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["MVP BOSS 0 CC P"].format(mvp_names=mvp_names)
+                return Finding("MVP BOSS 0 CC P", mvp_names=mvp_names)
         else:
             if number_mvp == 1:
-                return LANGUES["selected_language"]["MVP BOSS CC S"].format(mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
+                return Finding("MVP BOSS CC S", mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
             else:
-                return LANGUES["selected_language"]["MVP BOSS CC P"].format(mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
+                return Finding("MVP BOSS CC P", mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
     
     def get_mvp_cc_total(self,extra_exclude: list[classmethod]=[]):
         i_players, min_cc, total_cc = Stats.get_min_value(self, self.get_cc_total, exclude=[*extra_exclude])
@@ -422,33 +524,31 @@ class Boss:
         number_mvp = len(i_players)  
         if min_cc == 0:
             if number_mvp == 1:
-                return LANGUES["selected_language"]["MVP TOTAL 0 CC S"].format(mvp_names=mvp_names)
+                return Finding("MVP TOTAL 0 CC S", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["MVP TOTAL 0 CC P"].format(mvp_names=mvp_names)
+                return Finding("MVP TOTAL 0 CC P", mvp_names=mvp_names)
         else:
             if number_mvp == 1:
-                return LANGUES["selected_language"]["MVP TOTAL CC S"].format(mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
+                return Finding("MVP TOTAL CC S", mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
             else:
-                return LANGUES["selected_language"]["MVP TOTAL CC P"].format(mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
+                return Finding("MVP TOTAL CC P", mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
     
     def get_bad_dps(self, extra_exclude: list[classmethod]=[]):
         i_sup, sup_max_dmg, _ = Stats.get_max_value(self, self.get_dmg_boss, exclude=[self.is_dps, self.is_bannerslave])
         sup_name              = self.players_to_string(i_sup)
+        skip                  = self.get_mask([*extra_exclude, self.is_dead, self.is_support, self.is_bannerslave, self.is_heal])
+        dps                   = self.get_values(self.get_dmg_boss, mask=~skip)
         bad_dps               = []
-        for i in self.player_list:   
-            if any(filter_func(i) for filter_func in extra_exclude) or self.is_dead(i) or self.is_support(i) or self.is_bannerslave(i) or self.is_heal(i):
-                continue
-            dps = self.get_dmg_boss(i)
-            if dps < sup_max_dmg:
-                if not(self.name == "QUOIDIMM" and self.get_player_spe(i) == "Spellbreaker"): 
-                    bad_dps.append(i)
+        for i in np.array(self.player_list, dtype=np.int64)[~skip & (dps < sup_max_dmg)].tolist():
+            if not(self.name == "QUOIDIMM" and self.get_player_spe(i) == "Spellbreaker"): 
+                bad_dps.append(i)
         if bad_dps:
             self.add_mvps(bad_dps)
             bad_dps_name = self.players_to_string(bad_dps)
             if len(bad_dps) == 1:
-                return LANGUES["selected_language"]["MVP BAD DPS S"].format(bad_dps_name=bad_dps_name, sup_name=sup_name)
+                return Finding("MVP BAD DPS S", bad_dps_name=bad_dps_name, sup_name=sup_name)
             else:
-                return LANGUES["selected_language"]["MVP BAD DPS P"].format(bad_dps_name=bad_dps_name, sup_name=sup_name)
+                return Finding("MVP BAD DPS P", bad_dps_name=bad_dps_name, sup_name=sup_name)
     
     # General function that flames for different generic low boon uptime
     def get_bad_boons(self, phase: str, exclude: list[classmethod]=[]):
@@ -495,7 +595,7 @@ class Boss:
 
         # Generic flame if boon player situation is ???
         if alac_sub1 == 69 or alac_sub2 == 69 or quick_sub1 == 69 or quick_sub2 == 69:
-            return LANGUES["selected_language"]["MVP BOON SETUP NO COM"]
+            return Finding("MVP BOON SETUP NO COM")
         
         # Tag soloheal if exists
         if heal_sub1 == 69 and heal_sub2 < 69:
@@ -704,9 +804,9 @@ class Boss:
             mvp_names_2 = self.players_to_string(list(set(mvp_name)))       
             mvp_names = self.players_to_string(list(set(mvp_quick)))
             if len(mvp_name) > 0:
-                prompt += LANGUES["selected_language"]["MVP QUICK MERGED"].format(mvp_names=mvp_names_2) + "\n"
+                prompt += Finding("MVP QUICK MERGED", mvp_names=mvp_names_2) + "\n"
             if len(mvp_quick) > 0:
-                prompt += LANGUES["selected_language"]["MVP QUICK"].format(mvp_names=mvp_names) + "\n"
+                prompt += Finding("MVP QUICK", mvp_names=mvp_names) + "\n"
 
         # Alacrity
         if len(mvp_alac) > 0:
@@ -729,9 +829,9 @@ class Boss:
             mvp_names_2 = self.players_to_string(list(set(mvp_name)))       
             mvp_names = self.players_to_string(list(set(mvp_alac)))    
             if len(mvp_name) > 0:
-                prompt += LANGUES["selected_language"]["MVP ALAC MERGED"].format(mvp_names=mvp_names_2) + "\n"
+                prompt += Finding("MVP ALAC MERGED", mvp_names=mvp_names_2) + "\n"
             if len(mvp_alac) > 0:
-                prompt += LANGUES["selected_language"]["MVP ALAC"].format(mvp_names=mvp_names) + "\n"
+                prompt += Finding("MVP ALAC", mvp_names=mvp_names) + "\n"
 
         # Return Flame, multiple boons missing
 
@@ -740,7 +840,7 @@ class Boss:
         if len(dupes) > 0:
             self.add_mvps(list(dupes))
             mvp_names = self.players_to_string(list(set(dupes)))  
-            prompt += LANGUES["selected_language"]["MVP BOON MERGED"].format(mvp_names=mvp_names) + "\n"
+            prompt += Finding("MVP BOON MERGED", mvp_names=mvp_names) + "\n"
 
         for mvp in dupes:
             if mvp in mvp_might:
@@ -760,31 +860,31 @@ class Boss:
         if len(mvp_might) > 0:
             self.add_mvps(list(set(mvp_might)))
             mvp_names = self.players_to_string(list(set(mvp_might)))
-            prompt += LANGUES["selected_language"]["MVP MIGHT"].format(mvp_names=mvp_names)
+            prompt += Finding("MVP MIGHT", mvp_names=mvp_names)
             prompt += "\n"  
         # Fury
         if len(mvp_fury) > 0:
             self.add_mvps(list(set(mvp_fury)))
             mvp_names = self.players_to_string(list(set(mvp_fury)))
-            prompt += LANGUES["selected_language"]["MVP FURY"].format(mvp_names=mvp_names)
+            prompt += Finding("MVP FURY", mvp_names=mvp_names)
             prompt += "\n"
         # Protection
         if len(mvp_prot) > 0:
             self.add_mvps(list(set(mvp_prot)))
             mvp_names = self.players_to_string(list(set(mvp_prot)))
-            prompt += LANGUES["selected_language"]["MVP PROT"].format(mvp_names=mvp_names)
+            prompt += Finding("MVP PROT", mvp_names=mvp_names)
             prompt += "\n"
         # Regeneration
         if len(mvp_regen) > 0:
             self.add_mvps(list(set(mvp_regen)))
             mvp_names = self.players_to_string(list(set(mvp_regen)))
-            prompt += LANGUES["selected_language"]["MVP REGEN"].format(mvp_names=mvp_names)
+            prompt += Finding("MVP REGEN", mvp_names=mvp_names)
             prompt += "\n"
         # Swiftness
         if len(mvp_swift) > 0:
             self.add_mvps(list(set(mvp_swift)))
             mvp_names = self.players_to_string(list(set(mvp_swift)))
-            prompt += LANGUES["selected_language"]["MVP SWIFT"].format(mvp_names=mvp_names)
+            prompt += Finding("MVP SWIFT", mvp_names=mvp_names)
             prompt += "\n"
         
         return prompt
@@ -830,7 +930,7 @@ class Boss:
         if len(no_food) > 0:
             self.add_mvps(list(set(no_food)))
             mvp_names = self.players_to_string(list(set(no_food)))
-            prompt += LANGUES["selected_language"]["MVP NO FOOD"].format(mvp_names=mvp_names)
+            prompt += Finding("MVP NO FOOD", mvp_names=mvp_names)
             
         return prompt
 
@@ -850,7 +950,7 @@ class Boss:
         if len(buyers) > 0:
             self.add_mvps(list(set(buyers)))
             mvp_names = self.players_to_string(list(set(buyers)))
-            prompt += LANGUES["selected_language"]["MVP BUYER POV"].format(mvp_names=mvp_names)
+            prompt += Finding("MVP BUYER POV", mvp_names=mvp_names)
 
         return prompt
     
@@ -874,7 +974,7 @@ class Boss:
         self.add_lvps(i_players)
         lvp_names = self.players_to_string(i_players)
         cc_ratio  = max_cc / total_cc * 100
-        return LANGUES["selected_language"]["LVP BOSS CC"].format(lvp_names=lvp_names, max_cc=max_cc, cc_ratio=cc_ratio)
+        return Finding("LVP BOSS CC", lvp_names=lvp_names, max_cc=max_cc, cc_ratio=cc_ratio)
     
     def get_lvp_cc_total(self):
         i_players, max_cc, total_cc = Stats.get_max_value(self, self.get_cc_total)
@@ -883,7 +983,7 @@ class Boss:
         self.add_lvps(i_players)
         lvp_names = self.players_to_string(i_players)
         cc_ratio  = max_cc / total_cc * 100
-        return LANGUES["selected_language"]["LVP TOTAL CC"].format(lvp_names=lvp_names, max_cc=max_cc, cc_ratio=cc_ratio)
+        return Finding("LVP TOTAL CC", lvp_names=lvp_names, max_cc=max_cc, cc_ratio=cc_ratio)
     
     def get_lvp_dps(self):
         i_players, max_dmg, total_dmg = Stats.get_max_value(self, self.get_dmg_boss)
@@ -893,8 +993,8 @@ class Boss:
         foodSwapCount                 = self.get_foodswap_count(i_players[0])
         self.add_lvps(i_players) 
         if foodSwapCount:
-            return LANGUES["selected_language"]["LVP DPS FOODSWAP"].format(lvp_dps_name=lvp_dps_name, max_dmg=max_dmg, dmg_ratio=dmg_ratio, dps=dps, foodSwapCount=foodSwapCount)
-        return LANGUES["selected_language"]["LVP DPS"].format(lvp_dps_name=lvp_dps_name, max_dmg=max_dmg, dmg_ratio=dmg_ratio, dps=dps)
+            return Finding("LVP DPS FOODSWAP", lvp_dps_name=lvp_dps_name, max_dmg=max_dmg, dmg_ratio=dmg_ratio, dps=dps, foodSwapCount=foodSwapCount)
+        return Finding("LVP DPS", lvp_dps_name=lvp_dps_name, max_dmg=max_dmg, dmg_ratio=dmg_ratio, dps=dps)
 
     # General function to get people who contributed a lot to CC
     def get_lvp_cc_boss_PMA(self):
@@ -911,7 +1011,7 @@ class Boss:
         self.add_lvps(i_players)
         lvp_names = self.players_to_string(i_players)
         cc_ratio  = collective_cc / total_cc * 100
-        return LANGUES["selected_language"]["LVP BOSS CC PMA"].format(lvp_names=lvp_names, max_cc=collective_cc, cc_ratio=cc_ratio)
+        return Finding("LVP BOSS CC PMA", lvp_names=lvp_names, max_cc=collective_cc, cc_ratio=cc_ratio)
     
     # General function to get people who contributed a lot to CC
     def get_lvp_cc_cleave_PMA(self):
@@ -928,39 +1028,34 @@ class Boss:
         self.add_lvps(i_players)
         lvp_names = self.players_to_string(i_players)
         cc_ratio  = collective_cc / total_cc * 100
-        return LANGUES["selected_language"]["LVP BOSS CC PMA"].format(lvp_names=lvp_names, max_cc=collective_cc, cc_ratio=cc_ratio)
+        return Finding("LVP BOSS CC PMA", lvp_names=lvp_names, max_cc=collective_cc, cc_ratio=cc_ratio)
     
 
 
     # General function to get people who contributed a lot to DPS
     def get_lvp_dps_PMA(self, targets: int=1):
         # Find max damage and total damage
-        max_dmg = 0
-        total_dmg = 0
-        for i in self.player_list:
-            total_dmg += self.get_dmg_cleave(i,targets)
-            if self.get_dmg_cleave(i,targets) > max_dmg:
-                max_dmg = self.get_dmg_cleave(i,targets)
+        cleave_dmg = self.get_dmg_cleave_column(targets)[self.player_list]
+        max_dmg = cleave_dmg.max(initial=0).item()
+        total_dmg = cleave_dmg.sum().item()
 
         # Collect other players who did a lot of DPS
         Food_Swappers = []
         Writ_Users = []
         Gamers = []
-        i_players = []
-        collective_DPS = 0
-        for i in self.player_list:
-            if self.get_dmg_cleave(i,targets) > 0.9 * max_dmg:
-                i_players.append(i)
-                collective_DPS = collective_DPS + self.get_dmg_cleave(i,targets) / self.duration_ms
-                # Check if person food swapped
-                if self.get_foodswap_count(i):
-                    Food_Swappers.append(i)
-                # Check if person used writs
-                if self.get_writ_user(i):
-                    Writ_Users.append(i)
-                # Otherwise, add player to fair group
-                if not(self.get_foodswap_count(i) or self.get_writ_user(i)):
-                    Gamers.append(i)
+        top_dps = cleave_dmg > 0.9 * max_dmg
+        i_players = np.array(self.player_list, dtype=np.int64)[top_dps].tolist()
+        collective_DPS = cleave_dmg[top_dps].sum().item() / self.duration_ms
+        for i in i_players:
+            # Check if person food swapped
+            if self.get_foodswap_count(i):
+                Food_Swappers.append(i)
+            # Check if person used writs
+            if self.get_writ_user(i):
+                Writ_Users.append(i)
+            # Otherwise, add player to fair group
+            if not(self.get_foodswap_count(i) or self.get_writ_user(i)):
+                Gamers.append(i)
 
         dmg_ratio  = (collective_DPS * self.duration_ms) / total_dmg * 100
         self.add_lvps(i_players)
@@ -989,25 +1084,25 @@ class Boss:
                 return
             # Fair DPS race, no writs or swaps
             case 1:
-                return LANGUES["selected_language"]["LVP DPS 001 PMA"].format(lvp_names=gamer_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
+                return Finding("LVP DPS 001 PMA", lvp_names=gamer_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
             # Writ users only
             case 10:
-                return LANGUES["selected_language"]["LVP DPS 010 PMA"].format(lvp_names=writ_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
+                return Finding("LVP DPS 010 PMA", lvp_names=writ_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
             # Writ users AND normal people
             case 11:
-                return LANGUES["selected_language"]["LVP DPS 011 PMA"].format(lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, writ_names=writ_names)
+                return Finding("LVP DPS 011 PMA", lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, writ_names=writ_names)
             # Food swappers only
             case 100:
-                return LANGUES["selected_language"]["LVP DPS 100 PMA"].format(lvp_names=swap_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
+                return Finding("LVP DPS 100 PMA", lvp_names=swap_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
             # Food swappers AND normal people
             case 101:
-                return LANGUES["selected_language"]["LVP DPS 101 PMA"].format(lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, swap_names=swap_names)
+                return Finding("LVP DPS 101 PMA", lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, swap_names=swap_names)
             # Food swappers AND writ users
             case 110:
-                return LANGUES["selected_language"]["LVP DPS 110 PMA"].format(lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, writ_names=writ_names, swap_names=swap_names)
+                return Finding("LVP DPS 110 PMA", lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, writ_names=writ_names, swap_names=swap_names)
             # Food swappers, writ users, normal people
             case 111:
-                return LANGUES["selected_language"]["LVP DPS 111 PMA"].format(lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, writ_names=writ_names, swap_names=swap_names, gamer_names=gamer_names)
+                return Finding("LVP DPS 111 PMA", lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio, writ_names=writ_names, swap_names=swap_names, gamer_names=gamer_names)
         
         # Code somehow fucked up
         return
@@ -1015,27 +1110,15 @@ class Boss:
     # General function to get boondps who do well
     def get_lvp_bdps_PMA(self, targets: int=1):
         # Find max damage and total damage
-        max_dmg = 0
-        total_dmg = 0
-        for i in self.player_list:
-            total_dmg += self.get_dmg_cleave(i,targets)
-            if self.get_dmg_cleave(i,targets) > max_dmg:
-                max_dmg = self.get_dmg_cleave(i,targets)
+        cleave_dmg = self.get_dmg_cleave_column(targets)[self.player_list]
+        max_dmg = cleave_dmg.max(initial=0).item()
+        total_dmg = cleave_dmg.sum().item()
 
-        # Collect gamer bdps
-        i_players = []
-        collective_DPS = 0
-        for i in self.player_list:
-            # If no boon, skip
-            if not (self.is_alac(i) or self.is_quick(i)):
-                continue
-            # If healer, skip
-            if self.is_heal(i):
-                continue
-            # Check if bdps did dps
-            if self.get_dmg_cleave(i,targets) > 0.75 * max_dmg:
-                i_players.append(i)
-                collective_DPS = collective_DPS + self.get_dmg_cleave(i,targets) / self.duration_ms
+        # Collect gamer bdps : boon players, no healers, who did dps
+        boon_dps = self.get_mask([self.is_alac, self.is_quick]) & ~self.get_mask([self.is_heal])
+        good_bdps = boon_dps & (cleave_dmg > 0.75 * max_dmg)
+        i_players = np.array(self.player_list, dtype=np.int64)[good_bdps].tolist()
+        collective_DPS = cleave_dmg[good_bdps].sum().item() / self.duration_ms
 
         dmg_ratio  = (collective_DPS * self.duration_ms) / total_dmg * 100
         söder_ratio  = (collective_DPS * self.duration_ms) / max_dmg * 100
@@ -1044,9 +1127,9 @@ class Boss:
 
         # Praise people if they exist. Descartes moment
         if len(i_players) == 1:
-            return LANGUES["selected_language"]["LVP BDPS PMA S"].format(lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=söder_ratio)
+            return Finding("LVP BDPS PMA S", lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=söder_ratio)
         if len(i_players) > 1:
-            return LANGUES["selected_language"]["LVP BDPS PMA P"].format(lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
+            return Finding("LVP BDPS PMA P", lvp_names=lvp_names, dps=collective_DPS, dmg_ratio=dmg_ratio)
 
         # No bitches
         return
@@ -1178,7 +1261,7 @@ class Boss:
         if len(i_players) > 0:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)
-            prompt += LANGUES["selected_language"]["LVP BIG BOON"].format(lvp_names=lvp_names)
+            prompt += Finding("LVP BIG BOON", lvp_names=lvp_names)
         return prompt
     
     # General praise function
@@ -1218,6 +1301,30 @@ class Boss:
             return self.log.jcontent['phases'][phase]['mechanicStats'][i_player][i_mech][0]
         return 0
         
+    # Mechanic counts of player_list
+    def get_mech_column(self, mech_name: str, phase: str="Full Fight"):
+        mechs_list = [mech['name'] for mech in self.mechanics]
+        if mech_name not in mechs_list:
+            return np.zeros(len(self.player_list))
+        i_mech = mechs_list.index(mech_name)
+        stats  = self.log.jcontent['phases'][self.get_phase_id(phase)]['mechanicStats']
+        return np.array([stats[i][i_mech][0] for i in self.player_list], dtype=float)
+
+    # Count above which a player is in the top (1 - quantile) of the wingman population for this boss and mode,
+    # never below default, so a population where most players score 0 does not flag a single hit
+    def get_mech_threshold(self, mech_name: str, quantile: float = 0.9, default: float = 0):
+        threshold = wingman.get_snapshot().get_quantile(self.name, self.cm, mech_name, quantile)
+        return default if threshold is None else max(default, threshold)
+
+    # Players of player_list above the threshold of a mechanic, one comparison for the whole squad
+    # Computed once per boss, the per player got_* checks read the same set
+    def get_mech_outliers(self, mech_name: str, quantile: float = 0.9, default: float = 0, phase: str="Full Fight"):
+        key = (mech_name, quantile, default, phase)
+        if key not in self._outliers:
+            flags               = self.get_mech_column(mech_name, phase) > self.get_mech_threshold(mech_name, quantile, default)
+            self._outliers[key] = [i for i, flag in zip(self.player_list, flags) if flag]
+        return list(self._outliers[key])
+
     def get_mech_value_nocringe(self, i_player: int, mech_num: str, phase: str="Full Fight"):
         phase      = self.get_phase_id(phase)
         return self.log.jcontent['phases'][phase]['mechanicStats'][i_player][mech_num][0]
@@ -1324,21 +1431,15 @@ class Stats:
                       exclude: list[classmethod] = []):  
         if exclude is None:
             exclude = []
-        value_max = -1
-        value_tot = 0
-        i_maxs    = []
-        for i in boss.player_list:
-            value      = fnc(i)
-            value_tot += value
-            if any(filter_func(i) for filter_func in exclude):
-                continue
-            if value > value_max:
-                value_max = value
-                i_maxs = [i]
-            elif value == value_max:
-                i_maxs.append(i)
+        values    = boss.get_values(fnc)
+        value_tot = values.sum().item()
+        keep      = ~boss.get_mask(exclude)
+        if not keep.any():
+            return [], -1, value_tot
+        value_max = values[keep].max().item()
         if value_max == 0:
             return [], value_max, value_tot
+        i_maxs    = np.array(boss.player_list, dtype=np.int64)[keep & (values == value_max)].tolist()
         return i_maxs, value_max, value_tot
         
     @staticmethod
@@ -1348,19 +1449,13 @@ class Stats:
 
         if exclude is None:
             exclude = []
-        value_min = BIG
-        value_tot = 0
-        i_mins    = []
-        for i in boss.player_list:
-            value      = fnc(i)
-            value_tot += value
-            if any(filter_func(i) for filter_func in exclude):
-                continue
-            if value < value_min:
-                value_min = value
-                i_mins = [i]
-            elif value == value_min:
-                i_mins.append(i)
+        values    = boss.get_values(fnc)
+        value_tot = values.sum().item()
+        keep      = ~boss.get_mask(exclude)
+        if not keep.any():
+            return [], BIG, value_tot
+        value_min = values[keep].min().item()
+        i_mins    = np.array(boss.player_list, dtype=np.int64)[keep & (values == value_min)].tolist()
         return i_mins, value_min, value_tot
 
     @staticmethod
@@ -1370,9 +1465,5 @@ class Stats:
                 
         if exclude is None:
             exclude = []
-        value_tot = 0
-        for i in boss.player_list:
-            if any(filter_func(i) for filter_func in exclude):
-                continue
-            value_tot += fnc(i)
-        return value_tot
\ No newline at end of file
+        keep = ~boss.get_mask(exclude)
+        return boss.get_values(fnc, mask=keep)[keep].sum().item()
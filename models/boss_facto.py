@@ -81,4 +81,9 @@ class BossFactory:
         boss_name = BOSS_DICT.get(log.jcontent['triggerID']) or EXTRA_BOSS_DICT.get(log.jcontent['triggerID'])
         # print(log.jcontent['triggerID']) # Use to obtain boss id from log
         if boss_name:
-            ALL_BOSSES.append(_BOSS_FACTORY[boss_name](log))
\ No newline at end of file
+            ALL_BOSSES.append(_BOSS_FACTORY[boss_name](log))
+
+    # Boss class from the permalink suffix (https://dps.report/xxxx-20250518-111201_cairn), None if unknown
+    @staticmethod
+    def get_boss_class(url: str):
+        return _BOSS_FACTORY.get(url.rsplit("_", 1)[-1])
\ No newline at end of file
@@ -0,0 +1,182 @@
+from datetime import datetime
+from time import sleep, time
+import hashlib
+import inspect
+import json
+import os
+
+from models.player_class import Player
+from models.boss_class import Boss
+from models.finding_class import dump_text, load_text
+from const import ALL_PLAYERS, ANALYSIS_LOCK_WAIT, ANALYSIS_LOCK_STALE
+from single_flight import get_handler_version
+import wingman
+
+class CachedBoss:
+
+    # Replays the result of a boss analysis without its log
+    # Only what the report needs is kept : header, mvp / lvp texts, tallies and dps marks
+    def __init__(self, record: dict):
+        self.name               = record['name']
+        self.wing               = record['wing']
+        self.cm                 = record['cm']
+        self.duration_ms        = record['duration_ms']
+        self.start_date         = datetime.fromisoformat(record['start_date'])
+        self.end_date           = datetime.fromisoformat(record['end_date'])
+        self.url                = record['url']
+        self.wingman_time       = record['wingman_time']
+        self.wingman_percentile = record['wingman_percentile']
+        self.mvp                = load_text(record['mvp'])
+        self.lvp                = load_text(record['lvp'])
+        self.mvp_accounts       = record['mvp_accounts']
+        self.lvp_accounts       = record['lvp_accounts']
+        self.dps_ranking        = record['dps_ranking']
+        self.accounts           = record['accounts']
+        self.wingman            = None  # nothing to wait for
+        self.log                = self  # boss.log.url
+        for account in record['accounts']:
+            player = ALL_PLAYERS.get(account)
+            if not player:
+                ALL_PLAYERS[account] = Player(self, account)
+            else:
+                player.add_boss(self)
+        for account, (mvps, lvps) in record['tallies'].items():
+            ALL_PLAYERS[account].mvps += mvps
+            ALL_PLAYERS[account].lvps += lvps
+
+    def __repr__(self) -> str:
+        return self.url
+
+    def get_dps_ranking(self):
+        return self.dps_ranking
+
+    def get_accounts(self):
+        return self.accounts
+
+class AnalysisCache:
+
+    # One json file per permalink, only valid for the boss handler version it was computed with
+    # A permalink is analysed by one worker at a time : the worker which claims it holds a lock file until its record
+    # is written, the others wait for the record instead of fetching and analysing the log again
+    def __init__(self, folder: str, wait: float = ANALYSIS_LOCK_WAIT, stale: float = ANALYSIS_LOCK_STALE):
+        self.folder = folder
+        self.wait   = wait
+        self.stale  = stale
+        os.makedirs(folder, exist_ok=True)
+
+    # Boss class source (with its base classes), the shared analysis code (func, const, models helpers, languages)
+    # and wingman snapshot, any change recomputes the boss. Other boss handlers do not
+    # Findings are stored with their language keys, the language files only matter for the texts kept in the records
+    @staticmethod
+    def get_handler_version(boss_class) -> str:
+        digest = hashlib.sha1()
+        for cls in boss_class.__mro__:
+            if cls is object:
+                continue
+            digest.update(inspect.getsource(cls).encode())
+        digest.update(get_handler_version(handlers=False).encode())
+        digest.update(wingman.get_snapshot().version.encode())
+        return digest.hexdigest()[:16]
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.folder, hashlib.sha1(url.encode()).hexdigest()[:24] + ".json")
+
+    def _lock_path(self, url: str) -> str:
+        return self._path(url)[:-len(".json")] + ".lock"
+
+    # False when another live worker is analysing the log
+    def claim(self, url: str) -> bool:
+        path = self._lock_path(url)
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            pass
+        try:
+            if time() - os.stat(path).st_mtime < self.stale:
+                return False
+            os.remove(path)
+        except OSError:
+            pass  # released meanwhile
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def release(self, url: str):
+        try:
+            os.remove(self._lock_path(url))
+        except OSError:
+            pass
+
+    # Record written by the worker holding the lock, None if it released the lock without one or took too long
+    def wait_record(self, url: str, boss_class):
+        deadline = time() + self.wait
+        while os.path.exists(self._lock_path(url)) and time() < deadline:
+            sleep(0.2)
+        return self.load(url, boss_class)
+
+    def load(self, url: str, boss_class):
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record.get('url') != url or record.get('boss_class') != boss_class.__name__ or record.get('version') != AnalysisCache.get_handler_version(boss_class):
+            return None
+        return record
+
+    # Players tallies are the difference of ALL_PLAYERS before / after the boss was created
+    @staticmethod
+    def snapshot() -> dict:
+        return {account: (player.mvps, player.lvps) for account, player in ALL_PLAYERS.items()}
+
+    def store(self, boss: Boss, before: dict):
+        return self.write(self.get_record(boss, before), boss)
+
+    # Record without the wingman answer, so it can be made before wingman answered
+    @staticmethod
+    def get_record(boss: Boss, before: dict) -> dict:
+        tallies = {}
+        for account, player in ALL_PLAYERS.items():
+            mvps, lvps = before.get(account, (0, 0))
+            if player.mvps != mvps or player.lvps != lvps:
+                tallies[account] = (player.mvps - mvps, player.lvps - lvps)
+        record = {
+            'url'                : boss.log.url,
+            'boss_class'         : type(boss).__name__,
+            'version'            : AnalysisCache.get_handler_version(type(boss)),
+            'name'               : boss.name,
+            'wing'               : boss.wing,
+            'cm'                 : boss.cm,
+            'duration_ms'        : boss.duration_ms,
+            'start_date'         : boss.start_date.isoformat(),
+            'end_date'           : boss.end_date.isoformat(),
+            'wingman_time'       : None,
+            'wingman_percentile' : None,
+            'mvp'                : dump_text(boss.mvp),
+            'lvp'                : dump_text(boss.lvp),
+            'mvp_accounts'       : boss.mvp_accounts,
+            'lvp_accounts'       : boss.lvp_accounts,
+            'accounts'           : boss.get_accounts(),
+            'tallies'            : tallies,
+            'dps_ranking'        : boss.get_dps_ranking() if boss.name != "ESCORT" else {},
+        }
+        return record
+
+    # Waits for the wingman answer of the boss
+    @staticmethod
+    def set_wingman(record: dict, boss: Boss) -> dict:
+        record['wingman_time']       = boss.wingman_time
+        record['wingman_percentile'] = boss.wingman_percentile
+        return record
+
+    def write(self, record: dict, boss: Boss) -> dict:
+        AnalysisCache.set_wingman(record, boss)
+        path = self._path(record['url'])
+        tmp  = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+        return record
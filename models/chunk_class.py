@@ -0,0 +1,45 @@
+class Chunker:
+
+    # Packs report blocks into messages of at most limit chars in one pass
+    # A block (boss header + its MVP / LVP lines) is never split unless it is bigger than a message itself
+    def __init__(self, limit: int = 2000):
+        self.limit   = limit
+        self.chunks  = []
+        self._parts  = []
+        self._length = 0
+
+    # Blank lines are dropped, every kept line ends with a newline
+    # reserve : chars the block may gain later (late wingman percentiles), counted as if they were there
+    def add(self, text: str, reserve: int = 0):
+        lines = [line + "\n" for line in text.split("\n") if line.strip()]
+        size  = sum(len(line) for line in lines) + (reserve if lines else 0)
+        if not lines:
+            return
+        if size > self.limit:
+            for line in lines:
+                self._add_line(line)
+            return
+        if self._length + size > self.limit:
+            self.flush()
+        self._parts.extend(lines)
+        self._length += size
+
+    def _add_line(self, line: str):
+        while len(line) > self.limit:
+            self.flush()
+            self.chunks.append(line[:self.limit])
+            line = line[self.limit:]
+        if self._length + len(line) > self.limit:
+            self.flush()
+        self._parts.append(line)
+        self._length += len(line)
+
+    def flush(self):
+        if self._parts:
+            self.chunks.append("".join(self._parts))
+        self._parts  = []
+        self._length = 0
+
+    def get_chunks(self) -> list[str]:
+        self.flush()
+        return self.chunks
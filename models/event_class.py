@@ -0,0 +1,113 @@
+import numpy as np
+
+class EventStream:
+
+    def __init__(self, content: dict):
+        self.kinds      = {}  # mechanic name -> kind code
+        self.full_kinds = {}  # mechanic full name -> kind code
+        self.names      = []  # kind code -> mechanic name
+        players         = content.get('players', [])
+        actor_ids       = {}
+        for i_player, player in enumerate(players):
+            actor_ids.setdefault(player['name'], i_player)
+
+        times, actors, kinds = [], [], []
+        # Mechanics, including Downed / Dead
+        for mech in content.get('mechanics') or []:
+            kind = self._add_kind(mech['name'], mech.get('fullName'))
+            for data in mech['mechanicsData']:
+                times.append(data['time'])
+                actors.append(actor_ids.get(data['actor'], -1))
+                kinds.append(kind)
+
+        # Columnar arrays sorted by time, ties keep mechanic order
+        order       = np.argsort(np.asarray(times, dtype=np.int64), kind='stable')
+        self.time   = np.asarray(times, dtype=np.int64)[order]
+        self.actor  = np.asarray(actors, dtype=np.int64)[order]
+        self.kind   = np.asarray(kinds, dtype=np.int64)[order]
+
+        # Secondary indexes, each group stays sorted by time
+        self._kind_order, self._kind_bounds   = self._group(self.kind, len(self.names))
+        self._actor_order, self._actor_bounds = self._group(self.actor + 1, len(players) + 1)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def _add_kind(self, name: str, full_name: str = None) -> int:
+        kind = self.kinds.get(name)
+        if kind is None:
+            kind             = len(self.names)
+            self.kinds[name] = kind
+            self.names.append(name)
+        if full_name:
+            self.full_kinds.setdefault(full_name, kind)
+        return kind
+
+    @staticmethod
+    def _group(keys: np.ndarray, n_groups: int):
+        order  = np.argsort(keys, kind='stable')
+        bounds = np.searchsorted(keys[order], np.arange(n_groups + 1))
+        return order, bounds
+
+    def get_kind(self, name: str):
+        kind = self.kinds.get(name)
+        if kind is None:
+            kind = self.full_kinds.get(name)
+        return kind
+
+    ################################ QUERIES ################################
+
+    # Indexes of the events of the given kinds (name or full name), sorted by time
+    def select(self, kinds, actor: int = None, start: int = None, end: int = None) -> np.ndarray:
+        if isinstance(kinds, str):
+            kinds = [kinds]
+        if actor is not None:
+            if actor < -1 or actor + 2 >= len(self._actor_bounds):
+                return np.empty(0, dtype=np.int64)
+            group = self._actor_order[self._actor_bounds[actor + 1]:self._actor_bounds[actor + 2]]
+            codes = [self.get_kind(kind) for kind in kinds]
+            index = group[np.isin(self.kind[group], [code for code in codes if code is not None])]
+        else:
+            parts = []
+            for kind in kinds:
+                code = self.get_kind(kind)
+                if code is not None:
+                    parts.append(self._kind_order[self._kind_bounds[code]:self._kind_bounds[code + 1]])
+            index = np.sort(np.concatenate(parts)) if len(parts) > 1 else (parts[0] if parts else np.empty(0, dtype=np.int64))
+        if start is not None:
+            index = index[self.time[index] >= start]
+        if end is not None:
+            index = index[self.time[index] < end]
+        return index
+
+    # Times of the events of the given kinds
+    def times(self, kinds, actor: int = None, start: int = None, end: int = None) -> np.ndarray:
+        return self.time[self.select(kinds, actor, start, end)]
+
+    # Sorted mechanic history of a player, same format as Boss.get_player_mech_history
+    def history(self, actor: int, kinds: list[str] = []) -> list[dict]:
+        if kinds:
+            index = self.select(kinds, actor=actor)
+        elif -1 <= actor < len(self._actor_bounds) - 2:
+            index = self._actor_order[self._actor_bounds[actor + 1]:self._actor_bounds[actor + 2]]
+        else:
+            index = np.empty(0, dtype=np.int64)
+        return [{"name": self.names[kind], "time": time} for kind, time in zip(self.kind[index].tolist(), self.time[index].tolist())]
+
+    # Interval join : pairs (i, j) of positions in a and b such that a[i] - before < b[j] < a[i] + after
+    def join(self, a: np.ndarray, b: np.ndarray, before: int, after: int):
+        empty = np.empty(0, dtype=np.int64)
+        if not len(a) or not len(b):
+            return empty, empty
+        time_a  = self.time[a]
+        b_order = np.argsort(self.time[b], kind='stable')
+        time_b  = self.time[b][b_order]
+        low     = np.searchsorted(time_b, time_a - before, side='right')
+        high    = np.searchsorted(time_b, time_a + after, side='left')
+        counts  = np.maximum(high - low, 0)
+        if not counts.sum():
+            return empty, empty
+        pos_a   = np.repeat(np.arange(len(a)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pos_b   = b_order[np.repeat(low, counts) + offsets]
+        return pos_a, pos_b
@@ -0,0 +1,175 @@
+from languages import LANGUES
+
+FALLBACK_LANGUAGE = "EN"
+
+# Template of a key in a language (selected language by default), falls back to english for missing keys
+def get_template(key: str, language: str = None) -> str:
+    texts    = LANGUES[language] if language else LANGUES["selected_language"]
+    template = texts.get(key) if texts else None
+    if template is None:
+        template = LANGUES[FALLBACK_LANGUAGE][key]
+    return template
+
+# Text of a finding / report part in another language, plain strings are returned as they are
+def render(value, language: str = None):
+    if isinstance(value, (Finding, Text, Names)):
+        return value.render(language)
+    return value
+
+def _make_finding(key: str, kwargs: dict):
+    return Finding(key, **kwargs)
+
+class Names(str):
+
+    # Display names of players, remembers their accounts
+    def __new__(cls, text: str, accounts: list[str]):
+        names          = str.__new__(cls, text)
+        names.accounts = list(accounts)
+        return names
+
+    def __reduce__(self):
+        return (Names, (str(self), self.accounts))
+
+    def render(self, language: str = None) -> str:
+        return str(self)
+
+class Finding(str):
+
+    # One formatted line of a report : behaves as the text in the selected language,
+    # but keeps the language key and the values so it can be rendered again in any language
+    def __new__(cls, key: str, **kwargs):
+        finding        = str.__new__(cls, get_template(key).format(**kwargs))
+        finding.key    = key
+        finding.kwargs = kwargs
+        return finding
+
+    def __reduce__(self):
+        return (_make_finding, (self.key, self.kwargs))
+
+    def __add__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return Text([self, other])
+
+    # Called before str.__add__, so "text" + finding keeps the structure
+    def __radd__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return Text([other, self])
+
+    @property
+    def kind(self):
+        words = self.key.split()
+        if "MVP" in words:
+            return "mvp"
+        if "LVP" in words:
+            return "lvp"
+        return None
+
+    # Accounts of the players named in the finding
+    @property
+    def players(self) -> list[str]:
+        accounts = []
+        for value in self.kwargs.values():
+            if isinstance(value, Names):
+                accounts.extend(account for account in value.accounts if account not in accounts)
+        return accounts
+
+    def render(self, language: str = None) -> str:
+        kwargs = {name: render(value, language) for name, value in self.kwargs.items()}
+        return get_template(self.key, language).format(**kwargs)
+
+    def to_dict(self) -> dict:
+        values = {}
+        for name, value in self.kwargs.items():
+            if isinstance(value, Names):
+                continue
+            if hasattr(value, "item"):  # numpy scalars
+                value = value.item()
+            values[name] = value if isinstance(value, (int, float, bool, type(None))) else str(value)
+        return {
+            "key"     : self.key,
+            "kind"    : self.kind,
+            "players" : self.players,
+            "values"  : values,
+        }
+
+class Text(str):
+
+    # Concatenation of plain strings and findings, built by + / += on findings
+    def __new__(cls, parts: list):
+        flat = []
+        for part in parts:
+            if isinstance(part, Text):
+                flat.extend(part.parts)
+            elif part:
+                flat.append(part)
+        text       = str.__new__(cls, "".join(flat))
+        text.parts = flat
+        return text
+
+    def __reduce__(self):
+        return (Text, (self.parts,))
+
+    def __add__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return Text(self.parts + [other])
+
+    def __radd__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return Text([other] + self.parts)
+
+    @property
+    def findings(self) -> list[Finding]:
+        return [part for part in self.parts if isinstance(part, Finding)]
+
+    def render(self, language: str = None) -> str:
+        return "".join(render(part, language) for part in self.parts)
+
+# Findings of a report part, whatever it is built of
+def get_findings(value) -> list[Finding]:
+    if isinstance(value, Text):
+        return value.findings
+    if isinstance(value, Finding):
+        return [value]
+    return []
+
+################################ SERIALISATION ################################
+
+# Json friendly form of a report part (None, str, Finding or Text), keeps what is needed to render it again
+def dump_text(value):
+    if value is None:
+        return None
+    parts = value.parts if isinstance(value, Text) else [value]
+    return [_dump_value(part) for part in parts]
+
+def load_text(data):
+    if data is None:
+        return None
+    parts = [_load_value(part) for part in data]
+    if len(parts) == 1 and isinstance(parts[0], Finding):
+        return parts[0]
+    return Text(parts)
+
+def _dump_value(value):
+    if isinstance(value, Names):
+        return {"names": str(value), "accounts": value.accounts}
+    if isinstance(value, Finding):
+        return {"key": value.key, "kwargs": {name: _dump_value(arg) for name, arg in value.kwargs.items()}}
+    if isinstance(value, Text):
+        return {"text": dump_text(value)}
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    return value
+
+def _load_value(value):
+    if isinstance(value, dict):
+        if "names" in value:
+            return Names(value["names"], value["accounts"])
+        if "key" in value:
+            return Finding(value["key"], **{name: _load_value(arg) for name, arg in value["kwargs"].items()})
+        if "text" in value:
+            return load_text(value["text"])
+    return value
@@ -0,0 +1,49 @@
+from concurrent.futures import wait
+
+from const import DISCORD_MESSAGE_LIMIT
+
+class LateWingman:
+
+    # Wingman answers missing after deadline seconds are left out of the report,
+    # the lines which need them are patched in once they arrive
+    def __init__(self, deadline: float):
+        self.deadline  = deadline
+        self.futures   = []
+        self.late      = []  # bosses rendered without their percentile
+        self.patches   = []  # (text in the report, function giving the text with the percentiles)
+        self.callbacks = []  # run once every answer arrived
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.late)
+
+    def wait_deadline(self, bosses: list):
+        self.futures = [boss.wingman for boss in bosses if boss.wingman is not None]
+        wait(self.futures, timeout=self.deadline)
+
+    # Percentile when wingman already answered, None otherwise (the boss is then late)
+    def get_percentile(self, boss):
+        if boss.wingman is not None and not boss.wingman.done():
+            self.late.append(boss)
+            return None
+        return boss.wingman_percentile
+
+    def add_patch(self, text: str, make_text):
+        self.patches.append((text, make_text))
+
+    # Waits for every answer and returns the chunks with the percentiles
+    # A patch which would not fit in its message is dropped
+    def get_chunks(self, chunks: list[str]) -> list[str]:
+        wait(self.futures)
+        for callback in self.callbacks:
+            callback()
+        patched = []
+        for chunk in chunks:
+            for text, make_text in self.patches:
+                if text in chunk:
+                    new_chunk = chunk.replace(text, make_text(), 1)
+                    if len(new_chunk) <= DISCORD_MESSAGE_LIMIT:
+                        chunk = new_chunk
+            patched.append(chunk)
+        self.late = []
+        return patched
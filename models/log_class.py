@@ -6,12 +6,19 @@ class Log:
         self.jcontent  = None
         self.pjcontent = None
     
-    def set_jcontent(self, http_response):       
-        content        = http_response.content.decode("utf-8")
+    def set_jcontent(self, http_response):
+        self.parse_jcontent(http_response.content)
+
+    # Page of the permalink, as bytes or a memoryview (see backfill.py, which fetches outside of the analysing process)
+    def parse_jcontent(self, content: bytes):
+        content        = str(content, "utf-8")
         # I edited this part for the log to work why did variable names change holy fuck kys
         java_data_text = content.split('const _logData = ')[1].split('const _crData = ')[0].rsplit(';', 1)[0].strip()
         #java_data_text = content.split('var _logData = ')[1].split('var logData = _logData;')[0].rsplit(';', 1)[0].strip()
         self.jcontent  = json.loads(java_data_text)
 
     def set_pjcontent(self, http_response):
-        self.pjcontent = http_response.json()
\ No newline at end of file
+        self.pjcontent = http_response.json()
+
+    def parse_pjcontent(self, content: bytes):
+        self.pjcontent = json.loads(str(content, "utf-8"))
\ No newline at end of file
@@ -0,0 +1,69 @@
+import numpy as np
+
+class SkillMatrix:
+
+    # Build player x phase x skill matrices from a per-phase damage distribution
+    # key is "totalDamageDist" (damage dealt) or "totalDamageTaken" (damage taken)
+    def __init__(self, players: list[dict], key: str):
+        self.key    = key
+        self.skills = {}  # skill id -> column
+        rows, phases, columns, hits, damage = [], [], [], [], []
+        n_phases = 0
+        for i_player, player in enumerate(players):
+            dists    = player.get(key) or []
+            n_phases = max(n_phases, len(dists))
+            for i_phase, dist in enumerate(dists):
+                for entry in dist:
+                    rows.append(i_player)
+                    phases.append(i_phase)
+                    columns.append(self.skills.setdefault(entry['id'], len(self.skills)))
+                    hits.append(entry.get('hits', 0))
+                    damage.append(entry.get('totalDamage', 0))
+
+        shape       = (len(players), n_phases, len(self.skills))
+        index       = (np.asarray(rows, dtype=np.int64), np.asarray(phases, dtype=np.int64), np.asarray(columns, dtype=np.int64))
+        self.hits   = np.zeros(shape, dtype=np.int64)
+        self.damage = np.zeros(shape, dtype=np.int64)
+        self.count  = np.zeros(shape, dtype=np.int64)  # number of entries, ie phases where the skill shows up
+        np.add.at(self.hits, index, np.asarray(hits, dtype=np.int64))
+        np.add.at(self.damage, index, np.asarray(damage, dtype=np.int64))
+        np.add.at(self.count, index, 1)
+
+    def _get(self, values: np.ndarray, skill_ids, phase):
+        if isinstance(skill_ids, int):
+            skill_ids = [skill_ids]
+        columns = [self.skills[skill_id] for skill_id in skill_ids if skill_id in self.skills]
+        summed  = values[:, :, columns].sum(axis=2)
+        if phase is None:
+            return summed
+        if phase >= summed.shape[1]:
+            return np.zeros(summed.shape[0], dtype=values.dtype)
+        return summed[:, phase]
+
+    # Per player values for one skill id (or a list of ids)
+    # phase is a phase index, None returns the whole player x phase slice
+    def get_hits(self, skill_ids, phase: int = 0) -> np.ndarray:
+        return self._get(self.hits, skill_ids, phase)
+
+    def get_damage(self, skill_ids, phase: int = 0) -> np.ndarray:
+        return self._get(self.damage, skill_ids, phase)
+
+    def get_count(self, skill_ids, phase: int = 0) -> np.ndarray:
+        return self._get(self.count, skill_ids, phase)
+
+    # Players with the highest / lowest value among i_players, same return as Stats.get_max_value
+    def get_max(self, i_players: list[int], skill_ids, field: str = "hits", phase: int = 0):
+        values = getattr(self, f"get_{field}")(skill_ids, phase)[i_players]
+        if not len(values):
+            return [], 0, 0
+        value_max = values.max()
+        i_maxs    = [i_players[i] for i in np.flatnonzero(values == value_max)]
+        return i_maxs, value_max.item(), values.sum().item()
+
+    def get_min(self, i_players: list[int], skill_ids, field: str = "damage", phase: int = 0):
+        values = getattr(self, f"get_{field}")(skill_ids, phase)[i_players]
+        if not len(values):
+            return [], 0, 0
+        value_min = values.min()
+        i_mins    = [i_players[i] for i in np.flatnonzero(values == value_min)]
+        return i_mins, value_min.item(), values.sum().item()
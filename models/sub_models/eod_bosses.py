@@ -1,5 +1,6 @@
 from models.boss_class import Boss, Stats
 from models.log_class import Log
+from models.finding_class import Finding
 from func import *
 
 ################################ MAI TRIN ################################
@@ -77,7 +78,7 @@ class AH(Boss):
         self.add_mvps(i_players)
         if i_players:
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["AH MVP EXPOSED"].format(mvp_names=mvp_names)
+            return Finding("AH MVP EXPOSED", mvp_names=mvp_names)
         return
     
     # Flame the people who skipped going into greens
@@ -86,7 +87,7 @@ class AH(Boss):
         self.add_mvps(i_players)
         if i_players:
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["AH MVP GREEN"].format(mvp_names=mvp_names)
+            return Finding("AH MVP GREEN", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -189,7 +190,7 @@ class KO(Boss):
         dmg_ratio                   = max_dmg / tot_dmg * 100
         dps                         = max_dmg / self.duration_ms
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["LVP DPS"].format(lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps)
+        return Finding("LVP DPS", lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps)
     
     ################################ MVP ################################
     
@@ -199,9 +200,9 @@ class KO(Boss):
         if max_debil > 1:
             self.add_lvps(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["KO MVP DEBIL S"].format(mvp_names=mvp_names, max_debil=max_debil)
+                return Finding("KO MVP DEBIL S", mvp_names=mvp_names, max_debil=max_debil)
             else:
-                return LANGUES["selected_language"]["KO MVP DEBIL P"].format(mvp_names=mvp_names, max_debil=max_debil)
+                return Finding("KO MVP DEBIL P", mvp_names=mvp_names, max_debil=max_debil)
         return
     
     ################################ DATA MECHAS ################################
@@ -279,7 +280,7 @@ class OLC(Boss):
         dmg_ratio                   = max_dmg / tot_dmg * 100
         dps                         = max_dmg / self.duration_ms
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["LVP DPS"].format(lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps)
+        return Finding("LVP DPS", lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps)
     
     ################################ DATA MECHAS ################################
     
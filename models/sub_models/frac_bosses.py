@@ -1,5 +1,6 @@
 from models.boss_class import Boss, Stats
 from models.log_class import Log
+from models.finding_class import Finding
 from func import *
 
 ################################ MAMA ################################
@@ -203,9 +204,9 @@ class KANAXAI(Boss):
         dmg_ratio                   = max_dmg / tot_dmg * 100
         dps                         = max_dmg / self.duration_ms
         if linkCount:
-            return LANGUES["selected_language"]["KANAXAI LVP DPS"].format(lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps, linkCount=linkCount)
+            return Finding("KANAXAI LVP DPS", lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps, linkCount=linkCount)
         else:
-            return LANGUES["selected_language"]["LVP DPS"].format(lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps)
+            return Finding("LVP DPS", lvp_dps_name=lvp_dps_name, dmg_ratio=dmg_ratio, dps=dps)
     
     ################################ DATA MECHAS ################################
     
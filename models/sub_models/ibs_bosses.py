@@ -1,5 +1,6 @@
 from models.boss_class import Boss, Stats
 from models.log_class import Log
+from models.finding_class import Finding
 from func import *
 
 ################################ ICEBROOD CONSTRUCT ################################
@@ -58,7 +59,7 @@ class KODANS(Boss):
         dps                         = max_dmg / self.duration_ms 
         dmg_ratio                   = max_dmg / tot_dmg * 100
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["LVP DPS"].format(lvp_dps_name=lvp_dps_name, dps=dps, dmg_ratio=dmg_ratio)
+        return Finding("LVP DPS", lvp_dps_name=lvp_dps_name, dps=dps, dmg_ratio=dmg_ratio)
     
     ################################ DATA MECHAS ################################
     
@@ -106,8 +107,8 @@ class FRAENIR(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["FRAENIR MVP FROZEN P"].format(mvp_names=mvp_names, max_frozen=max_frozen)
-            return LANGUES["selected_language"]["FRAENIR MVP FROZEN S"].format(mvp_names=mvp_names, max_frozen=max_frozen)
+                return Finding("FRAENIR MVP FROZEN P", mvp_names=mvp_names, max_frozen=max_frozen)
+            return Finding("FRAENIR MVP FROZEN S", mvp_names=mvp_names, max_frozen=max_frozen)
         return
     
     ################################ LVP ################################
@@ -122,7 +123,7 @@ class FRAENIR(Boss):
         self.add_lvps(i_players)
         if sak_count:
             sak_ratio = sak_dmg/max_dmg*100
-            return LANGUES["selected_language"]["FRAENIR LVP SAK"].format(lvp_dps_name=lvp_dps_name, sak_count=sak_count, sak_ratio=sak_ratio, dps=dps, dmg_ratio=dmg_ratio)
+            return Finding("FRAENIR LVP SAK", lvp_dps_name=lvp_dps_name, sak_count=sak_count, sak_ratio=sak_ratio, dps=dps, dmg_ratio=dmg_ratio)
         return
     
     ################################ DATA MECHAS ################################
@@ -136,11 +137,7 @@ class FRAENIR(Boss):
         return self.get_mech_value(i_player, "Frozen")
     
     def get_sak_dmg(self, i_player: int):
-        totalDamageDist = self.log.pjcontent["players"][i_player]["totalDamageDist"][0]
-        for dmgSource in totalDamageDist:
-            if dmgSource["id"] == 60448:
-                return dmgSource["totalDamage"]
-        return 0
+        return self.damage_dealt.get_damage(60448)[i_player].item()
     
     def get_sak_count(self, i_player: int):
         rota = self.get_player_rotation(i_player)
@@ -184,18 +181,14 @@ class WOJ(Boss):
         ratio                       = max_dmg / tot_dmg * 100
         self.add_mvps(i_players) 
         if max_dmg > 10000:
-            return LANGUES["selected_language"]["WOJ MVP CHAINS"].format(mvp_name=mvp_name, max_dmg=max_dmg, ratio=ratio)
+            return Finding("WOJ MVP CHAINS", mvp_name=mvp_name, max_dmg=max_dmg, ratio=ratio)
         return
     
     ################################ DATA MECHAS ################################
     
     def get_chain_damage(self, i_player: int):
         chain_id = 59159
-        dmgTaken = self.log.pjcontent['players'][i_player]["totalDamageTaken"][0]
-        for dmg in dmgTaken:
-            if dmg["id"] == chain_id:
-                return dmg["totalDamage"]
-        return 0
+        return self.damage_taken.get_damage(chain_id)[i_player].item()
         
 ################################ BONESKINNER ################################
 
@@ -237,7 +230,7 @@ class BONESKINNER(Boss):
         self.add_lvps(i_players)
         if sak_count:
             sak_ratio = sak_dmg/max_dmg*100
-            return LANGUES["selected_language"]["FRAENIR LVP SAK"].format(lvp_dps_name=lvp_dps_name, sak_count=sak_count, sak_ratio=sak_ratio, dps=dps, dmg_ratio=dmg_ratio)
+            return Finding("FRAENIR LVP SAK", lvp_dps_name=lvp_dps_name, sak_count=sak_count, sak_ratio=sak_ratio, dps=dps, dmg_ratio=dmg_ratio)
         return
     
     ################################ DATA MECHAS ################################
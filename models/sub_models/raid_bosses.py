@@ -1,5 +1,8 @@
 from models.boss_class import Boss, Stats
 from models.log_class import Log
+from models.finding_class import Finding
+from models.zone_class import Zone
+from const import BIG
 from func import *
 import numpy as np
 
@@ -82,9 +85,9 @@ class VG(Boss):
             self.add_mvps(i_players)
             nb_players = len(i_players)
             if nb_players == 1:
-                return LANGUES["selected_language"]["VG MVP BLEU S"].format(mvp_names=mvp_names, max_bleu=max_bleu)
+                return Finding("VG MVP BLEU S", mvp_names=mvp_names, max_bleu=max_bleu)
             if nb_players > 1:
-                return LANGUES["selected_language"]["VG MVP BLEU P"].format(mvp_names=mvp_names, nb_players=nb_players, max_bleu=max_bleu)
+                return Finding("VG MVP BLEU P", mvp_names=mvp_names, nb_players=nb_players, max_bleu=max_bleu)
         return
     
     ################################ LVP ################################
@@ -95,14 +98,14 @@ class VG(Boss):
         self.add_lvps(i_players)
         if i_players:
             lvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["LVP VG RED"].format(lvp_names=lvp_names)
+            return Finding("LVP VG RED", lvp_names=lvp_names)
         return
 
     ################################ CONDITIONS ###############################
     
-    # Checks if player attuned to red twice
+    # Checks if player attuned to red more than most squads (and at least twice)
     def got_vg_red(self, i_player: int):
-        return self.get_mech_value(i_player, "Red Attuned") > 1
+        return i_player in self.get_vg_red()
     
     ################################ DATA MECHAS ################################
     
@@ -114,11 +117,7 @@ class VG(Boss):
         
     # Collects all players who went to red
     def get_vg_red(self):
-        condigamer = []
-        for i in self.player_list:
-            if self.got_vg_red(i):
-                condigamer.append(i)
-        return condigamer
+        return self.get_mech_outliers("Red Attuned", 0.9, 1)
 
 ################################ GORS ################################
 
@@ -201,7 +200,7 @@ class GORS(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             dmg_ratio = min_dmg / total_dmg * 100
-            return LANGUES["selected_language"]["GORS MVP SPLIT"].format(mvp_names=mvp_names, min_dmg=min_dmg, dmg_ratio=dmg_ratio)
+            return Finding("GORS MVP SPLIT", mvp_names=mvp_names, min_dmg=min_dmg, dmg_ratio=dmg_ratio)
     
     # Old code, flames egged people
     def mvp_egg(self):
@@ -210,9 +209,9 @@ class GORS(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["GORS MVP EGG S"].format(mvp_names=mvp_names)
+                return Finding("GORS MVP EGG S", mvp_names=mvp_names)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["GORS MVP EGG P"].format(mvp_names=mvp_names)
+                return Finding("GORS MVP EGG P", mvp_names=mvp_names)
         return 
         
     # Flame the supports for not block/stabing gorse  slam
@@ -267,7 +266,7 @@ class GORS(Boss):
             mvp_names = self.players_to_string(supports)
             self.add_lvps(i_players)
             cucks = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP GORS SLAM"].format(mvp_names=mvp_names, cucked_players=cucks)
+            return Finding("MVP GORS SLAM", mvp_names=mvp_names, cucked_players=cucks)
         return
     
     ################################ LVP ################################
@@ -278,7 +277,7 @@ class GORS(Boss):
         lvp_names                     = self.players_to_string(i_players)
         dmg_ratio                     = max_dmg / total_dmg * 100
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["GORS LVP SPLIT"].format(lvp_names=lvp_names, max_dmg=max_dmg, dmg_ratio=dmg_ratio)
+        return Finding("GORS LVP SPLIT", lvp_names=lvp_names, max_dmg=max_dmg, dmg_ratio=dmg_ratio)
 
     ################################ CONDITIONS ###############################
     
@@ -336,6 +335,12 @@ class SABETHA(Boss):
     pos_canon4          = [713.9,403.1] 
     canon_detect_radius = 45
     scaler              = 9.34179 
+    zones               = [
+                           Zone("canon1", pos_canon1, canon_detect_radius),
+                           Zone("canon2", pos_canon2, canon_detect_radius),
+                           Zone("canon3", pos_canon3, canon_detect_radius),
+                           Zone("canon4", pos_canon4, canon_detect_radius)
+                          ]
     
     def __init__(self, log: Log):
         super().__init__(log)
@@ -416,7 +421,7 @@ class SABETHA(Boss):
             self.add_mvps(i_players) 
             dmg_ratio = min_dmg / total_dmg * 100
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["SABETHA MVP SPLIT"].format(mvp_names=mvp_names, dmg_ratio=dmg_ratio)
+            return Finding("SABETHA MVP SPLIT", mvp_names=mvp_names, dmg_ratio=dmg_ratio)
         return
     
     # Old code, flames if bombed squad
@@ -425,7 +430,7 @@ class SABETHA(Boss):
         self.add_mvps(i_players)
         if i_players:
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["SABETHA MVP BOMB"].format(mvp_names=mvp_names)
+            return Finding("SABETHA MVP BOMB", mvp_names=mvp_names)
         return
         
     # Flame players who got hit by flamewall (if they weren't downed I guess)
@@ -434,7 +439,7 @@ class SABETHA(Boss):
         self.add_mvps(i_players)
         if i_players:
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP SABETHA FLAMEWALL"].format(mvp_names=mvp_names)
+            return Finding("MVP SABETHA FLAMEWALL", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -445,7 +450,7 @@ class SABETHA(Boss):
         lvp_names                     = self.players_to_string(i_players)
         dmg_ratio                     = max_dmg / total_dmg * 100
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["SABETHA LVP SPLIT"].format(lvp_names=lvp_names, dmg_ratio=dmg_ratio)
+        return Finding("SABETHA LVP SPLIT", lvp_names=lvp_names, dmg_ratio=dmg_ratio)
         
     # Praises if person did cannons
     def lvp_sab_cannon(self):
@@ -453,53 +458,36 @@ class SABETHA(Boss):
         self.add_lvps(i_players)
         if i_players:
             lvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["LVP SABETHA CANNON"].format(lvp_names=lvp_names)
+            return Finding("LVP SABETHA CANNON", lvp_names=lvp_names)
         return
 
     ################################ CONDITIONS ###############################
     
     # Old code, checks if person did cannon
     def is_cannon(self, i_player: int, n: int=0):
-        pos_player = self.get_player_pos(i_player)
         match n:
             case 0: 
-                canon_pos = [SABETHA.pos_canon1, SABETHA.pos_canon2, SABETHA.pos_canon3, SABETHA.pos_canon4]
-            case 1:
-                canon_pos = [SABETHA.pos_canon1]
-            case 2:
-                canon_pos = [SABETHA.pos_canon2]
-            case 3:
-                canon_pos = [SABETHA.pos_canon3]
-            case 4:
-                canon_pos = [SABETHA.pos_canon4]
+                canons = ["canon1", "canon2", "canon3", "canon4"]
+            case 1 | 2 | 3 | 4:
+                canons = [f"canon{n}"]
             case _:
-                canon_pos = []
-        for pos in pos_player:
-            for canon in canon_pos:
-                if get_dist(pos, canon) <= SABETHA.canon_detect_radius:
-                    return True
-        return False
+                canons = []
+        return any(self.occupancy.was_inside(canon, i_player) for canon in canons)
     
     # Old code, checks if person bombed squad
     def is_terrorist(self, i_player: int):
         bomb_history = self.get_player_mech_history(i_player, ["Timed Bomb"])
         if bomb_history:
-            poses   = self.get_player_pos(i_player)
-            players = self.player_list
+            positions = self.occupancy.positions
+            others    = [i for i in self.player_list if i != i_player and not self.is_dead(i)]
             for bomb in bomb_history:
                 bomb_time  = bomb['time'] + 3000
                 time_index = time_to_index(bomb_time, self.time_base)
-                try:
-                    bomb_pos = poses[time_index]
-                except:
+                if time_index >= self.occupancy.n_samples[i_player]:
                     continue
-                bombed_players = 0
-                for i in players:
-                    if i == i_player or self.is_dead(i):
-                        continue
-                    i_pos = self.get_player_pos(i)[time_index]
-                    if get_dist(bomb_pos, i_pos)*SABETHA.scaler <= 270:
-                        bombed_players += 1
+                bomb_pos       = positions[i_player, time_index]
+                dists          = np.hypot(*(positions[others, time_index] - bomb_pos).T)
+                bombed_players = np.count_nonzero(dists*SABETHA.scaler <= 270)
                 if bombed_players > 1:
                     return True
         return False
@@ -631,11 +619,11 @@ class SLOTH(Boss):
             mvp_names = self.players_to_string(i_players)
             if min_cc == 0:
                 if len(i_players) > 1:
-                    return LANGUES["selected_language"]["SLOTH MVP 0 CC P"].format(mvp_names=mvp_names)
-                return LANGUES["selected_language"]["SLOTH MVP 0 CC S"].format(mvp_names=mvp_names)
+                    return Finding("SLOTH MVP 0 CC P", mvp_names=mvp_names)
+                return Finding("SLOTH MVP 0 CC S", mvp_names=mvp_names)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["SLOTH MVP CC P"].format(mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
-            return LANGUES["selected_language"]["SLOTH MVP CC S"].format(mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
+                return Finding("SLOTH MVP CC P", mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
+            return Finding("SLOTH MVP CC S", mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
     
     # Old code, flames if you afk in tantrum
     def mvp_tantrum(self):
@@ -644,8 +632,8 @@ class SLOTH(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["SLOTH MVP TANTRUM P"].format(mvp_names=mvp_names, max_tantrum=max_tantrum)
-            return LANGUES["selected_language"]["SLOTH MVP TANTRUM S"].format(mvp_names=mvp_names, max_tantrum=max_tantrum)
+                return Finding("SLOTH MVP TANTRUM P", mvp_names=mvp_names, max_tantrum=max_tantrum)
+            return Finding("SLOTH MVP TANTRUM S", mvp_names=mvp_names, max_tantrum=max_tantrum)
     
     ################################ LVP ################################
     
@@ -655,7 +643,7 @@ class SLOTH(Boss):
         lvp_names = self.players_to_string(i_players)
         self.add_lvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["LVP SLOTH SHROOM"].format(lvp_names=lvp_names) 
+            return Finding("LVP SLOTH SHROOM", lvp_names=lvp_names) 
         return 
         
     # Praises Kev sacrifice
@@ -668,7 +656,7 @@ class SLOTH(Boss):
                     kev.append(i)
                     lvp_names = self.players_to_string(kev)
                     self.add_lvps(kev)
-            return LANGUES["selected_language"]["LVP SLOTH KEV"].format(lvp_names=lvp_names) 
+            return Finding("LVP SLOTH KEV", lvp_names=lvp_names) 
             
         # Case for if Kev ate shroom and survived
         if self.is_Kev_shroom_alive():
@@ -678,7 +666,7 @@ class SLOTH(Boss):
                     kev.append(i)
                     lvp_names = self.players_to_string(kev)
                     self.add_lvps(kev)
-            return LANGUES["selected_language"]["LVP SLOTH KEV ALIVE"].format(lvp_names=lvp_names) 
+            return Finding("LVP SLOTH KEV ALIVE", lvp_names=lvp_names) 
             
         return 
 
@@ -828,9 +816,9 @@ class MATTHIAS(Boss):
         mvp_names                   = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if min_cc == 0:
-            return LANGUES["selected_language"]["MATTHIAS MVP 0 CC"].format(mvp_names=mvp_names)
+            return Finding("MATTHIAS MVP 0 CC", mvp_names=mvp_names)
         else:
-            return LANGUES["selected_language"]["MATTHIAS MVP CC"].format(mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
+            return Finding("MATTHIAS MVP CC", mvp_names=mvp_names, min_cc=min_cc, cc_ratio=cc_ratio)
             
     # Flames players who trigger too many red orbs
     def mvp_matthias_tornado(self):
@@ -838,7 +826,7 @@ class MATTHIAS(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP MATTHIAS TORNADO"].format(mvp_names=mvp_names) 
+            return Finding("MVP MATTHIAS TORNADO", mvp_names=mvp_names) 
         return 
         
     # Flames players who trigger too many red orbs
@@ -847,7 +835,7 @@ class MATTHIAS(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP MATTHIAS SPIRIT"].format(mvp_names=mvp_names) 
+            return Finding("MVP MATTHIAS SPIRIT", mvp_names=mvp_names) 
         return 
         
     ################################ LVP ################################
@@ -858,7 +846,7 @@ class MATTHIAS(Boss):
         cc_ratio                    = max_cc / total_cc * 100
         lvp_names                   = self.players_to_string(i_players)
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["MATTHIAS LVP CC"].format(lvp_names=lvp_names, max_cc=max_cc, cc_ratio=cc_ratio)
+        return Finding("MATTHIAS LVP CC", lvp_names=lvp_names, max_cc=max_cc, cc_ratio=cc_ratio)
         
     # Praises people as pity who got sacrificed several times
     def lvp_matthias_sacrifice(self):
@@ -866,7 +854,7 @@ class MATTHIAS(Boss):
         lvp_names = self.players_to_string(i_players)
         self.add_lvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["LVP MATTHIAS SACRIFICE"].format(lvp_names=lvp_names) 
+            return Finding("LVP MATTHIAS SACRIFICE", lvp_names=lvp_names) 
         return 
     
     ################################ CONDITIONS ###############################
@@ -877,11 +865,11 @@ class MATTHIAS(Boss):
         
     # Old code, checks if got tornadoed
     def got_matthias_tornado(self, i_player: int):
-        return self.get_mech_value(i_player, "Tornado") > 2
+        return i_player in self.get_matthias_tornado()
         
     # Old code, checks if got went into spirit
     def got_matthias_spirit(self, i_player: int):
-        return self.get_mech_value(i_player, "Spirit hit") > 1
+        return i_player in self.get_matthias_spirit()
     
     ################################ DATA MECHAS ################################    
     
@@ -889,21 +877,13 @@ class MATTHIAS(Boss):
     def get_nb_sac(self, i_player: int):
         return self.get_mech_value(i_player, "Sacrifice")
     
-    # Collects all players that got into tornado
+    # Collects all players that got into tornado more than most squads (and more than 2)
     def get_matthias_tornado(self):
-        tornado = []
-        for i in self.player_list:
-            if self.got_matthias_tornado(i):
-                tornado.append(i)
-        return tornado
+        return self.get_mech_outliers("Tornado", 0.9, 2)
         
-    # Collects all players that got into Spirit
+    # Collects all players that got into Spirit more than most squads (and more than once)
     def get_matthias_spirit(self):
-        spirit = []
-        for i in self.player_list:
-            if self.got_matthias_spirit(i):
-                spirit.append(i)
-        return spirit
+        return self.get_mech_outliers("Spirit hit", 0.9, 1)
         
     # Collects all players that got sac'ed many times
     def get_matthias_sacrifice(self):
@@ -930,6 +910,13 @@ class ESCORT(Boss):
                [80.3,255.5]
               ]
     tower_radius = 19
+    zones        = [
+                    Zone("tower1", towers[0], tower_radius),
+                    Zone("tower2", towers[1], tower_radius),
+                    Zone("tower3", towers[2], tower_radius),
+                    Zone("tower4", towers[3], tower_radius),
+                    Zone("tower5", towers[4], tower_radius)
+                   ]
     
     def __init__(self, log: Log):
         super().__init__(log)
@@ -974,9 +961,9 @@ class ESCORT(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["ESCORT MVP MINE S"].format(mvp_names=mvp_names)
+                return Finding("ESCORT MVP MINE S", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["ESCORT MVP MINE P"].format(mvp_names=mvp_names)
+                return Finding("ESCORT MVP MINE P", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -985,7 +972,7 @@ class ESCORT(Boss):
         i_players, max_call, _ = Stats.get_max_value(self, self.get_glenna_call)
         lvp_names              = self.players_to_string(i_players)
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["ESCORT LVP GLENNA"].format(lvp_names=lvp_names, max_call=max_call)
+        return Finding("ESCORT LVP GLENNA", lvp_names=lvp_names, max_call=max_call)
     
     def lvp_tower(self):
         towers    = self.get_towers()
@@ -996,8 +983,8 @@ class ESCORT(Boss):
                     return
         self.add_lvps(towers)
         if len(towers) == 1:
-            return LANGUES["selected_language"]["ESCORT LVP TOWER S"].format(lvp_names=lvp_names)
-        return LANGUES["selected_language"]["ESCORT LVP TOWER P"].format(lvp_names=lvp_names)
+            return Finding("ESCORT LVP TOWER S", lvp_names=lvp_names)
+        return Finding("ESCORT LVP TOWER P", lvp_names=lvp_names)
     
     ################################ CONDITIONS ################################
     
@@ -1005,12 +992,7 @@ class ESCORT(Boss):
         return self.get_mech_value(i_player, "Mine Detonation Hit") > 0
     
     def is_tower_n(self, i_player: int, n: int):
-        poses = self.get_player_pos(i_player)
-        tower = ESCORT.towers[n-1]
-        for pos in poses:
-            if get_dist(pos, tower) < ESCORT.tower_radius:
-                return True
-        return False
+        return self.occupancy.was_inside(f"tower{n}", i_player)
     
     def is_tower(self, i_player: int):
         for n in range(1,6):
@@ -1118,11 +1100,11 @@ class KC(Boss):
         if min_orb < 6:
             self.add_mvps(i_players)
             if min_orb < 0:
-                return LANGUES["selected_language"]["KC MVP BAD ORBS"].format(mvp_names=mvp_names, min_orb=-min_orb)
+                return Finding("KC MVP BAD ORBS", mvp_names=mvp_names, min_orb=-min_orb)
             if min_orb == 0:
-                return LANGUES["selected_language"]["KC MVP 0 ORB"].format(mvp_names=mvp_names)
+                return Finding("KC MVP 0 ORB", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["KC MVP ORB"].format(mvp_names=mvp_names, min_orb=min_orb)
+                return Finding("KC MVP ORB", mvp_names=mvp_names, min_orb=min_orb)
                 
     # Flame people who take (1.2 * squad average) pizza hits
     def mvp_kc_pizza(self, extra_exclude: list[classmethod]=[]):
@@ -1138,7 +1120,7 @@ class KC(Boss):
         if i_players:
             self.add_mvps(i_players)  
             mvp_names  = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP KC PIZZA"].format(mvp_names=mvp_names)
+            return Finding("MVP KC PIZZA", mvp_names=mvp_names)
         return
 
             
@@ -1149,7 +1131,7 @@ class KC(Boss):
         i_players, max_orb, _ = Stats.get_max_value(self, self.get_good_orb)
         lvp_names             = self.players_to_string(i_players)
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["KC LVP ORB"].format(lvp_names=lvp_names, max_orb=max_orb)
+        return Finding("KC LVP ORB", lvp_names=lvp_names, max_orb=max_orb)
     
     ################################ CONDITIONS ################################
     
@@ -1186,6 +1168,7 @@ class XERA(Boss):
     centre        = [366.4,323.4]
     debut_radius  = 85
     centre_radius = 140
+    zones         = [Zone("centre", centre, centre_radius)]
 
     def __init__(self, log: Log):
         super().__init__(log)
@@ -1272,9 +1255,9 @@ class XERA(Boss):
         fdp_names = self.players_to_string(i_fdp)
         self.add_mvps(i_fdp)
         if len(i_fdp) == 1:
-            return LANGUES["selected_language"]["XERA MVP SKIP S"].format(fdp_names=fdp_names)
+            return Finding("XERA MVP SKIP S", fdp_names=fdp_names)
         if len(i_fdp) > 1:
-            return LANGUES["selected_language"]["XERA MVP SKIP P"].format(fdp_names=fdp_names)
+            return Finding("XERA MVP SKIP P", fdp_names=fdp_names)
         return
     
     # Old code, flames people who fail to glide
@@ -1283,9 +1266,9 @@ class XERA(Boss):
         glide_names = self.players_to_string(i_glide)
         self.add_mvps(i_glide)
         if len(i_glide) == 1:
-            return LANGUES["selected_language"]["XERA MVP GLIDE S"].format(glide_names=glide_names)
+            return Finding("XERA MVP GLIDE S", glide_names=glide_names)
         if len(i_glide) > 1:
-            return LANGUES["selected_language"]["XERA MVP GLIDE P"].format(glide_names=glide_names)
+            return Finding("XERA MVP GLIDE P", glide_names=glide_names)
         return
         
     # Flames players who trigger too many red orbs
@@ -1294,7 +1277,7 @@ class XERA(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP XERA RED ORB"].format(mvp_names=mvp_names) 
+            return Finding("MVP XERA RED ORB", mvp_names=mvp_names) 
         return 
         
     # Flames players who are too impatient in split phase
@@ -1303,7 +1286,7 @@ class XERA(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP XERA RIBBON"].format(mvp_names=mvp_names) 
+            return Finding("MVP XERA RIBBON", mvp_names=mvp_names) 
         return 
     
     ################################ LVP ################################
@@ -1314,7 +1297,7 @@ class XERA(Boss):
         lvp_names                 = self.players_to_string(i_players)
         self.add_lvps(i_players)
         if max_minijeu == 2:
-            return LANGUES["selected_language"]["XERA LVP MINI-JEU"].format(lvp_names=lvp_names)
+            return Finding("XERA LVP MINI-JEU", lvp_names=lvp_names)
         return
         
     # Praises the people who do buttons a lot
@@ -1323,7 +1306,7 @@ class XERA(Boss):
         lvp_names = self.players_to_string(i_players)
         self.add_lvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["LVP XERA BUTTONS"].format(lvp_names=lvp_names) 
+            return Finding("LVP XERA BUTTONS", lvp_names=lvp_names) 
         return 
     
     ################################ CONDITIONS ################################
@@ -1332,9 +1315,9 @@ class XERA(Boss):
     def is_fdp(self, i_player: int):
         return i_player in self.get_fdp()
         
-    # Returns if player triggered red orb multiple times
+    # Returns if player triggered red orb more than most squads (and multiple times)
     def got_xera_red_orb(self, i_player: int):
-        return self.get_mech_value(i_player, 'Red Orb') > 1
+        return i_player in self.get_xera_red_orb()
         
     # Returns if player did buttons in main phase
     def got_xera_buttons(self, i_player: int):
@@ -1345,12 +1328,8 @@ class XERA(Boss):
         
     # Returns if player got hit by ribbon several times
     def got_xera_ribbon(self, i_player: int):
-        for j in range(len(self.log.pjcontent['players'][i_player]['totalDamageTaken'])):
-            for k in range(len(self.log.pjcontent['players'][i_player]['totalDamageTaken'][j])):
-                if self.log.pjcontent['players'][i_player]['totalDamageTaken'][j][k]['id'] == 34883:
-                    if self.log.pjcontent['players'][i_player]['totalDamageTaken'][j][k]['totalDamage'] > 17000:
-                        return True
-        return False
+        ribbon_dmg = self.damage_taken.get_damage(34883, phase=None)[i_player]
+        return bool((ribbon_dmg > 17000).any())
     
     ################################ DATA MECHAS ################################
     
@@ -1364,27 +1343,17 @@ class XERA(Boss):
     
     # Old code, Collects players who skipped minigame
     def get_fdp(self): # fdp = skip mini jeu XERA
-        mecha_data = self.log.pjcontent['mechanics']
-        tp_data    = None
-        for e in mecha_data:
-            if e['name'] == "TP Out":
-                tp_data = e['mechanicsData']
-                break
+        tp_data = self.events.select("TP Out")
         fdp     = []
         delta   = 6000
         i_delta = time_to_index(delta, self.time_base)
-        for e in tp_data:
-            tp_time     = e['time']
-            
-            player_name = e['actor']
-            i_player    = self.get_player_id(player_name)
-            tp_time    += 2000  # 1s de delais pour etre sur
-            i_time      = time_to_index(tp_time, self.time_base)
-            pos_player  = self.get_player_pos(i_player, i_time, i_time + i_delta)
-            for p in pos_player:
-                if get_dist(p, XERA.centre) <= XERA.centre_radius:
-                    fdp.append(i_player)
-                    break
+        for tp_time, i_player in zip(self.events.time[tp_data].tolist(), self.events.actor[tp_data].tolist()):
+            if i_player < 0:
+                continue
+            tp_time += 2000  # 1s de delais pour etre sur
+            i_time   = time_to_index(tp_time, self.time_base)
+            if self.occupancy.was_inside("centre", i_player, i_time, i_time + i_delta):
+                fdp.append(i_player)
         return fdp
     
     # Old code, collects players who died during gliding
@@ -1399,11 +1368,7 @@ class XERA(Boss):
 
     # Collect all players who trigger red orb a lot
     def get_xera_red_orb(self):
-        afk = []
-        for i in self.player_list:
-            if self.got_xera_red_orb(i):
-                afk.append(i)
-        return afk
+        return self.get_mech_outliers('Red Orb', 0.9, 1)
         
     # Collect all players who do buttons
     def get_xera_buttons(self):
@@ -1498,9 +1463,9 @@ class CAIRN(Boss):
         if max_tp > 2:
             self.add_mvps(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["CAIRN MVP TP S"].format(mvp_names=mvp_names, max_tp=max_tp)
+                return Finding("CAIRN MVP TP S", mvp_names=mvp_names, max_tp=max_tp)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["CAIRN MVP TP P"].format(mvp_names=mvp_names, max_tp=max_tp)
+                return Finding("CAIRN MVP TP P", mvp_names=mvp_names, max_tp=max_tp)
         return
     
     ################################ LVP ################################
@@ -1511,14 +1476,14 @@ class CAIRN(Boss):
         lvp_names = self.players_to_string(i_players)
         self.add_lvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["LVP CAIRN COVID"].format(lvp_names=lvp_names) 
+            return Finding("LVP CAIRN COVID", lvp_names=lvp_names) 
         return 
     
     ################################ CONDITIONS ################################
     
-    # Returns if player got covid multiple times
+    # Returns if player got covid more than most squads (and multiple times)
     def got_cairn_covid(self, i_player: int):
-        return self.get_mech_value(i_player, 'Shared Agony') > 1
+        return i_player in self.get_cairn_covid()
     
     ################################ DATA MECHAS ################################
 
@@ -1528,11 +1493,7 @@ class CAIRN(Boss):
         
     # Collect all players who got covid multiple times
     def get_cairn_covid(self):
-        covid = []
-        for i in self.player_list:
-            if self.got_cairn_covid(i):
-                covid.append(i)
-        return covid
+        return self.get_mech_outliers('Shared Agony', 0.9, 1)
 
 ################################ MO ################################
 
@@ -1610,9 +1571,9 @@ class MO(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if len(i_players) == 1:
-            return LANGUES["selected_language"]["MO MVP PICS S"].format(mvp_names=mvp_names) 
+            return Finding("MO MVP PICS S", mvp_names=mvp_names) 
         if len(i_players) > 1:
-            return LANGUES["selected_language"]["MO MVP PICS P"].format(mvp_names=mvp_names)
+            return Finding("MO MVP PICS P", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -1636,7 +1597,7 @@ class MO(Boss):
         if len(i_players) > 0:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)   
-            return LANGUES["selected_language"]["LVP MO CLEAVE"].format(lvp_names=lvp_names)
+            return Finding("LVP MO CLEAVE", lvp_names=lvp_names)
         return
     
     ################################ CONDITIONS ################################
@@ -1752,9 +1713,9 @@ class SAMAROG(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if len(i_players) == 1:
-            return LANGUES["selected_language"]["SAMAROG MVP IMPALED S"].format(mvp_names=mvp_names) 
+            return Finding("SAMAROG MVP IMPALED S", mvp_names=mvp_names) 
         if len(i_players) > 1:
-            return LANGUES["selected_language"]["SAMAROG MVP IMPALED P"].format(mvp_names=mvp_names)
+            return Finding("SAMAROG MVP IMPALED P", mvp_names=mvp_names)
         return 
     
     # Old code, flames players who don't do friendship mechanic
@@ -1764,9 +1725,9 @@ class SAMAROG(Boss):
         vict_names      = self.players_to_string(i_vict)
         self.add_mvps(i_trait)
         if len(i_trait) == 1:
-            return LANGUES["selected_language"]["SAMAROG MVP BISOU S"].format(trait_names=trait_names, vict_names=vict_names)
+            return Finding("SAMAROG MVP BISOU S", trait_names=trait_names, vict_names=vict_names)
         if len(i_trait) > 1:
-            return LANGUES["selected_language"]["SAMAROG MVP BISOU P"].format(trait_names=trait_names, vict_names=vict_names)
+            return Finding("SAMAROG MVP BISOU P", trait_names=trait_names, vict_names=vict_names)
         return  
         
     # Flames players who step outside the arena too much
@@ -1775,7 +1736,7 @@ class SAMAROG(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP SAMAROG OUTSIDE"].format(mvp_names=mvp_names) 
+            return Finding("MVP SAMAROG OUTSIDE", mvp_names=mvp_names) 
         return 
         
     # Flame the supports for not block/stabing guldhem
@@ -1830,7 +1791,7 @@ class SAMAROG(Boss):
             mvp_names = self.players_to_string(supports)
             self.add_lvps(i_players)
             cucks = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP SAMAROG GULDHEM"].format(mvp_names=mvp_names, cucked_players=cucks)
+            return Finding("MVP SAMAROG GULDHEM", mvp_names=mvp_names, cucked_players=cucks)
         return
     
     ################################ LVP ################################ 
@@ -1841,7 +1802,7 @@ class SAMAROG(Boss):
         lvp_names = self.players_to_string(i_players)
         self.add_lvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["LVP SAMAROG TANK"].format(lvp_names=lvp_names) 
+            return Finding("LVP SAMAROG TANK", lvp_names=lvp_names) 
         return 
     
     ################################ CONDITIONS ################################
@@ -1862,17 +1823,17 @@ class SAMAROG(Boss):
     def is_fix(self, i_player: int):
         return self.get_mech_value(i_player, "Fixate: Samarog") >= 3
     
-    # Checks if person stood outside a lot
+    # Checks if person stood outside more than most squads (and more than once)
     def got_samarog_outside(self, i_player: int):
-        return self.get_mech_value(i_player, "Spear Wall") > 1
+        return i_player in self.get_samarog_outside()
         
     # Checks if person got stunned by guldhem
     def got_samarog_stunned(self, i_player: int):
         return self.get_mech_value(i_player, "Guldhem's Stun") > 0
         
-    # Checks if person got more than 5 cc phases
+    # Checks if person got more cc phases than most squads (and more than 5)
     def got_samarog_tank(self, i_player: int):
-        return self.get_mech_value(i_player, "Brutalized") > 5
+        return i_player in self.get_samarog_tank()
     
     ################################ DATA MECHAS ################################
     
@@ -1887,33 +1848,30 @@ class SAMAROG(Boss):
     # Old code, collects all players who didn't do friendship mechanic
     def get_traitors(self):
         traitors, victims = [], []
-        big_greens        = self.get_mechanic_history("Big Green")
-        small_greens      = self.get_mechanic_history("Small Green")
-        failed_greens     = self.get_mechanic_history("Failed Green")
-        last_fail_time    = None
-        if failed_greens:
-            for fail_green in failed_greens:
-                if fail_green['time'] == last_fail_time:
-                    continue
-                last_fail_time = fail_green['time']
-                fail_actor     = fail_green['actor']
-                fail_time      = fail_green['time']
-                for small, big in zip(small_greens, big_greens):
-                    small_actor = small['actor']
-                    big_actor   = big['actor']
-                    green_time  = small['time']
-                    if fail_actor in [big_actor, small_actor] and np.abs(fail_time - green_time) < 7000:
-                        victims.append(self.get_player_id(big_actor))
-                        traitors.append(self.get_player_id(small_actor))
+        events            = self.events
+        big_greens        = events.select("Big Green")
+        small_greens      = events.select("Small Green")
+        failed_greens     = events.select("Failed Green")
+        # Small and big greens are paired in order
+        n_greens          = min(len(small_greens), len(big_greens))
+        small_greens      = small_greens[:n_greens]
+        big_greens        = big_greens[:n_greens]
+        # Only keep the first failed green of each wave
+        fail_times        = events.time[failed_greens]
+        failed_greens     = failed_greens[np.r_[True, fail_times[1:] != fail_times[:-1]]] if len(failed_greens) else failed_greens
+        i_fails, i_greens = events.join(failed_greens, small_greens, 7000, 7000)
+        for i_fail, i_green in zip(i_fails, i_greens):
+            fail_actor  = events.actor[failed_greens[i_fail]]
+            small_actor = events.actor[small_greens[i_green]]
+            big_actor   = events.actor[big_greens[i_green]]
+            if fail_actor >= 0 and fail_actor in [big_actor, small_actor]:
+                victims.append(int(big_actor) if big_actor >= 0 else None)
+                traitors.append(int(small_actor) if small_actor >= 0 else None)
         return traitors, victims 
     
     # Collect players who stepped outside the arena
     def get_samarog_outside(self):
-        wanderer = []
-        for i in self.player_list:
-            if self.got_samarog_outside(i):
-                  wanderer.append(i)
-        return wanderer
+        return self.get_mech_outliers("Spear Wall", 0.9, 1)
         
     # Collect players who got stunned by Guldhem
     def get_samarog_stunned(self):
@@ -1923,13 +1881,9 @@ class SAMAROG(Boss):
                   rotation_ruined.append(i)
         return rotation_ruined
         
-    # Collects players with more than 5 cc phases
+    # Collects players with more cc phases than most squads (and more than 5)
     def get_samarog_tank(self):
-        tank = []
-        for i in self.player_list:
-            if self.got_samarog_tank(i):
-                  tank.append(i)
-        return tank
+        return self.get_mech_outliers("Brutalized", 0.9, 5)
 
 ################################ DEIMOS ################################
 
@@ -2011,9 +1965,9 @@ class DEIMOS(Boss):
         nb_players              = len(i_players)
         self.add_mvps(i_players)
         if nb_players == 1:
-            return LANGUES["selected_language"]["DEIMOS MVP BLACK S"].format(mvp_names=mvp_names, max_black=max_black)
+            return Finding("DEIMOS MVP BLACK S", mvp_names=mvp_names, max_black=max_black)
         if nb_players > 1:
-            return LANGUES["selected_language"]["DEIMOS MVP BLACK P"].format(mvp_names=mvp_names, nb_players=nb_players, max_black=max_black)
+            return Finding("DEIMOS MVP BLACK P", mvp_names=mvp_names, nb_players=nb_players, max_black=max_black)
         return
     
     # Old code, flames players who got pizza'd out of arena
@@ -2022,7 +1976,7 @@ class DEIMOS(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["DEIMOS MVP PIZZA"].format(mvp_names=mvp_names)
+            return Finding("DEIMOS MVP PIZZA", mvp_names=mvp_names)
         return
     
     # Flames people who don't take greens
@@ -2031,7 +1985,7 @@ class DEIMOS(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP DEIMOS GREEDER"].format(mvp_names=mvp_names)
+            return Finding("MVP DEIMOS GREEDER", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################ 
@@ -2042,7 +1996,7 @@ class DEIMOS(Boss):
         lvp_names               = self.players_to_string(i_players)
         if i_players and max_tears > 2:
             self.add_lvps(i_players)
-            return LANGUES["selected_language"]["DEIMOS LVP TEARS"].format(lvp_names=lvp_names, max_tears=max_tears)
+            return Finding("DEIMOS LVP TEARS", lvp_names=lvp_names, max_tears=max_tears)
         return
     
     # Praises for kiting
@@ -2050,7 +2004,7 @@ class DEIMOS(Boss):
         i_players = self.is_kiter()
         lvp_names = self.players_to_string([i_players])
         self.add_lvps([i_players])
-        return LANGUES["selected_language"]["DEIMOS LVP KITER"].format(lvp_names=lvp_names)
+        return Finding("DEIMOS LVP KITER", lvp_names=lvp_names)
     
     ################################ CONDITIONS ################################
     
@@ -2086,19 +2040,11 @@ class DEIMOS(Boss):
         
     # Returns kiter
     def is_kiter(self):
-        kiter = -1
-        max_soulfeast = 0
         # For every player, check how many times they get hit by Soul Feast, keep the player with the highest number
-        for i in self.player_list:
-            counter = 0
-            for j in range(len(self.log.pjcontent['players'][i]['totalDamageTaken'])):
-                for k in range(len(self.log.pjcontent['players'][i]['totalDamageTaken'][j])):
-                    if self.log.pjcontent['players'][i]['totalDamageTaken'][j][k]['id'] == 37805:
-                        counter = counter + 1
-            if counter > max_soulfeast:
-                kiter = i
-                max_soulfeast = counter
-        return kiter
+        soulfeast = self.damage_taken.get_count(37805, phase=None).sum(axis=1)[self.player_list]
+        if not len(soulfeast) or soulfeast.max() == 0:
+            return -1
+        return self.player_list[int(np.argmax(soulfeast))]
 
     ################################ DATA MECHAS ################################
 
@@ -2141,6 +2087,12 @@ class SH(Boss):
     radius3      = 256.2
     radius4      = 208.5
     radius5      = 163
+    zones        = [
+                    Zone("ring2", center_arena, BIG, inner=radius2),
+                    Zone("ring3", center_arena, BIG, inner=radius3),
+                    Zone("ring4", center_arena, BIG, inner=radius4),
+                    Zone("ring5", center_arena, BIG, inner=radius5)
+                   ]
     
     def __init__(self, log: Log):
         super().__init__(log)
@@ -2220,7 +2172,7 @@ class SH(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["SH MVP WALL"].format(mvp_names=mvp_names)
+            return Finding("SH MVP WALL", mvp_names=mvp_names)
         return
     
     # Old code, flames if you fall off the platform
@@ -2229,7 +2181,7 @@ class SH(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["SH MVP FALL"].format(mvp_names=mvp_names)
+            return Finding("SH MVP FALL", mvp_names=mvp_names)
         return
         
     # Flames all people who keep getting hit by orange aoes
@@ -2238,7 +2190,7 @@ class SH(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP SH ORANGE"].format(mvp_names=mvp_names)
+            return Finding("MVP SH ORANGE", mvp_names=mvp_names)
         return
         
     # Flames all people who keep getting hit by orange aoes
@@ -2247,7 +2199,7 @@ class SH(Boss):
         mvp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if i_players:
-            return LANGUES["selected_language"]["MVP SH CORRUPT"].format(mvp_names=mvp_names)
+            return Finding("MVP SH CORRUPT", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -2265,12 +2217,11 @@ class SH(Boss):
     # Old code, checks if player fell off platform
     def has_fallen(self, i_player: int):
         if self.is_dead_instant(i_player):
-            last_pos         = self.get_player_pos(i_player)[-1]
             death_time       = self.get_player_death_timer(i_player)
-            fell_at_begin    = get_dist(SH.center_arena, last_pos) > SH.radius2
-            fell_to_radius23 = death_time > self.bosshp_to_time(90)+2500 and death_time < self.bosshp_to_time(66)+2500 and get_dist(SH.center_arena, last_pos) > SH.radius3
-            fell_to_radius34 = death_time > self.bosshp_to_time(66)+2500 and death_time < self.bosshp_to_time(33)+2500 and get_dist(SH.center_arena, last_pos) > SH.radius4
-            fell_to_radius45 = death_time > self.bosshp_to_time(33)+2500 and get_dist(SH.center_arena, last_pos) > SH.radius5
+            fell_at_begin    = self.occupancy.inside_at("ring2", i_player, -1)
+            fell_to_radius23 = death_time > self.bosshp_to_time(90)+2500 and death_time < self.bosshp_to_time(66)+2500 and self.occupancy.inside_at("ring3", i_player, -1)
+            fell_to_radius34 = death_time > self.bosshp_to_time(66)+2500 and death_time < self.bosshp_to_time(33)+2500 and self.occupancy.inside_at("ring4", i_player, -1)
+            fell_to_radius45 = death_time > self.bosshp_to_time(33)+2500 and self.occupancy.inside_at("ring5", i_player, -1)
             if fell_at_begin or fell_to_radius23 or fell_to_radius34 or (self.cm and fell_to_radius45):
                 return True
         return False
@@ -2411,9 +2362,9 @@ class DHUUM(Boss):
         mvp_names                = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if len(i_players) == 1:
-            return LANGUES["selected_language"]["DHUUM MVP CRACKS S"].format(mvp_names=mvp_names, max_cracks=max_cracks)
+            return Finding("DHUUM MVP CRACKS S", mvp_names=mvp_names, max_cracks=max_cracks)
         if len(i_players) > 1:
-            return LANGUES["selected_language"]["DHUUM MVP CRACKS P"].format(mvp_names=mvp_names, max_cracks=max_cracks)
+            return Finding("DHUUM MVP CRACKS P", mvp_names=mvp_names, max_cracks=max_cracks)
         return
 
     # Flame the people that go in the middle during suck without invuln
@@ -2423,7 +2374,7 @@ class DHUUM(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP DHUUM SUCC"].format(mvp_names=mvp_names)
+            return Finding("MVP DHUUM SUCC", mvp_names=mvp_names)
         return
         
     # Flame the people that AFK with shackle
@@ -2433,7 +2384,7 @@ class DHUUM(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP DHUUM SHACKLE"].format(mvp_names=mvp_names)
+            return Finding("MVP DHUUM SHACKLE", mvp_names=mvp_names)
         return
         
     ################################ LVP ################################
@@ -2445,7 +2396,7 @@ class DHUUM(Boss):
         if i_players:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["LVP DHUUM BOMB"].format(lvp_names=lvp_names)
+            return Finding("LVP DHUUM BOMB", lvp_names=lvp_names)
         return 
     
     ################################ CONDITIONS ################################
@@ -2614,7 +2565,7 @@ class CA(Boss):
             mvp_names = self.players_to_string(supports)
             self.add_lvps(i_players)
             cucks = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP CA ARMSLAM"].format(mvp_names=mvp_names, cucked_players=cucks)
+            return Finding("MVP CA ARMSLAM", mvp_names=mvp_names, cucked_players=cucks)
         return
     
     ################################ LVP ################################
@@ -2723,9 +2674,9 @@ class LARGOS(Boss):
         else:
             self.add_mvps(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["LARGOS MVP DASH S"].format(mvp_names=mvp_names, max_dash=max_dash)
+                return Finding("LARGOS MVP DASH S", mvp_names=mvp_names, max_dash=max_dash)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["LARGOS MVP DASH P"].format(mvp_names=mvp_names, max_dash=max_dash)
+                return Finding("LARGOS MVP DASH P", mvp_names=mvp_names, max_dash=max_dash)
         return
     
     # Old code, flames if bad dps, idk, some magic shit going on in there
@@ -2744,9 +2695,9 @@ class LARGOS(Boss):
             self.add_mvps(bad_dps)
             bad_dps_name = self.players_to_string(bad_dps)
             if len(bad_dps) == 1:
-                return LANGUES["selected_language"]["MVP BAD DPS S"].format(bad_dps_name=bad_dps_name, sup_name=sup_name)
+                return Finding("MVP BAD DPS S", bad_dps_name=bad_dps_name, sup_name=sup_name)
             else:
-                return LANGUES["selected_language"]["MVP BAD DPS P"].format(bad_dps_name=bad_dps_name, sup_name=sup_name)
+                return Finding("MVP BAD DPS P", bad_dps_name=bad_dps_name, sup_name=sup_name)
                 
     # Flame the people that AFK in tornado too much
     def mvp_largos_tornado(self):
@@ -2755,7 +2706,7 @@ class LARGOS(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP LARGOS TORNADO"].format(mvp_names=mvp_names)
+            return Finding("MVP LARGOS TORNADO", mvp_names=mvp_names)
         return
         
     # Flame the people that got bubbled
@@ -2766,9 +2717,9 @@ class LARGOS(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(mvp_names) == 1:
-                return LANGUES["selected_language"]["MVP LARGOS BUBBLE S"].format(mvp_names=mvp_names)
+                return Finding("MVP LARGOS BUBBLE S", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["MVP LARGOS BUBBLE P"].format(mvp_names=mvp_names)
+                return Finding("MVP LARGOS BUBBLE P", mvp_names=mvp_names)
         return
         
     # Flame the people that got hit by boonsteal attack
@@ -2778,7 +2729,7 @@ class LARGOS(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP LARGOS BOON"].format(mvp_names=mvp_names)
+            return Finding("MVP LARGOS BOON", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################ 
@@ -2846,6 +2797,10 @@ class Q1(Boss):
     
     center     = [411.5,431.1]
     fdp_radius = 70
+    zones      = [
+                  Zone("center P1", center, fdp_radius, phase="Qadim P1"),
+                  Zone("center P2", center, fdp_radius, phase="Qadim P2")
+                 ]
 
     def __init__(self, log: Log):
         super().__init__(log)
@@ -2922,9 +2877,9 @@ class Q1(Boss):
         fdp_names = self.players_to_string(i_players)
         self.add_mvps(i_players)
         if len(i_players) == 1:
-            return LANGUES["selected_language"]["QADIM MVP PYRE S"].format(fdp_names=fdp_names)
+            return Finding("QADIM MVP PYRE S", fdp_names=fdp_names)
         if len(i_players) > 1:
-            return LANGUES["selected_language"]["QADIM MVP PYRE P"].format(fdp_names=fdp_names)
+            return Finding("QADIM MVP PYRE P", fdp_names=fdp_names)
     
     # Flames people who got hit by the shockwave the most
     def mvp_wave(self):
@@ -2936,9 +2891,9 @@ class Q1(Boss):
         # Otherwise return the necessary flame
         self.add_mvps(i_players)
         if len(i_players) == 1:
-            return LANGUES["selected_language"]["QADIM MVP WAVE S"].format(mvp_names=mvp_names, max_waves=max_waves)
+            return Finding("QADIM MVP WAVE S", mvp_names=mvp_names, max_waves=max_waves)
         if len(i_players) > 1:
-            return LANGUES["selected_language"]["QADIM MVP WAVE P"].format(mvp_names=mvp_names, max_waves=max_waves)
+            return Finding("QADIM MVP WAVE P", mvp_names=mvp_names, max_waves=max_waves)
         return
         
     # Flame the people that got hit by fire AoEs from the sky
@@ -2948,7 +2903,7 @@ class Q1(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP QADIM FIRE AOE"].format(mvp_names=mvp_names)
+            return Finding("MVP QADIM FIRE AOE", mvp_names=mvp_names)
         return
         
     # Flame the people that AFK in the hitbox
@@ -2958,7 +2913,7 @@ class Q1(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP QADIM HITBOX"].format(mvp_names=mvp_names)
+            return Finding("MVP QADIM HITBOX", mvp_names=mvp_names)
         return
         
     # Flame the people that got ported at least twice
@@ -2968,7 +2923,7 @@ class Q1(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP QADIM PORT"].format(mvp_names=mvp_names)
+            return Finding("MVP QADIM PORT", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################ 
@@ -2982,7 +2937,7 @@ class Q1(Boss):
         if i_players:
             self.add_lvps(i_players)            
             lvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["LVP QADIM ROLES"].format(lvp_names=lvp_names)
+            return Finding("LVP QADIM ROLES", lvp_names=lvp_names)
         return
     
     ################################ CONDITIONS ################################
@@ -3003,25 +2958,14 @@ class Q1(Boss):
 
     # Old code, Collect all people who didn't go to a pylon
     def get_fdp(self):
-        fdp              = []
-        start_p1, end_p1 = self.get_phase_timers("Qadim P1")
-        start_p2, end_p2 = self.get_phase_timers("Qadim P2")
+        fdp = []
+        if not self.occupancy.has_window("center P1") or not self.occupancy.has_window("center P2"):
+            return fdp
         for i in self.player_list:
             if not self.is_tank(i):
-                add_fdp = True
-                pos_p1  = self.get_player_pos(i, start=start_p1, end=end_p1)
-                pos_p2  = self.get_player_pos(i, start=start_p2, end=end_p2)
-                for pos in pos_p1:
-                    dist = get_dist(pos, Q1.center)
-                    if dist > Q1.fdp_radius:
-                        add_fdp = False
-                        break        
-                for pos in pos_p2:
-                    dist = get_dist(pos, Q1.center)
-                    if dist > Q1.fdp_radius:
-                        add_fdp = False
-                        break 
-                if add_fdp:
+                stayed_p1 = self.occupancy.always_inside("center P1", i)
+                stayed_p2 = self.occupancy.always_inside("center P2", i)
+                if stayed_p1 and stayed_p2:
                     fdp.append(i)
         return fdp
  
@@ -3145,7 +3089,7 @@ class ADINA(Boss):
         mvp_names                     = self.players_to_string(i_players)
         dmg_ratio                     = min_dmg / total_dmg * 100
         self.add_mvps(i_players)
-        return LANGUES["selected_language"]["ADINA MVP SPLIT"].format(mvp_names=mvp_names, dmg_ratio=dmg_ratio)
+        return Finding("ADINA MVP SPLIT", mvp_names=mvp_names, dmg_ratio=dmg_ratio)
         
     # Flame the people that got blinded
     def mvp_adina_blinded(self):
@@ -3154,7 +3098,7 @@ class ADINA(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP ADINA BLINDED"].format(mvp_names=mvp_names)
+            return Finding("MVP ADINA BLINDED", mvp_names=mvp_names)
         return
     
     # Flame the people that got hit by knockback attack
@@ -3166,9 +3110,9 @@ class ADINA(Boss):
             mvp_names = self.players_to_string(i_players)
             number_mvp = len(i_players)
             if number_mvp == 1:
-                return LANGUES["selected_language"]["MVP ADINA KNOCKBACK S"].format(mvp_names=mvp_names)
+                return Finding("MVP ADINA KNOCKBACK S", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["MVP ADINA KNOCKBACK P"].format(mvp_names=mvp_names)          
+                return Finding("MVP ADINA KNOCKBACK P", mvp_names=mvp_names)          
         return
     
     ################################ LVP ################################    
@@ -3179,7 +3123,7 @@ class ADINA(Boss):
         lvp_names                     = self.players_to_string(i_players)
         dmg_ratio                     = max_dmg / total_dmg * 100
         self.add_lvps(i_players)
-        return LANGUES["selected_language"]["ADINA LVP SPLIT"].format(lvp_names=lvp_names, dmg_ratio=dmg_ratio)
+        return Finding("ADINA LVP SPLIT", lvp_names=lvp_names, dmg_ratio=dmg_ratio)
     
     ################################ CONDITIONS ################################
     
@@ -3297,7 +3241,7 @@ class SABIR(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP SABIR SHOCKWAVE"].format(mvp_names=mvp_names)
+            return Finding("MVP SABIR SHOCKWAVE", mvp_names=mvp_names)
         return
 
     # Flame the people that went into orange tornadoes        
@@ -3307,7 +3251,7 @@ class SABIR(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP SABIR BIG TORNADO"].format(mvp_names=mvp_names)
+            return Finding("MVP SABIR BIG TORNADO", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -3473,7 +3417,7 @@ class QTP(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP QTP ARROW HIT"].format(mvp_names=mvp_names)
+            return Finding("MVP QTP ARROW HIT", mvp_names=mvp_names)
         return
     
     # Flame the people that got hit by the 3 orange circles that expand in size each time
@@ -3483,7 +3427,7 @@ class QTP(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP QTP LIGHTNING HIT"].format(mvp_names=mvp_names)
+            return Finding("MVP QTP LIGHTNING HIT", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -3495,7 +3439,7 @@ class QTP(Boss):
         if i_players:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["LVP QTP LIFTED"].format(lvp_names=lvp_names)
+            return Finding("LVP QTP LIFTED", lvp_names=lvp_names)
         return
     
     # Praise the people that backed up the orb when pylon kiters got cancer and couldn't do it   
@@ -3505,7 +3449,7 @@ class QTP(Boss):
         if i_players:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["LVP QTP ORB BACKUP"].format(lvp_names=lvp_names)
+            return Finding("LVP QTP ORB BACKUP", lvp_names=lvp_names)
         return
     
     # Praise the kiters 
@@ -3515,7 +3459,7 @@ class QTP(Boss):
         if i_players:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["LVP QTP KITERS"].format(lvp_names=lvp_names)
+            return Finding("LVP QTP KITERS", lvp_names=lvp_names)
         return
     
     ################################ CONDITIONS ################################
@@ -3681,9 +3625,9 @@ class GREER(Boss):
             mvp_names = self.players_to_string(i_players)
             number_mvp = len(i_players)
             if number_mvp == 1:
-                return LANGUES["selected_language"]["MVP GREER CORRUPTED S"].format(mvp_names=mvp_names)
+                return Finding("MVP GREER CORRUPTED S", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["MVP GREER CORRUPTED P"].format(mvp_names=mvp_names)
+                return Finding("MVP GREER CORRUPTED P", mvp_names=mvp_names)
         return
     
     # Flame the people that AFK and get hit by many orange aoes while Greer is in CC phase (based on squad average)
@@ -3692,7 +3636,7 @@ class GREER(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP GREER CC HIT"].format(mvp_names=mvp_names)
+            return Finding("MVP GREER CC HIT", mvp_names=mvp_names)
         return
     
     # Flame the people that get hit by an attack that knocks back more than 10 times
@@ -3701,7 +3645,7 @@ class GREER(Boss):
         if i_players:
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP GREER KNOCKBACK"].format(mvp_names=mvp_names)
+            return Finding("MVP GREER KNOCKBACK", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -3723,7 +3667,7 @@ class GREER(Boss):
         if(len(i_players))>0:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)   
-            return LANGUES["selected_language"]["LVP GREER CLEAVE"].format(lvp_names=lvp_names)
+            return Finding("LVP GREER CLEAVE", lvp_names=lvp_names)
         return
     
     # Praise the people who reflect/destroy projs
@@ -3732,7 +3676,7 @@ class GREER(Boss):
         if(len(i_players))>0:
             self.add_lvps(i_players)
             lvp_names = self.players_to_string(i_players)  
-            return LANGUES["selected_language"]["LVP GREER REFLECT"].format(lvp_names=lvp_names)
+            return Finding("LVP GREER REFLECT", lvp_names=lvp_names)
     
     ################################ CONDITIONS ################################
     
@@ -3931,9 +3875,9 @@ class DECIMA(Boss):
         mvp_names  = self.players_to_string(i_players)
         number_mvp = len(i_players)
         if number_mvp == 1:
-            return LANGUES["selected_language"]["MVP DECIMA CC S"].format(mvp_names=mvp_names)
+            return Finding("MVP DECIMA CC S", mvp_names=mvp_names)
         else:
-            return LANGUES["selected_language"]["MVP DECIMA CC P"].format(mvp_names=mvp_names)
+            return Finding("MVP DECIMA CC P", mvp_names=mvp_names)
     
     # Flame people who took the red arrow over the main red arrow kiter    
     def mvp_decima_red_arrow(self):
@@ -3941,7 +3885,7 @@ class DECIMA(Boss):
         self.add_mvps(i_players)
         if i_players:
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["MVP DECIMA ACCIDENTAL KITER"].format(mvp_names=mvp_names)
+            return Finding("MVP DECIMA ACCIDENTAL KITER", mvp_names=mvp_names)
         return
     
     # Flame the people who do less than 6 ticks of Green during Phase 2 & 3 excluding kiters    
@@ -3952,9 +3896,9 @@ class DECIMA(Boss):
             mvp_names = self.players_to_string(i_players)
             number_mvp = len(i_players)
             if number_mvp == 1:
-                return LANGUES["selected_language"]["MVP DECIMA NO GREEN S"].format(mvp_names=mvp_names)
+                return Finding("MVP DECIMA NO GREEN S", mvp_names=mvp_names)
             else:
-                return LANGUES["selected_language"]["MVP DECIMA NO GREEN P"].format(mvp_names=mvp_names)
+                return Finding("MVP DECIMA NO GREEN P", mvp_names=mvp_names)
         return
     
     # Flame the people who take more greens in Phase 1, Split 1, Split 2 compared to Phase 2 & 3 excluding kiters. Extra flame if there is only 1 person
@@ -3982,9 +3926,9 @@ class DECIMA(Boss):
                 off_phase_greens = off_phase_greens + self.get_mech_value(i_players[0], "Absorbed Tier 2 Green", "Split 2")
                 off_phase_greens = off_phase_greens + self.get_mech_value(i_players[0], "Absorbed Tier 3 Green", "Split 2")
                 greed_ratio = greens_done/off_phase_greens * 100
-                return LANGUES["selected_language"]["MVP DECIMA GREEN GREED S"].format(mvp_names=mvp_names, green_ratio=greed_ratio)
+                return Finding("MVP DECIMA GREEN GREED S", mvp_names=mvp_names, green_ratio=greed_ratio)
             else:
-                return LANGUES["selected_language"]["MVP DECIMA GREEN GREED P"].format(mvp_names=mvp_names)
+                return Finding("MVP DECIMA GREEN GREED P", mvp_names=mvp_names)
         return
     
     ################################ LVP ################################
@@ -4012,7 +3956,7 @@ class DECIMA(Boss):
         green_ratio = max_greens / total_greens * 100                     
         if green_ratio > 20:
             self.add_lvps([i_tracked])
-            return LANGUES["selected_language"]["LVP DECIMA GREEN"].format(lvp_names=i_players, greens=max_greens, ratio=green_ratio)
+            return Finding("LVP DECIMA GREEN", lvp_names=i_players, greens=max_greens, ratio=green_ratio)
         return
     
     ################################ CONDITIONS ################################
@@ -4117,7 +4061,8 @@ class URA(Boss):
     wing    = 8
     boss_id = 26712
     
-    scaler  = 1#20.10672962
+    scaler    = 1#20.10672962
+    positions = True
 
     def __init__(self, log: Log):
         super().__init__(log)
@@ -4201,9 +4146,9 @@ class URA(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["URA MVP SAK S"].format(mvp_names=mvp_names)
+                return Finding("URA MVP SAK S", mvp_names=mvp_names)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["URA MVP SAK P"].format(mvp_names=mvp_names)
+                return Finding("URA MVP SAK P", mvp_names=mvp_names)
         return
 
     # Flame the people that never pick up any bloodstone shards
@@ -4213,9 +4158,9 @@ class URA(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["URA MVP SHARD S"].format(mvp_names=mvp_names)
+                return Finding("URA MVP SHARD S", mvp_names=mvp_names)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["URA MVP SHARD P"].format(mvp_names=mvp_names)
+                return Finding("URA MVP SHARD P", mvp_names=mvp_names)
         return  
     
     # VOIDED FUNCTION FOR NOW!!! Flame the people who trap others in steam prison
@@ -4224,7 +4169,7 @@ class URA(Boss):
         self.add_mvps(i_players)
         if i_players:
             mvp_names = self.players_to_string(i_players)
-            return LANGUES["selected_language"]["URA MVP PRISON"].format(mvp_names=mvp_names)
+            return Finding("URA MVP PRISON", mvp_names=mvp_names)
         return
     
     # Flame the people that get more than 4 exposed stacks
@@ -4234,9 +4179,9 @@ class URA(Boss):
             self.add_mvps(i_players)
             mvp_names = self.players_to_string(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["URA MVP EXPOSED S"].format(mvp_names=mvp_names)
+                return Finding("URA MVP EXPOSED S", mvp_names=mvp_names)
             if len(i_players) > 1:
-                return LANGUES["selected_language"]["URA MVP EXPOSED P"].format(mvp_names=mvp_names)
+                return Finding("URA MVP EXPOSED P", mvp_names=mvp_names)
         return  
     
     ################################ LVP ################################
@@ -4259,7 +4204,7 @@ class URA(Boss):
         cc_ratio = titanspawn_cc / titanspawn_cc_total * 100
         if titanspawn_cc > 0.3 * titanspawn_cc_total:
             self.add_lvps([i_tracked])
-            return LANGUES["selected_language"]["URA LVP TITANSPAWN CC"].format(lvp_names=cc_god, max_cc=titanspawn_cc, cc_ratio=cc_ratio)
+            return Finding("URA LVP TITANSPAWN CC", lvp_names=cc_god, max_cc=titanspawn_cc, cc_ratio=cc_ratio)
         return
     
     ################################ CONDITIONS ################################
@@ -4274,38 +4219,19 @@ class URA(Boss):
 
     # VOIDED FUNCTION FOR NOW !!! Check if player is trapping others in the Steam Prison
     def is_terrorist(self, i_player: int):
-        prison_history = self.get_mech_value(i_player, "Steam Prison Target")
-        players = self.player_list
-        player_name  = self.get_player_name(i_player)
-        if prison_history:
-            history      = []
-            mech_history = self.log.pjcontent['mechanics']
-            for mech in mech_history:
-                for data in mech['mechanicsData']:
-                    if data['actor'] == player_name:
-                        if mech['name'] == "Ste.Prison.T":
-                            Prison_time = data['time'] + 3000
-                            Stuck_time = data['time'] + 4500
-                            time_index = time_to_index(Prison_time, self.time_base)  
-                            time_index_2 = time_to_index(Stuck_time, self.time_base)
-                            
-                            try:
-                                bomb_pos = self.get_player_pos(i_player)[time_index]                                
-                            except:
-                                continue
-
-                            
-                            for i in players:
-                                if i == i_player or self.is_dead(i):
-                                    continue
-                                try:
-                                    i_pos = self.get_player_pos(i)[time_index_2]
-                                    
-                                except:
-                                    return False
-                                if get_dist(bomb_pos, i_pos) * URA.scaler <= 60:
-                                    return True
-        return False        
+        positions = self.occupancy.positions
+        others    = [i for i in self.player_list if i != i_player and not self.is_dead(i)]
+        for prison in self.events.times("Ste.Prison.T", actor=i_player):
+            time_index   = time_to_index(prison + 3000, self.time_base)
+            time_index_2 = time_to_index(prison + 4500, self.time_base)
+            if time_index >= self.occupancy.n_samples[i_player] or time_index_2 >= positions.shape[1]:
+                continue
+            # Players whose replay ended before time_index_2 are NaN, never close
+            bomb_pos = positions[i_player, time_index]
+            dists    = np.hypot(*(positions[others, time_index_2] - bomb_pos).T)
+            if np.any(dists * URA.scaler <= 60):
+                return True
+        return False
     
     # Check if player got more than 4 exposed stacks
     def is_ura_Exposed(self, i_player: int):
@@ -1,5 +1,6 @@
 from models.boss_class import Boss, Stats
 from models.log_class import Log
+from models.finding_class import Finding
 from func import *
 
 ################################ DAGDA ################################
@@ -37,9 +38,9 @@ class DAGDA(Boss):
         if max_debil > 1:
             self.add_mvps(i_players)
             if len(i_players) == 1:
-                return LANGUES["selected_language"]["KO MVP DEBIL S"].format(mvp_names=mvp_names, max_debil=max_debil)
+                return Finding("KO MVP DEBIL S", mvp_names=mvp_names, max_debil=max_debil)
             else:
-                return LANGUES["selected_language"]["KO MVP DEBIL P"].format(mvp_names=mvp_names, max_debil=max_debil)
+                return Finding("KO MVP DEBIL P", mvp_names=mvp_names, max_debil=max_debil)
         return
     
     ################################ DATA MECHAS ################################
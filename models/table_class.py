@@ -0,0 +1,38 @@
+import numpy as np
+
+DAMAGE_DTYPE  = np.dtype([('damage', np.int64), ('power', np.int64), ('condi', np.int64), ('breakbar', np.float64)])
+DEFENSE_DTYPE = np.dtype([('deaths', np.int64), ('downs', np.int64)])
+
+class StatsTable:
+
+    # Columnar copy of the per player stats of a log
+    # targets  : player x target x phase (dpsTargets)
+    # all      : player x phase (dpsAll)
+    # defenses : player x phase (defenses)
+    def __init__(self, players: list[dict]):
+        n_players = len(players)
+        n_targets = max([len(player.get('dpsTargets') or []) for player in players], default=0)
+        n_phases  = max([len(player.get('dpsAll') or []) for player in players], default=0)
+        for player in players:
+            for target in player.get('dpsTargets') or []:
+                n_phases = max(n_phases, len(target))
+
+        self.targets  = np.zeros((n_players, n_targets, n_phases), dtype=DAMAGE_DTYPE)
+        self.all      = np.zeros((n_players, n_phases), dtype=DAMAGE_DTYPE)
+        self.defenses = np.zeros((n_players, n_phases), dtype=DEFENSE_DTYPE)
+        for i_player, player in enumerate(players):
+            for i_target, target in enumerate(player.get('dpsTargets') or []):
+                for i_phase, stats in enumerate(target):
+                    self.targets[i_player, i_target, i_phase] = StatsTable._damage_row(stats)
+            for i_phase, stats in enumerate(player.get('dpsAll') or []):
+                self.all[i_player, i_phase] = StatsTable._damage_row(stats)
+            for i_phase, stats in enumerate(player.get('defenses') or []):
+                self.defenses[i_player, i_phase] = (stats.get('deadCount', 0), stats.get('downCount', 0))
+
+    @staticmethod
+    def _damage_row(stats: dict):
+        return (stats.get('damage', 0), stats.get('powerDamage', 0), stats.get('condiDamage', 0), stats.get('breakbarDamage', 0))
+
+    # Damage field summed over the first n targets, for one phase
+    def get_cleave(self, field: str, targets: int, phase: int) -> np.ndarray:
+        return self.targets[field][:, :targets, phase].sum(axis=1)
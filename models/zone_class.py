@@ -0,0 +1,90 @@
+import numpy as np
+
+class Zone:
+
+    # Circle of the arena, or ring when inner > 0 (inner < dist <= radius)
+    # The zone is only active during [start, end[ (ms) or during the given phase
+    def __init__(self, name: str, center: list[float], radius: float, inner: float = 0, start: int = None, end: int = None, phase: str = None):
+        self.name   = name
+        self.center = center
+        self.radius = radius
+        self.inner  = inner
+        self.start  = start
+        self.end    = end
+        self.phase  = phase
+
+    def __repr__(self) -> str:
+        return self.name
+
+class ZoneOccupancy:
+
+    # Computes in one pass which player is inside which zone for every replay sample
+    # windows : zone name -> (start, end) sample indexes
+    def __init__(self, players: list[dict], zones: list[Zone], windows: dict):
+        self.zones     = {zone.name: i for i, zone in enumerate(zones)}
+        poses          = [player.get('combatReplayData', {}).get('positions') or [] for player in players]
+        self.n_samples = np.array([len(pos) for pos in poses], dtype=np.int64)
+        n_samples      = self.n_samples.max(initial=0)
+
+        # player x sample x (x, y), padded with NaN so that padding is never inside a zone
+        self.positions = np.full((len(players), n_samples, 2), np.nan)
+        for i_player, pos in enumerate(poses):
+            if pos:
+                self.positions[i_player, :len(pos)] = np.asarray(pos, dtype=np.float64)[:, :2]
+
+        # zone x player x sample
+        self.inside = np.zeros((len(zones), len(players), n_samples), dtype=bool)
+        samples     = np.arange(n_samples)
+        for i_zone, zone in enumerate(zones):
+            dist       = np.hypot(self.positions[:, :, 0] - zone.center[0], self.positions[:, :, 1] - zone.center[1])
+            start, end = windows.get(zone.name, (0, n_samples))
+            active     = (samples >= start) & (samples < end)
+            self.inside[i_zone] = (dist <= zone.radius) & (dist > zone.inner) & active
+        # Prefix sums for O(1) window queries
+        self._count = np.zeros((len(zones), len(players), n_samples + 1), dtype=np.int64)
+        np.cumsum(self.inside, axis=2, out=self._count[:, :, 1:])
+        self.windows = windows
+
+    # False when the zone window could not be resolved (missing phase) or is empty
+    def has_window(self, name: str) -> bool:
+        start, end = self.windows.get(name, (0, self.inside.shape[2]))
+        return end > start
+
+    def _window(self, name: str, i_player: int, start: int = None, end: int = None):
+        zone_start, zone_end = self.windows.get(name, (0, self.inside.shape[2]))
+        n     = self.n_samples[i_player]
+        start = min(zone_start if start is None else max(start, zone_start), n)
+        end   = min(zone_end if end is None else min(end, zone_end), n)
+        return start, max(end, start)
+
+    # Number of samples the player spent in the zone between the sample indexes start and end
+    def count(self, name: str, i_player: int, start: int = None, end: int = None) -> int:
+        start, end = self._window(name, i_player, start, end)
+        counts     = self._count[self.zones[name], i_player]
+        return int(counts[end] - counts[start])
+
+    def was_inside(self, name: str, i_player: int, start: int = None, end: int = None) -> bool:
+        return self.count(name, i_player, start, end) > 0
+
+    # True if every sample of the window is inside the zone (also True for an empty window)
+    def always_inside(self, name: str, i_player: int, start: int = None, end: int = None) -> bool:
+        start, end = self._window(name, i_player, start, end)
+        return self.count(name, i_player, start, end) == end - start
+
+    # Inside the zone at a given sample, negative indexes count from the last sample of the player
+    def inside_at(self, name: str, i_player: int, index: int) -> bool:
+        if index < 0:
+            index += self.n_samples[i_player]
+        if not 0 <= index < self.n_samples[i_player]:
+            return False
+        return bool(self.inside[self.zones[name], i_player, index])
+
+    # [enter, exit[ sample intervals of a player in the zone
+    def get_intervals(self, name: str, i_player: int) -> list[tuple[int, int]]:
+        inside = self.inside[self.zones[name], i_player].astype(np.int8)
+        edges  = np.diff(np.concatenate(([0], inside, [0])))
+        return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+    # Players inside the zone at least once, among i_players
+    def get_visitors(self, name: str, i_players: list[int]) -> list[int]:
+        return [i for i in i_players if self.was_inside(name, i)]
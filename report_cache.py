@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from time import monotonic
+
+class ReportCache:
+
+    # LRU of rendered reports, entries also expire after ttl seconds
+    def __init__(self, max_entries: int = 256, ttl: float = 6 * 3600):
+        self.max_entries = max_entries
+        self.ttl         = ttl
+        self._entries    = OrderedDict()  # key -> (expiry, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if expiry <= monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+# Same set of logs whatever the order, duplicates or markdown wrapping
+def normalize_urls(urls: list[str]) -> tuple[str]:
+    return tuple(sorted(set(url.strip('_*<>') for url in urls)))
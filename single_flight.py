@@ -0,0 +1,61 @@
+import asyncio
+import hashlib
+import os
+
+class SingleFlight:
+
+    # Concurrent calls with the same key share one in-progress future instead of running the work again
+    # The key is forgotten as soon as the work is done, results are not cached
+    def __init__(self):
+        self._calls = {}
+
+    def in_flight(self, key) -> bool:
+        return key in self._calls
+
+    async def do(self, key, fn):
+        future = self._calls.get(key)
+        if future is None:
+            future           = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        # A cancelled caller must not cancel the work shared with the others
+        return await asyncio.shield(future)
+
+# The wingman snapshot gives the percentiles and mechanic thresholds
+WINGMAN_MANIFEST = "wingman_updater/snapshot/manifest.json"
+
+_VERSIONS = {}  # (root, handlers) -> (manifest modification time, version)
+
+# Hash of the analysis code (boss handlers, helpers and language files), changes whenever the output could change
+# handlers : with the boss handlers (models/sub_models), AnalysisCache hashes the handler of each boss itself
+# The sources are read once per process, only the wingman updater changes the output of a running bot
+def get_handler_version(root: str = None, handlers: bool = True) -> str:
+    root = root or os.path.dirname(os.path.abspath(__file__))
+    try:
+        mtime = os.stat(os.path.join(root, WINGMAN_MANIFEST)).st_mtime_ns
+    except OSError:
+        mtime = None
+    cached = _VERSIONS.get((root, handlers))
+    if cached and cached[0] == mtime:
+        return cached[1]
+    version = _hash_sources(root, handlers)
+    _VERSIONS[(root, handlers)] = (mtime, version)
+    return version
+
+def _hash_sources(root: str, handlers: bool) -> str:
+    digest = hashlib.sha1()
+    paths  = [os.path.join(root, name) for name in ("func.py", "const.py", "languages.py", "wingman.py", WINGMAN_MANIFEST)]
+    for folder in ("models", "languages_dict"):
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, folder)):
+            dirnames.sort()
+            if not handlers and "sub_models" in dirnames:
+                dirnames.remove("sub_models")
+            paths.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith(".py"))
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                digest.update(os.path.relpath(path, root).encode())
+                digest.update(f.read())
+        except OSError:
+            continue
+    return digest.hexdigest()[:12]
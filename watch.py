@@ -0,0 +1,301 @@
+from argparse import ArgumentParser
+from pathlib import Path
+from time import monotonic, perf_counter, sleep
+import ctypes
+import ctypes.util
+import gzip
+import os
+import select
+import signal
+import struct
+import sys
+import threading
+
+import func
+from const import ALL_BOSSES, ALL_PLAYERS, DEFAULT_LANGUAGE, DEFAULT_TITLE, DEFAULT_OUTPUT_FILE, HISTORY_FILE
+from languages import LANGUES
+from models.log_class import Log
+from models.boss_facto import BossFactory
+from models.cache_class import AnalysisCache, CachedBoss
+from models.finding_class import render
+from history import History
+
+# Seconds without a change before a file still open by its writer counts as complete
+SETTLE = 0.25
+# Folder scan interval when inotify is not available
+POLL_INTERVAL = 1.0
+# Longest wait for a file event, so reports asked with SIGUSR1 / Enter go out quickly
+TICK = 0.5
+# Elite Insights output : the analysis needs both the html (_logData) and the json of a log
+HTML_SUFFIX   = ".html"
+JSON_SUFFIXES = (".json", ".json.gz")
+
+def _make_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Analyses the Elite Insights logs written to a folder as the raid goes")
+    parser.add_argument('folder')
+    parser.add_argument('-l', '--language', required=False, default=DEFAULT_LANGUAGE)
+    parser.add_argument('-o', '--output', required=False, default=DEFAULT_OUTPUT_FILE)
+    parser.add_argument('--history', required=False, default=HISTORY_FILE)
+    parser.add_argument('--no-history', action='store_true', required=False)
+    parser.add_argument('--poll', action='store_true', required=False)  # scan the folder instead of using inotify
+    parser.add_argument('--interval', required=False, type=float, default=POLL_INTERVAL)
+    return parser
+
+class Inotify:
+
+    # inotify through libc, raises OSError where it is not available (not linux, no watch left)
+    IN_MODIFY      = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO    = 0x080
+    IN_CREATE      = 0x100
+    IN_NONBLOCK    = 0o4000
+    EVENT          = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+    def __init__(self, folder: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed on {folder}")
+
+    # (file name, writer done with it) of the events coming within timeout seconds
+    def read(self, timeout: float) -> list:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        data   = os.read(self.fd, 64 * 1024)
+        events = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = self.EVENT.unpack_from(data, offset)
+            name    = data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0")
+            offset += self.EVENT.size + length
+            if name:
+                events.append((os.fsdecode(name), bool(mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO))))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+class Poller:
+
+    # Fallback of Inotify : files whose size or modification time changed since the last scan
+    def __init__(self, folder: str, interval: float = POLL_INTERVAL):
+        self.folder   = folder
+        self.interval = interval
+        self.stats    = {}
+        self.next     = monotonic()
+
+    def read(self, timeout: float) -> list:
+        wait = self.next - monotonic()
+        if wait > timeout:
+            sleep(timeout)
+            return []
+        sleep(max(wait, 0))
+        self.next  = monotonic() + self.interval
+        stats      = {entry.name: get_stat(entry.path) for entry in os.scandir(self.folder) if entry.is_file()}
+        events     = [(name, False) for name, stat in stats.items() if self.stats.get(name) != stat]
+        self.stats = stats
+        return events
+
+    def close(self):
+        pass
+
+def get_stat(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+# (log name, "html" / "json") of an Elite Insights output file, None for any other file
+def split_name(name: str):
+    if name.endswith(HTML_SUFFIX):
+        return name[:-len(HTML_SUFFIX)], "html"
+    for suffix in JSON_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)], "json"
+    return None
+
+class LogFolder:
+
+    # Logs of a folder whose html and json are both complete : closed by their writer,
+    # or unchanged for settle seconds when the event source cannot tell (polling, writer still holding the file)
+    def __init__(self, folder: str, source, settle: float = SETTLE):
+        self.folder   = folder
+        self.source   = source
+        self.settle   = settle
+        self.pending  = {}     # file name -> (time it is complete at if unchanged, stat)
+        self.complete = {}     # log name -> {"html": path, "json": path}
+        self.given    = set()  # log names already returned
+        for entry in os.scandir(folder):
+            self.touch(entry.name, False)
+
+    def touch(self, name: str, closed: bool):
+        if not split_name(name):
+            return
+        stat = get_stat(os.path.join(self.folder, name))
+        if stat is None:
+            self.pending.pop(name, None)
+            return
+        self.pending[name] = (monotonic() + (0 if closed else self.settle), stat)
+
+    # [(log name, html path, json path)] completed within timeout seconds, oldest name first
+    def get_logs(self, timeout: float) -> list:
+        deadline = min((ready for ready, _ in self.pending.values()), default=monotonic() + timeout)
+        for name, closed in self.source.read(max(0, min(timeout, deadline - monotonic()))):
+            self.touch(name, closed)
+        logs = []
+        now  = monotonic()
+        for name, (ready, stat) in list(self.pending.items()):
+            if ready > now:
+                continue
+            path    = os.path.join(self.folder, name)
+            current = get_stat(path)
+            if current != stat:
+                self.touch(name, False)
+                continue
+            del self.pending[name]
+            log_name, kind = split_name(name)
+            if log_name in self.given:
+                continue
+            files       = self.complete.setdefault(log_name, {})
+            files[kind] = path
+            if len(files) == 2:
+                self.given.add(log_name)
+                del self.complete[log_name]
+                logs.append((log_name, files["html"], files["json"]))
+        return sorted(logs)
+
+class WatchRun:
+
+    # Records of every analysed boss, the report is rendered from them without touching the logs again
+    # A report is written at each wing boundary, when asked for, and when the watch stops
+    # A boss is printed without waiting for wingman, its percentile is printed once wingman answered (like LateWingman)
+    def __init__(self, output_file: str = DEFAULT_OUTPUT_FILE, language: str = None, history_file: str = HISTORY_FILE):
+        self.output_file  = output_file
+        self.language     = language
+        self.history_file = history_file
+        self.records      = {}  # url -> analysis record
+        self.pending      = []  # (record, boss) still without their wingman answer
+        self.wing         = None
+
+    def add(self, html_path: str, json_path: str):
+        start = perf_counter()
+        with open(json_path, "rb") as f:
+            content = f.read()
+        log = Log(None)
+        log.parse_pjcontent(gzip.decompress(content) if json_path.endswith(".gz") else content)
+        if not log.pjcontent.get("success", True):
+            print(f"{os.path.basename(json_path)} : wipe, skipped")
+            return
+        with open(html_path, "rb") as f:
+            log.parse_jcontent(f.read())
+        # The dps.report permalink when Elite Insights uploaded the log, the local file otherwise
+        links   = [link for link in log.pjcontent.get("uploadLinks") or [] if link.startswith("http")]
+        log.url = links[0] if links else Path(html_path).resolve().as_uri()
+        if log.url in self.records:
+            return
+        ALL_BOSSES.clear()
+        ALL_PLAYERS.clear()
+        BossFactory.create_boss(log)
+        if not ALL_BOSSES:
+            print(f"{os.path.basename(json_path)} : not a handled boss, skipped")
+            return
+        boss   = ALL_BOSSES[0]
+        record = AnalysisCache.get_record(boss, {})
+        print(func.get_boss_header(boss, None) + "".join(render(text, self.language) for text in (boss.mvp, boss.lvp) if text), end="")
+        print(f"--- analysed in {perf_counter() - start:.2f} seconds ---\n")
+        ALL_BOSSES.clear()
+        ALL_PLAYERS.clear()
+        self.pending.append((record, boss))
+        boss.wingman.add_done_callback(lambda _, boss=boss: print_wingman(boss))
+        if self.records and record['wing'] != self.wing:
+            self.write_report()
+        self.records[log.url] = record
+        self.wing             = record['wing']
+
+    # Waits for the wingman answers the records still miss
+    def set_wingman(self):
+        for record, boss in self.pending:
+            AnalysisCache.set_wingman(record, boss)
+        self.pending = []
+
+    def replay(self):
+        self.set_wingman()
+        ALL_BOSSES.clear()
+        ALL_PLAYERS.clear()
+        for record in self.records.values():
+            ALL_BOSSES.append(CachedBoss(record))
+
+    def write_report(self):
+        if not self.records:
+            print("No boss analysed yet")
+            return
+        self.replay()
+        chunks = func.get_message_reward(ALL_BOSSES, ALL_PLAYERS, titre=DEFAULT_TITLE, language=self.language)
+        print("".join(chunks))
+        with open(self.output_file, "w", encoding="utf-8") as f:
+            f.write("".join(chunks))
+
+    # Last report, and the whole night in the history
+    def close(self):
+        if self.history_file and self.records:
+            self.replay()
+            with History(self.history_file) as history:
+                history.add_run(list(ALL_BOSSES), dict(ALL_PLAYERS), DEFAULT_TITLE)
+        self.write_report()
+
+# Header of a boss already printed, again with its wingman percentile
+def print_wingman(boss):
+    if boss.wingman_percentile is not None:
+        print(func.get_boss_header(boss, boss.wingman_percentile))
+
+# Report asked with SIGUSR1, or Enter in the terminal
+def listen_report_requests(requested: threading.Event):
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: requested.set())
+    if sys.stdin and sys.stdin.isatty():
+        def read_stdin():
+            for _ in sys.stdin:
+                requested.set()
+        threading.Thread(target=read_stdin, daemon=True).start()
+
+def watch(folder: str, output_file: str = DEFAULT_OUTPUT_FILE, language: str = None, history_file: str = HISTORY_FILE, poll: bool = False, interval: float = POLL_INTERVAL):
+    source = None
+    if not poll:
+        try:
+            source = Inotify(folder)
+        except OSError as e:
+            print(f"inotify unavailable ({e}), polling {folder} every {interval}s")
+    source    = source or Poller(folder, interval)
+    logs      = LogFolder(folder, source)
+    run       = WatchRun(output_file, language, history_file)
+    requested = threading.Event()
+    listen_report_requests(requested)
+    print(f"Watching {folder}, Enter or SIGUSR1 for a report, Ctrl+C to stop\n")
+    try:
+        while True:
+            for log_name, html_path, json_path in logs.get_logs(TICK):
+                try:
+                    run.add(html_path, json_path)
+                except Exception as e:
+                    print(f"{log_name} : could not be analysed ({type(e).__name__}: {e})")
+            if requested.is_set():
+                requested.clear()
+                run.write_report()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.close()
+        run.close()
+
+
+if __name__ == "__main__":
+    args = _make_parser().parse_args()
+    LANGUES["selected_language"] = LANGUES[args.language]
+    watch(args.folder, args.output, args.language, None if args.no_history else args.history, args.poll, args.interval)
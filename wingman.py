@@ -0,0 +1,208 @@
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from time import time
+import numpy as np
+import requests
+
+from const import WINGMAN_SNAPSHOT_DIR, WINGMAN_DATA_FILE, WINGMAN_CACHE_FILE, WINGMAN_MEDIAN_TTL, WINGMAN_ERA_TTL, WINGMAN_REQUEST_TIMEOUT
+
+# Snapshot durations are in seconds, as wingman plots them
+DURATION_UNIT_MS = 1000
+# Quantiles computed for snapshots which do not have them (WINGMAN_DATA.json)
+QUANTILE_GRID = np.linspace(0, 1, 21)
+# Names wingman_updater/writer.py uses which are not the boss names
+SNAPSHOT_NAMES = {
+    "QUOIDIMM" : "QADIM",
+    "COL"      : "ICEBROOD",
+    "AH"       : "MAI TRIN",
+    "FEBE"     : "CERUS",
+}
+
+class WingmanSnapshot:
+
+    # Kill durations as sorted arrays (ms) and mechanic quantiles per (boss name, cm, era)
+    # The updater only scrapes the current era, snapshots without one are the "latest" era
+    # version : changes with the snapshot data, part of the analysis cache version
+    def __init__(self, era: str = "latest", quantile_grid=QUANTILE_GRID, version: str = ""):
+        self.era           = era
+        self.version       = version
+        self.quantile_grid = np.asarray(quantile_grid, dtype=float)
+        self.durations     = {}
+        self.quantiles     = {}  # key -> {mechanic: values at quantile_grid}
+
+    def get_key(self, boss_name: str, cm_nm: str, era: str = None):
+        return (SNAPSHOT_NAMES.get(boss_name, boss_name), cm_nm == "CM", era or self.era)
+
+    def add(self, boss_name: str, cm_nm: str, durations, era: str = None):
+        if len(durations) == 0:
+            return
+        self.durations[self.get_key(boss_name, cm_nm, era)] = np.sort(np.asarray(durations, dtype=float)) * DURATION_UNIT_MS
+
+    def add_quantiles(self, boss_name: str, cm_nm: str, quantiles: dict, era: str = None):
+        self.quantiles[self.get_key(boss_name, cm_nm, era)] = {mech: np.asarray(values, dtype=float) for mech, values in quantiles.items()}
+
+    # Folder written by wingman_updater/writer.py : manifest.json and one .npy per boss mechanic, memory-mapped
+    @classmethod
+    def from_folder(cls, folder: str):
+        with open(os.path.join(folder, "manifest.json"), "rb") as f:
+            content = f.read()
+        manifest = json.loads(content)
+        snapshot = cls(manifest.get("era", {}).get("value", "latest"), manifest.get("quantile_grid", QUANTILE_GRID), hashlib.sha1(content).hexdigest())
+        for entry in manifest["bosses"].values():
+            file = entry["files"].get("Duration")
+            if file:
+                snapshot.add(entry["boss"], entry["cm_nm"], np.load(os.path.join(folder, file), mmap_mode="r"), entry["era"])
+            snapshot.add_quantiles(entry["boss"], entry["cm_nm"], entry.get("quantiles", {}), entry["era"])
+        return snapshot
+
+    # WINGMAN_DATA.json of the older updater : {mode: {NM / CM: {boss: {mechanic: values}}}}
+    @classmethod
+    def from_json(cls, data: dict, version: str = ""):
+        snapshot = cls(data.get("ERA", {}).get("value", "latest"), version=version)
+        for mode_name, mode in data.items():
+            if mode_name == "ERA":
+                continue
+            for cm_nm, bosses in mode.items():
+                for boss_name, values in bosses.items():
+                    snapshot.add(boss_name, cm_nm, values.get("Duration") or [])
+                    quantiles = {}
+                    for mech, mech_values in values.items():
+                        mech_values = np.asarray(mech_values, dtype=float) if mech != "links" else None
+                        if mech_values is not None and len(mech_values) and not np.isnan(mech_values).all():
+                            quantiles[mech] = np.nanquantile(mech_values, QUANTILE_GRID)
+                    snapshot.add_quantiles(boss_name, cm_nm, quantiles)
+        return snapshot
+
+    def get_durations(self, boss_name: str, cm: bool, era: str = None):
+        return self.durations.get((boss_name, bool(cm), era or self.era))
+
+    # Share of the kills slower than duration_ms, ties count for half
+    def get_percentile(self, boss_name: str, cm: bool, duration_ms: float, era: str = None):
+        durations = self.get_durations(boss_name, cm, era)
+        if durations is None:
+            return None
+        n     = len(durations)
+        left  = np.searchsorted(durations, duration_ms, side="left")
+        right = np.searchsorted(durations, duration_ms, side="right")
+        return round(float((n - right + (right - left) / 2) / n * 100), 2)
+
+    # Value of a mechanic at quantile q of the wingman population, None without data
+    def get_quantile(self, boss_name: str, cm: bool, mech_name: str, q: float, era: str = None):
+        values = self.quantiles.get((boss_name, bool(cm), era or self.era), {}).get(mech_name)
+        if values is None:
+            return None
+        return float(np.interp(q, self.quantile_grid, values))
+
+    # [median, fastest] kill duration in ms, like the wingman boss API
+    def get_time(self, boss_name: str, cm: bool, era: str = None):
+        durations = self.get_durations(boss_name, cm, era)
+        if durations is None:
+            return None
+        return [float(np.median(durations)), float(durations[0])]
+
+_SNAPSHOT = None
+
+# Built on first use, once per process. Without any snapshot every boss goes to the live API
+def get_snapshot() -> WingmanSnapshot:
+    global _SNAPSHOT
+    if _SNAPSHOT is None:
+        if os.path.exists(os.path.join(WINGMAN_SNAPSHOT_DIR, "manifest.json")):
+            _SNAPSHOT = WingmanSnapshot.from_folder(WINGMAN_SNAPSHOT_DIR)
+        elif os.path.exists(WINGMAN_DATA_FILE):
+            with open(WINGMAN_DATA_FILE, "rb") as f:
+                content = f.read()
+            _SNAPSHOT = WingmanSnapshot.from_json(json.loads(content), hashlib.sha1(content).hexdigest())
+        else:
+            _SNAPSHOT = WingmanSnapshot()
+    return _SNAPSHOT
+
+# Current era of wingman, the first of the era list of a boss page, as wingman_updater/writer.py reads it
+def fetch_era() -> str:
+    html = requests.get("https://gw2wingman.nevermindcreations.de/vg", timeout=WINGMAN_REQUEST_TIMEOUT).content.decode("utf-8")
+    return html.split('<option value="')[1].split('"')[0]
+
+class WingmanCache:
+
+    # Answers of the wingman API, shared by every process of the bot
+    # Boss medians expire after ttl seconds, percentiles by metadata are kept until the era changes
+    # The current era is asked to wingman every era_ttl seconds, a new era drops every answer
+    def __init__(self, path: str, ttl: float = WINGMAN_MEDIAN_TTL, era_ttl: float = WINGMAN_ERA_TTL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl     = ttl
+        self.era_ttl = era_ttl
+        self.lock    = threading.Lock()  # one connection for the wingman threads
+        self.db      = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS eras (era TEXT PRIMARY KEY, since REAL, checked REAL)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS medians (boss_id INTEGER, era TEXT, duration_med REAL, duration_top REAL, fetched REAL, PRIMARY KEY (boss_id, era))")
+            self.db.execute("CREATE TABLE IF NOT EXISTS percentiles (boss_id INTEGER, cm INTEGER, duration_ms INTEGER, era TEXT, percentile REAL, PRIMARY KEY (boss_id, cm, duration_ms, era))")
+
+    # A locked or broken cache file only costs an API call
+    def _execute(self, query: str, args: tuple):
+        try:
+            with self.lock, self.db:
+                return self.db.execute(query, args).fetchone()
+        except sqlite3.Error as e:
+            print(f"wingman cache failed : {e}")
+            return None
+
+    # (era, time the cache first saw it), (None, None) while wingman never answered
+    def get_current_era(self):
+        row = self._execute("SELECT era, since, checked FROM eras ORDER BY since DESC LIMIT 1", ())
+        if row and row[2] > time() - self.era_ttl:
+            return row[0], row[1]
+        try:
+            era = fetch_era()
+        except (requests.RequestException, IndexError) as e:
+            print(f"wingman era failed : {e}")
+            return (row[0], row[1]) if row else (None, None)
+        now = time()
+        try:
+            with self.lock, self.db:
+                if row and row[0] != era:
+                    self.db.execute("DELETE FROM medians")
+                    self.db.execute("DELETE FROM percentiles")
+                self.db.execute("INSERT OR IGNORE INTO eras VALUES (?, ?, ?)", (era, now, now))
+                self.db.execute("UPDATE eras SET checked = ? WHERE era = ?", (now, era))
+                return self.db.execute("SELECT era, since FROM eras WHERE era = ?", (era,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"wingman cache failed : {e}")
+            return era, now
+
+    # Key of the answers about a log started at timestamp : the current era when the log is not older than it,
+    # the day of the log otherwise, as wingman answers for the era the log is from
+    def get_log_era(self, timestamp: float) -> str:
+        era, since = self.get_current_era()
+        if era is not None and timestamp >= since:
+            return era
+        return "day " + datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+    def get_time(self, boss_id: int, era: str):
+        row = self._execute("SELECT duration_med, duration_top FROM medians WHERE boss_id = ? AND era = ? AND fetched > ?", (boss_id, era, time() - self.ttl))
+        return list(row) if row else None
+
+    def put_time(self, boss_id: int, era: str, wingman_time: list):
+        self._execute("INSERT OR REPLACE INTO medians VALUES (?, ?, ?, ?, ?)", (boss_id, era, wingman_time[0], wingman_time[1], time()))
+
+    def get_percentile(self, boss_id: int, cm: bool, duration_ms: int, era: str):
+        row = self._execute("SELECT percentile FROM percentiles WHERE boss_id = ? AND cm = ? AND duration_ms = ? AND era = ?", (boss_id, int(cm), duration_ms, era))
+        return row[0] if row else None
+
+    def put_percentile(self, boss_id: int, cm: bool, duration_ms: int, era: str, percentile: float):
+        self._execute("INSERT OR REPLACE INTO percentiles VALUES (?, ?, ?, ?, ?)", (boss_id, int(cm), duration_ms, era, percentile))
+
+_CACHE      = None
+_CACHE_LOCK = threading.Lock()
+
+# None when WINGMAN_CACHE_FILE is None
+def get_cache() -> WingmanCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None and WINGMAN_CACHE_FILE:
+            _CACHE = WingmanCache(WINGMAN_CACHE_FILE)
+    return _CACHE
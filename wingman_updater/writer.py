@@ -2,7 +2,10 @@ import requests
 from time import perf_counter
 import numpy as np
 import concurrent.futures
+import hashlib
 import json
+import os
+import re
 from datetime import date
 import traceback
 import sys
@@ -70,21 +73,17 @@ raids_cm = ["kc"]+list(raid_names.keys())[8:]
 strikes_nm = list(strike_names.keys())
 strikes_cm = list(strike_names.keys())[5:]
 
-n_boss_raid_nm = len(raids_nm)
-n_boss_raid_cm = len(raids_cm)
-n_boss_strike_nm = len(strikes_nm)
-n_boss_strike_cm = len(strikes_cm)
+# Boss pages fetched at the same time
+MAX_WORKERS = 8
 
-boss_raid_nm_count = 0
-boss_raid_cm_count = 0
-boss_strike_nm_count = 0
-boss_strike_cm_count = 0
+# One .npy per boss mechanic, listed in manifest.json with the era and page hash they come from
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot")
+MANIFEST_FILE = os.path.join(SNAPSHOT_DIR, "manifest.json")
 
-modes = {}
-nm_raid_bosses = {}
-cm_raid_bosses = {}
-nm_strike_bosses = {}
-cm_strike_bosses = {}
+mode_names = {"RAID": "RAIDS", "STRIKE": "STRIKES"}
+
+# Quantiles stored per boss mechanic, the bot reads its thresholds from them
+QUANTILE_GRID = [i / 20 for i in range(21)]
 
 def get_patch_value():
     with requests.Session() as session:
@@ -103,7 +102,7 @@ def get_bar(p, length=40):
     n_empty = length - n_plain
     return plain*n_plain + empty*n_empty
 
-def update_log_times(name, mode, cm):
+def get_boss_url(name, mode, cm):
     if name == "qadim":
         name = "q1"
     if name == "qpeer":
@@ -131,180 +130,206 @@ def update_log_times(name, mode, cm):
     url += "IncludeGermanLogs=on&"
     url += "IncludeSpanishLogs=on&"
     url += "currentGraph=AllRoles"
+    return url
+
+# Returns (manifest key, manifest entry, changed)
+# A boss of the same era whose page did not change (304 or same hash) keeps its arrays
+def update_log_times(name, mode, cm, previous):
+    boss_name = raid_names[name] if mode == "RAID" else strike_names[name]
+    cm_nm = "CM" if cm else "NM"
+    key = f"{mode_names[mode]}/{cm_nm}/{boss_name}"
+    old = previous.get(key)
+    if old and (old["era"] != patch_value or "quantiles" not in old):
+        old = None
 
+    headers = {}
+    if old and old.get("etag"):
+        headers["If-None-Match"] = old["etag"]
     with requests.Session() as session:
-        html = session.get(url).content.decode("utf-8")
-        
-    data = assemble_data(html)
-    
-    if name == "q1":
-        name = "qadim"
-    if name == "q2":
-        name = "qpeer"
-    
-    if mode == "RAID": 
-        if cm:
-            cm_raid_bosses[raid_names[name]] = data
-            global boss_raid_cm_count
-            boss_raid_cm_count += 1
-            print(f"{get_bar(boss_raid_cm_count/(n_boss_raid_cm))} {boss_raid_cm_count/n_boss_raid_cm*100:.2f}%",end="\r")
-        else:
-            nm_raid_bosses[raid_names[name]] = data
-            global boss_raid_nm_count
-            boss_raid_nm_count += 1
-            print(f"{get_bar(boss_raid_nm_count/(n_boss_raid_nm))} {boss_raid_nm_count/n_boss_raid_nm*100:.2f}%",end="\r")
-    if mode == "STRIKE": 
-        if cm:
-            cm_strike_bosses[strike_names[name]] = data
-            global boss_strike_cm_count
-            boss_strike_cm_count += 1
-            print(f"{get_bar(boss_strike_cm_count/(n_boss_strike_cm))} {boss_strike_cm_count/n_boss_strike_cm*100:.2f}%",end="\r")
+        response = session.get(get_boss_url(name, mode, cm), headers=headers)
+    if old and response.status_code == 304:
+        return key, old, False
+    response.raise_for_status()
+    page_hash = hashlib.sha1(response.content).hexdigest()
+    if old and old["hash"] == page_hash:
+        return key, old, False
+
+    data = assemble_data(response.content.decode("utf-8"))
+    entry = {
+        "mode": mode_names[mode],
+        "cm_nm": cm_nm,
+        "boss": boss_name,
+        "era": patch_value,
+        "hash": page_hash,
+        "etag": response.headers.get("ETag"),
+        "count": len(data["links"]),
+        "files": write_arrays(key, data),
+        "quantiles": get_quantiles(data),
+    }
+    return key, entry, True
+
+# QUANTILE_GRID values of every numeric mechanic with data
+def get_quantiles(data):
+    quantiles = {}
+    for meca, values in data.items():
+        if meca == "links" or values.dtype.kind != "f" or np.isnan(values).all():
+            continue
+        quantiles[meca] = np.nanquantile(values, QUANTILE_GRID).tolist()
+    return quantiles
+
+# One .npy per mechanic (and the links), written next to the old ones then swapped in
+# Files are named after their content : a live file is never rewritten, the manifest in use keeps pointing at its arrays
+# until the new manifest replaces it, and update_all removes the old files only after that
+def write_arrays(key, data):
+    files = {}
+    prefix = re.sub(r"[^A-Za-z0-9]+", "_", key)
+    for meca, values in data.items():
+        if meca == "links":
+            array = np.asarray(values, dtype=str)
         else:
-            nm_strike_bosses[strike_names[name]] = data
-            global boss_strike_nm_count
-            boss_strike_nm_count += 1
-            print(f"{get_bar(boss_strike_nm_count/(n_boss_strike_nm))} {boss_strike_nm_count/n_boss_strike_nm*100:.2f}%",end="\r")
-    return
+            array = np.asarray(values, dtype=float)
+        digest = hashlib.sha1(f"{meca}\n{array.dtype.str}\n{array.shape}\n".encode() + array.tobytes()).hexdigest()[:16]
+        file = f"{prefix}_{digest}.npy"
+        path = os.path.join(SNAPSHOT_DIR, file)
+        if not os.path.exists(path):
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp, path)
+        files[meca] = file
+    return files
 
-def update_nm_raids():
-    print("Updating NM RAIDS")
-    print(f"{get_bar(0)} 0.00%",end="\r")       
-    """with ThreadPoolExecutorStackTraced() as executor:
-        futures = [executor.submit(update_log_times, name, "RAID", False) for name in raids_nm]
-        for future in futures:
-            try:
-                test = future.result()
-            except TypeError as e:
-                print(e)"""
-    for name in raids_nm:
-        update_log_times(name, "RAID", False)
-    print(f"{get_bar(1)} 100.00%",end="\r")    
-    print("\nparsing NM RAIDS done")
-        
-def update_cm_raids():
-    print("Updating CM RAIDS")
-    print(f"{get_bar(0)} 0.00%",end="\r") 
-    """with ThreadPoolExecutorStackTraced() as executor:
-        futures = [executor.submit(update_log_times, name, "RAID", True) for name in raids_cm]
-        for future in futures:
-            try:
-                test = future.result()
-            except TypeError as e:
-                print(e)"""
-    for name in raids_cm:
-        update_log_times(name, "RAID", True)
-    print(f"{get_bar(1)} 100.00%",end="\r")  
-    print("\nparsing CM RAIDS done")
-    
-def update_nm_strikes():
-    print("Updating NM STRIKES")
-    print(f"{get_bar(0)} 0.00%",end="\r")      
-    """with ThreadPoolExecutorStackTraced() as executor:
-        futures = [executor.submit(update_log_times, name, "STRIKE", False) for name in strikes_nm]
-        for future in futures:
-            try:
-                test = future.result()
-            except TypeError as e:
-                print(e)"""
-    for name in strikes_nm:
-        update_log_times(name, "STRIKE", False)
-    print(f"{get_bar(1)} 100.00%",end="\r")    
-    print("\nparsing NM STRIKES done")
-    
-def update_cm_strikes():
-    print("Updating CM STRIKES")
-    print(f"{get_bar(0)} 0.00%",end="\r") 
-    """with ThreadPoolExecutorStackTraced() as executor:
-        futures = [executor.submit(update_log_times, name, "STRIKE", True) for name in strikes_cm]
-        for future in futures:
-            try:
-                test = future.result()
-            except TypeError as e:
-                print(e)"""
-    for name in strikes_cm:
-        update_log_times(name, "STRIKE", True)
-    print(f"{get_bar(1)} 100.00%",end="\r")    
-    print("\nparsing CM STRIKES done")
-    
-def find_links(html):
-    links = html.split("links = ")[1]
-    for i, c in enumerate(links):
-        if c == "]":
-            links = links[:i+1]
-            break      
-    links = eval(links)
-    for i, link in enumerate(links):
-        links[i] = "https://gw2wingman.nevermindcreations.de/log/"+link
-    return links
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"bosses": {}}
 
-def find_mecas(html):
-    scripts = html.split("<script>")
-    textsript = scripts[8]
-    textsript = textsript.split("var layout = {")[0]
-    names = textsript.split("name: '")[1:]
+LOG_URL = "https://gw2wingman.nevermindcreations.de/log/"
 
-    for i, name in enumerate(names):
-        names[i] = name.splitlines()[0][:-2]
-    return names
+# What the page scan stops on : the links array, a Plotly trace name and a trace y array
+PAGE_TOKEN = re.compile(r"""\blinks\s*=\s*\[|\bname:\s*'([^'\n]*)'|\by:\s*\[""")
+# Strict grammar of the array items : a number, a quoted string without escapes or null, then "," or "]"
+ARRAY_ITEM = re.compile(r"""\s*(?:(-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|'([^'\\\n]*)'|"([^"\\\n]*)"|(null|NaN))\s*([,\]])""")
+ARRAY_END = re.compile(r"\s*\]")
 
-def add_data(mecas,html):
-    data = {}
-    for meca in mecas:
-        data[meca] = eval(html.split(f"'{meca}',")[1].split("y:")[1].split("],")[0]+"]")
-    return data
+# Array literal starting at pos (just after its "["), returns (numpy array, position after its "]")
+# Anything else than numbers / null or strings is refused
+def parse_array(html, pos):
+    numbers = []
+    strings = []
+    while True:
+        end = ARRAY_END.match(html, pos)
+        if end:
+            pos = end.end()
+            break
+        item = ARRAY_ITEM.match(html, pos)
+        if not item:
+            raise ValueError(f"Unexpected array data : {html[pos:pos+40]!r}")
+        number, single, double, null, separator = item.groups()
+        if number is not None:
+            numbers.append(float(number))
+        elif null is not None:
+            numbers.append(np.nan)
+        else:
+            strings.append(single if single is not None else double)
+        pos = item.end()
+        if separator == "]":
+            break
+    if numbers and strings:
+        raise ValueError("Array mixes numbers and strings")
+    if strings:
+        return np.array(strings, dtype=str), pos
+    return np.array(numbers, dtype=float), pos
 
+# One scan of the page : the links and the y values of every named trace (first trace of a name wins)
 def assemble_data(html):
-    links = find_links(html)
-    mecas = find_mecas(html)
-    data = add_data(mecas,html)
-    data["links"] = links
+    data = {}
+    links = None
+    name = None
+    pos = 0
+    while True:
+        token = PAGE_TOKEN.search(html, pos)
+        if not token:
+            break
+        pos = token.end()
+        if token.group(0).startswith("links"):
+            if links is None:
+                links, pos = parse_array(html, pos)
+        elif token.group(1) is not None:
+            name = token.group(1)
+        elif name is not None:
+            values, pos = parse_array(html, pos)
+            data.setdefault(name, values)
+            name = None
+    if links is None:
+        raise ValueError("No links in the page")
+    data["links"] = np.char.add(LOG_URL, links.astype(str))
     return data
         
 def update_all():
     start = perf_counter()
     print(f"Updating for : {patch_name}\n")
-    update_nm_raids()
-    update_cm_raids()
-    update_nm_strikes()
-    update_cm_strikes()
-    modes["RAIDS"] = {"NM": nm_raid_bosses, "CM": cm_raid_bosses}
-    modes["STRIKES"] = {"NM": nm_strike_bosses, "CM": cm_strike_bosses}
-    with open("WINGMAN_DATA.json", "w") as final:
-        json.dump(modes, final)
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    previous = load_manifest()["bosses"]
+    jobs = [(name, "RAID", False) for name in raids_nm]
+    jobs += [(name, "RAID", True) for name in raids_cm]
+    jobs += [(name, "STRIKE", False) for name in strikes_nm]
+    jobs += [(name, "STRIKE", True) for name in strikes_cm]
+
+    bosses = {}
+    n_changed = 0
+    print(f"{get_bar(0)} 0.00%",end="\r")
+    with ThreadPoolExecutorStackTraced(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(update_log_times, name, mode, cm, previous): (name, mode, cm) for name, mode, cm in jobs}
+        for i, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            name, mode, cm = futures[future]
+            try:
+                key, entry, changed = future.result()
+                bosses[key] = entry
+                n_changed += changed
+            except Exception as e:
+                # The previous arrays of the boss are kept
+                print(f"\n{name} {mode} {'CM' if cm else 'NM'} failed : {e}")
+                boss_name = raid_names[name] if mode == "RAID" else strike_names[name]
+                key = f"{mode_names[mode]}/{'CM' if cm else 'NM'}/{boss_name}"
+                if key in previous:
+                    bosses[key] = previous[key]
+            print(f"{get_bar(i/len(jobs))} {i/len(jobs)*100:.2f}%",end="\r")
+
+    manifest = {"era": {"value": patch_value, "name": patch_name}, "quantile_grid": QUANTILE_GRID, "bosses": bosses}
+    tmp = MANIFEST_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as final:
+        json.dump(manifest, final, indent=1)
+    os.replace(tmp, MANIFEST_FILE)
+
+    # Arrays no boss uses anymore, once the new manifest is in place
+    used = {file for entry in bosses.values() for file in entry["files"].values()}
+    for file in os.listdir(SNAPSHOT_DIR):
+        if file.endswith((".npy", ".npy.tmp")) and file not in used:
+            os.remove(os.path.join(SNAPSHOT_DIR, file))
     end = perf_counter()
+    print(f"\n{n_changed} boss(es) updated, {len(bosses) - n_changed} unchanged")
     print(f"Done in {end - start:.3f}s")
     
 def test():
-    with open("wingman_updater/WINGMAN_DATA.json", "r") as final:
-        data = json.load(final)
+    manifest = load_manifest()
 
-    mode_name, cmnm, boss_name, i_max, Max = None, None, None, None, 0
+    key_max, i_max, Max = None, None, 0
     meca = "Duration"
-    for Mode_name, Mode in data.items():
-        if True:
-            for CmNm, Bosses in Mode.items():
-                for Boss_name, Boss in Bosses.items():
-                    if Boss_name not in ["KO","HT","OLC","ESCORT","ANKKA","FEBE"]:
-                        for i_val, val in enumerate(Boss[meca]):
-                            if val > Max:
-                                mode_name, cmnm, boss_name, i_max, Max = Mode_name, CmNm, Boss_name, i_val, val
+    for key, entry in manifest["bosses"].items():
+        if entry["boss"] not in ["KO","HT","OLC","ESCORT","ANKKA","FEBE"] and meca in entry["files"]:
+            values = np.load(os.path.join(SNAPSHOT_DIR, entry["files"][meca]), mmap_mode="r")
+            for i_val, val in enumerate(values):
+                if val > Max:
+                    key_max, i_max, Max = key, i_val, val
 
-    print(f"{meca} = {Max} : {data[mode_name][cmnm][boss_name]['links'][i_max]}")
+    links = np.load(os.path.join(SNAPSHOT_DIR, manifest["bosses"][key_max]["files"]["links"]))
+    print(f"{meca} = {Max} : {links[i_max]}")
         
     
     
 update_all()
 #test()
-"""start = perf_counter()
-
-update_log_times("vg","RAID",False)
-modes["RAIDS"] = {"NM": nm_raid_bosses, "CM": cm_raid_bosses}
-modes["STRIKES"] = {"NM": nm_strike_bosses, "CM": cm_strike_bosses}
-with open("WINGMAN_DATA.json", "w") as final:
-    json.dump(modes, final)
-    
-end = perf_counter()
-print(f"Done in {end - start:.3f}s")
-print()"""
-
 